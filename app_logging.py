@@ -0,0 +1,198 @@
+"""
+Ablink SGCarmart Scraper - Logging
+By Oneiros Indonesia
+
+Shared logging setup for the scrapers and apps (replaces print):
+- LOG_LEVEL env var: DEBUG, INFO (default), WARNING, ERROR
+- LOG_FORMAT env var: 'text' (default, "[INFO] message") or 'json'
+  (one JSON object per line - gunicorn.conf.py defaults to json)
+- Context fields (run_id, category, page, ...) added to every record
+  logged inside a log_context block
+- log_limited: rate-limited messages for hot loops (e.g. one debug line
+  per parsed listing), with a count of the suppressed ones
+
+Usage:
+    logger = get_logger(__name__)
+    
+    with log_context(run_id=new_run_id()):
+        with log_context(category='10FT DIESEL'):
+            logger.info("Found %d listings", count)
+            log_limited(logger, logging.DEBUG, 'listing', "Parsed %s", name)
+
+Banners and CLI output of the manual scripts stay print().
+"""
+
+import contextvars
+import json
+import logging
+import os
+import sys
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from datetime import datetime
+
+
+LOGGER_NAMESPACE = 'sgcarmart'
+
+# LogRecord attributes that are not extra fields
+_RECORD_ATTRIBUTES = set(vars(logging.LogRecord('', 0, '', 0, '', None, None))) | {'message', 'asctime', 'context'}
+
+_context = contextvars.ContextVar('log_context', default={})
+_configured = False
+_configure_lock = threading.Lock()
+
+
+class ContextFilter(logging.Filter):
+    """Adds the current log_context fields to records"""
+    
+    def filter(self, record):
+        record.context = _context.get()
+        return True
+
+
+class JSONFormatter(logging.Formatter):
+    """One JSON object per line: time, level, logger, message, context, extra fields"""
+    
+    def format(self, record):
+        entry = {
+            'time': datetime.fromtimestamp(record.created).isoformat(timespec='milliseconds'),
+            'level': record.levelname,
+            'logger': record.name,
+            'message': record.getMessage(),
+            'pid': record.process
+        }
+        entry.update(getattr(record, 'context', {}))
+        for key, value in vars(record).items():
+            if key not in _RECORD_ATTRIBUTES and not key.startswith('_'):
+                entry[key] = value
+        if record.exc_info:
+            entry['exception'] = self.formatException(record.exc_info)
+        return json.dumps(entry, default=str, ensure_ascii=False)
+
+
+class TextFormatter(logging.Formatter):
+    """The console style of the project: [LEVEL] message (context)"""
+    
+    def format(self, record):
+        line = f"[{record.levelname}] {record.getMessage()}"
+        context = getattr(record, 'context', None)
+        if context:
+            line += ' (' + ', '.join(f"{key}={value}" for key, value in context.items()) + ')'
+        if record.exc_info:
+            line += '\n' + self.formatException(record.exc_info)
+        return line
+
+
+def configure(level=None, fmt=None, stream=None):
+    """
+    Set up the project loggers (called by get_logger; call again to change)
+    
+    Args:
+        level: Log level name (default: LOG_LEVEL env var or INFO)
+        fmt: 'text' or 'json' (default: LOG_FORMAT env var or text)
+        stream: Output stream (default: stderr)
+    """
+    global _configured
+    
+    level = (level or os.environ.get('LOG_LEVEL') or 'INFO').upper()
+    fmt = (fmt or os.environ.get('LOG_FORMAT') or 'text').lower()
+    
+    handler = logging.StreamHandler(stream or sys.stderr)
+    handler.addFilter(ContextFilter())
+    handler.setFormatter(JSONFormatter() if fmt == 'json' else TextFormatter())
+    
+    with _configure_lock:
+        logger = logging.getLogger(LOGGER_NAMESPACE)
+        for old in list(logger.handlers):
+            logger.removeHandler(old)
+        logger.addHandler(handler)
+        logger.setLevel(level)
+        logger.propagate = False
+        _configured = True
+
+
+def get_logger(name):
+    """Project logger for a module (configured on first use)"""
+    if not _configured:
+        configure()
+    
+    if name == '__main__':
+        name = os.path.splitext(os.path.basename(sys.argv[0] or 'main'))[0]
+    return logging.getLogger(f"{LOGGER_NAMESPACE}.{name}")
+
+
+def new_run_id():
+    """Short id of a scrape run (log correlation)"""
+    return uuid.uuid4().hex[:8]
+
+
+@contextmanager
+def log_context(**fields):
+    """Add fields to every record logged inside the block (this thread / task)"""
+    token = _context.set({**_context.get(), **fields})
+    try:
+        yield
+    finally:
+        _context.reset(token)
+
+
+def bind_context(**fields):
+    """Update fields of the enclosing log_context block (e.g. the page in a loop)"""
+    _context.set({**_context.get(), **fields})
+
+
+def current_context():
+    """Fields of the current log context"""
+    return dict(_context.get())
+
+
+class RateLimiter:
+    """Allows up to burst messages per key and interval, counts the rest"""
+    
+    def __init__(self, burst=5, interval=1.0):
+        self.burst = burst
+        self.interval = interval
+        self._state = {}
+        self._lock = threading.Lock()
+    
+    def allow(self, key):
+        """
+        Returns:
+            tuple: (allowed, suppressed count since the last allowed message)
+        """
+        now = time.monotonic()
+        with self._lock:
+            window_start, sent, suppressed = self._state.get(key, (now, 0, 0))
+            if now - window_start >= self.interval:
+                window_start, sent = now, 0
+            
+            if sent < self.burst:
+                self._state[key] = (window_start, sent + 1, 0)
+                return True, suppressed
+            
+            self._state[key] = (window_start, sent, suppressed + 1)
+            return False, suppressed + 1
+
+
+_limiter = RateLimiter()
+
+
+def log_limited(logger, level, key, msg, *args, limiter=None):
+    """
+    Log at most a few messages per key and second
+    
+    Nothing is formatted when the level is disabled, so per-item debug
+    logs cost almost nothing in production.
+    """
+    if not logger.isEnabledFor(level):
+        return
+    
+    allowed, suppressed = (limiter or _limiter).allow((logger.name, key))
+    if not allowed:
+        return
+    
+    if suppressed:
+        msg = f"{msg} ({suppressed} similar suppressed)"
+    logger.log(level, msg, *args)
@@ -0,0 +1,150 @@
+"""
+Ablink SGCarmart Scraper - HTTP Load Benchmark
+By Oneiros Indonesia
+
+Compares request throughput of the Flask dev server (python
+market_analysis_app.py) with gunicorn (gunicorn.conf.py + wsgi.py).
+Each server runs in a temporary folder with the sample data.
+
+Usage:
+    python benchmarks/http_load.py
+    python benchmarks/http_load.py --servers gunicorn --clients 32 --duration 20
+"""
+
+import argparse
+import http.client
+import os
+import shutil
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+DEFAULT_PATHS = ['/api/data/latest', '/api/history', '/api/status']
+
+
+def free_port():
+    with socket.socket() as s:
+        s.bind(('127.0.0.1', 0))
+        return s.getsockname()[1]
+
+
+def server_command(server):
+    """Command line of a server under test"""
+    if server == 'dev':
+        return [sys.executable, os.path.join(ROOT, 'market_analysis_app.py')]
+    return [sys.executable, '-m', 'gunicorn', '-c', os.path.join(ROOT, 'gunicorn.conf.py'), 'wsgi:app']
+
+
+def wait_ready(port, timeout=60):
+    """Wait until the server answers"""
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        try:
+            conn = http.client.HTTPConnection('127.0.0.1', port, timeout=2)
+            conn.request('GET', '/api/status')
+            conn.getresponse().read()
+            return True
+        except OSError:
+            time.sleep(0.5)
+    return False
+
+
+def client(port, paths, stop_at, latencies, errors):
+    """One keep-alive client requesting paths round robin"""
+    conn = http.client.HTTPConnection('127.0.0.1', port, timeout=30)
+    i = 0
+    while time.perf_counter() < stop_at:
+        path = paths[i % len(paths)]
+        i += 1
+        start = time.perf_counter()
+        try:
+            conn.request('GET', path, headers={'Accept-Encoding': 'gzip'})
+            response = conn.getresponse()
+            response.read()
+            if response.status >= 400:
+                errors.append(response.status)
+        except (OSError, http.client.HTTPException):
+            errors.append('connection')
+            conn.close()
+            conn = http.client.HTTPConnection('127.0.0.1', port, timeout=30)
+            continue
+        latencies.append(time.perf_counter() - start)
+    conn.close()
+
+
+def load(port, paths, clients, duration):
+    """Run concurrent clients, returns (latencies, errors)"""
+    latencies, errors = [], []
+    stop_at = time.perf_counter() + duration
+    threads = [threading.Thread(target=client, args=(port, paths, stop_at, latencies, errors))
+               for _ in range(clients)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return latencies, errors
+
+
+def run(servers, paths, clients, duration):
+    """Benchmark each server, returns list of result dicts"""
+    results = []
+    
+    for server in servers:
+        workdir = tempfile.mkdtemp(prefix=f'http_load_{server}_')
+        port = free_port()
+        env = dict(os.environ, PORT=str(port), PYTHONPATH=ROOT, SCHEDULER_ENABLED='0')
+        
+        process = subprocess.Popen(server_command(server), cwd=workdir, env=env,
+                                   stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        try:
+            if not wait_ready(port):
+                print(f"  [ERROR] {server} did not start")
+                continue
+            
+            load(port, paths, clients, 2)  # warm up caches
+            latencies, errors = load(port, paths, clients, duration)
+        finally:
+            process.terminate()
+            process.wait(timeout=30)
+            shutil.rmtree(workdir, ignore_errors=True)
+        
+        latencies.sort()
+        result = {
+            'server': server,
+            'clients': clients,
+            'requests': len(latencies),
+            'errors': len(errors),
+            'req_per_sec': round(len(latencies) / duration, 1),
+            'p50_ms': round(statistics.median(latencies) * 1000, 2) if latencies else None,
+            'p95_ms': round(latencies[int(len(latencies) * 0.95)] * 1000, 2) if latencies else None
+        }
+        results.append(result)
+        print(f"  {server:<9} {clients:>3} clients  {result['req_per_sec']:>8.1f} req/s  "
+              f"p50 {result['p50_ms']} ms  p95 {result['p95_ms']} ms  errors {result['errors']}")
+    
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark the dev server against gunicorn')
+    parser.add_argument('--servers', nargs='+', choices=['dev', 'gunicorn'], default=['dev', 'gunicorn'])
+    parser.add_argument('--paths', nargs='+', default=DEFAULT_PATHS)
+    parser.add_argument('--clients', type=int, default=16)
+    parser.add_argument('--duration', type=float, default=10)
+    args = parser.parse_args()
+    
+    print("=" * 70)
+    print("HTTP Load Benchmark")
+    print("=" * 70)
+    run(args.servers, args.paths, args.clients, args.duration)
+
+
+if __name__ == '__main__':
+    main()
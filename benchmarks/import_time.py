@@ -0,0 +1,91 @@
+"""
+Ablink SGCarmart Scraper - Startup Import Benchmark
+By Oneiros Indonesia
+
+Measures the cold import time of each web app with python -X importtime
+and lists the heavy dependencies loaded at startup.
+
+Usage:
+    python benchmarks/import_time.py
+    python benchmarks/import_time.py --root /path/to/other/checkout --repeat 5
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+APPS = ['market_analysis_app', 'dashboard_web', 'dashboard_history_app', 'n8n_webhook_api', 'web_scraper_app']
+
+# Dependencies that should only load on the code paths that need them
+HEAVY = ['selenium', 'webdriver_manager', 'bs4', 'lxml', 'pandas', 'numpy', 'openpyxl', 'requests']
+
+
+def import_profile(module, root):
+    """
+    Import a module in a fresh interpreter with -X importtime
+    
+    Returns:
+        dict: top-level package -> cumulative microseconds, plus the total
+    """
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', f'import {module}'],
+        cwd=root, capture_output=True, text=True,
+        env=dict(os.environ, PYTHONPATH=root, PYTHONDONTWRITEBYTECODE='1')
+    )
+    if result.returncode != 0:
+        raise RuntimeError(result.stderr.strip().splitlines()[-1])
+    
+    packages = {}
+    total = 0
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        _, cumulative, name = [part.strip() for part in line[len('import time:'):].split('|')]
+        # Nesting is shown by indentation; the first level counts once
+        depth = (len(name) - len(name.lstrip())) // 2
+        name = name.strip()
+        if depth == 0:
+            total += int(cumulative)
+        package = name.split('.')[0]
+        packages[package] = max(packages.get(package, 0), int(cumulative))
+    
+    packages['<total>'] = total
+    return packages
+
+
+def run(root, repeat):
+    """Benchmark every app, returns list of result dicts"""
+    results = []
+    
+    for app in APPS:
+        profiles = [import_profile(app, root) for _ in range(repeat)]
+        best = min(profiles, key=lambda p: p['<total>'])
+        heavy = [name for name in HEAVY if name in best]
+        results.append({
+            'app': app,
+            'import_ms': round(best['<total>'] / 1000, 1),
+            'heavy_modules': heavy
+        })
+        print(f"  {app:<22} {best['<total>'] / 1000:>8.1f} ms  heavy: {', '.join(heavy) or '-'}")
+    
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark web app startup imports')
+    parser.add_argument('--root', default=ROOT, help='Checkout to measure (default: this one)')
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+    
+    print("=" * 70)
+    print("Startup Import Benchmark")
+    print("=" * 70)
+    run(os.path.abspath(args.root), args.repeat)
+
+
+if __name__ == '__main__':
+    main()
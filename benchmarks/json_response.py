@@ -0,0 +1,86 @@
+"""
+Ablink SGCarmart Scraper - JSON Response Benchmark
+By Oneiros Indonesia
+
+Compares JSON serialization (Flask stdlib provider vs orjson) and
+response compression (gzip / brotli) on synthetic API payloads
+
+Usage:
+    python benchmarks/json_response.py
+    python benchmarks/json_response.py --rows 100 1000 10000 --repeat 5
+"""
+
+import argparse
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from flask import Flask
+from flask.json.provider import DefaultJSONProvider
+
+import http_response
+from report_render import synthetic_frame, synthetic_snapshot, time_call
+
+
+def payloads(rows):
+    """API payloads as returned by /api/data/<date> (both dashboards)"""
+    return {
+        'snapshot': {'success': True, 'date': '2026-01-25', 'data': synthetic_snapshot(rows)},
+        'records': {'success': True, 'date': '2026-01-25', 'data': synthetic_frame(rows).to_dict('records')},
+    }
+
+
+def serializers(app):
+    """name -> callable(obj) returning the response body"""
+    stdlib = DefaultJSONProvider(app)
+    cases = {'stdlib': lambda obj: stdlib.dumps(obj, separators=(',', ':')).encode('utf-8')}
+    
+    if http_response.orjson is not None:
+        fast = http_response.ORJSONProvider(app)
+        cases['orjson'] = fast.dumps_bytes
+    
+    return cases
+
+
+def run(row_counts, repeat):
+    """Benchmark serialization and compression, returns list of result dicts"""
+    app = Flask(__name__)
+    results = []
+    
+    def record(payload_name, rows, stage, seconds, size):
+        results.append({'payload': payload_name, 'rows': rows, 'stage': stage, 'seconds': round(seconds, 5), 'bytes': size})
+        print(f"  {payload_name:<9} {rows:>6} rows  {stage:<18} {seconds * 1000:>9.2f} ms  {size:>11,} bytes")
+    
+    for rows in row_counts:
+        for payload_name, payload in payloads(rows).items():
+            for name, dumps in serializers(app).items():
+                seconds = time_call(lambda: dumps(payload), repeat)
+                body = dumps(payload)
+                record(payload_name, rows, f'serialize:{name}', seconds, len(body))
+            
+            for encoding in http_response.available_encodings():
+                seconds = time_call(lambda: http_response.compress(body, encoding), repeat)
+                record(payload_name, rows, f'compress:{encoding}', seconds, len(http_response.compress(body, encoding)))
+    
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark JSON serialization and compression')
+    parser.add_argument('--rows', type=int, nargs='+', default=[100, 1000, 10000])
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+    
+    print("=" * 70)
+    print("JSON Response Benchmark")
+    print("=" * 70)
+    if http_response.orjson is None:
+        print("[INFO] orjson not installed - stdlib only")
+    if http_response.brotli is None:
+        print("[INFO] brotli not installed - gzip only")
+    run(args.rows, args.repeat)
+
+
+if __name__ == '__main__':
+    main()
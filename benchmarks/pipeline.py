@@ -0,0 +1,314 @@
+"""
+Ablink SGCarmart Scraper - Pipeline Benchmark Suite
+By Oneiros Indonesia
+
+Times the scrape-to-report hot paths offline (no browser, no network):
+- Parsing: SGCarmartScraper._parse_listing and
+  DepreciationScraper._parse_depreciation_table on the HTML fixtures in
+  benchmarks/fixtures (page markup as served by SGCarmart), scaled up by
+  repeating their listings / table rows; the depreciation page case
+  includes picking the table (table_extraction)
+- Aggregation (_aggregate_data), diffing (calculate_diff), compare_prices
+- History save / load (DataHistoryManager, HistoryManager)
+- Exports (DepreciationScraper.save_data, range CSV) and every HTML
+  report generator
+
+Results can be written as JSON and compared with an earlier run, e.g.
+before and after a commit:
+
+Usage:
+    python benchmarks/pipeline.py --output before.json
+    python benchmarks/pipeline.py --output after.json --compare before.json
+    python benchmarks/pipeline.py --rows 100 1000 --repeat 5 --only parse aggregate
+"""
+
+import argparse
+import contextlib
+import copy
+import csv
+import io
+import json
+import os
+import platform
+import random
+import subprocess
+import sys
+import tempfile
+from datetime import datetime, timedelta
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from bs4 import BeautifulSoup
+
+from app_logging import configure
+from report_render import generator_cases, synthetic_frame, synthetic_snapshot, time_call
+from table_extraction import best_table
+
+
+FIXTURE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures')
+LISTING_FIXTURE = 'sgcarmart_listing.html'
+DEPRECIATION_FIXTURE = 'sgcarmart_depreciation.html'
+
+GROUPS = ['parse', 'aggregate', 'diff', 'compare', 'history', 'export', 'render']
+
+
+def load_fixture(name):
+    """HTML of a fixture page"""
+    with open(os.path.join(FIXTURE_DIR, name), 'r', encoding='utf-8') as f:
+        return f.read()
+
+
+def scaled_listing_page(count):
+    """Listing fixture page with its listings repeated to count items"""
+    soup = BeautifulSoup(load_fixture(LISTING_FIXTURE), 'html.parser')
+    section = soup.find('section', class_='listings')
+    items = [str(item) for item in section.find_all('div', class_='listing-item')]
+    section.clear()
+    section.append(BeautifulSoup('\n'.join(items[i % len(items)] for i in range(count)), 'html.parser'))
+    return str(soup)
+
+
+def scaled_depreciation_page(rows):
+    """Depreciation fixture page with its table rows repeated to rows rows"""
+    soup = BeautifulSoup(load_fixture(DEPRECIATION_FIXTURE), 'html.parser')
+    body = soup.find('table', class_='depreciation-table').find('tbody')
+    table_rows = [str(row) for row in body.find_all('tr')]
+    body.clear()
+    body.append(BeautifulSoup(''.join(table_rows[i % len(table_rows)] for i in range(rows)), 'html.parser'))
+    return str(soup)
+
+
+def synthetic_listings(count, seed=42):
+    """Parsed listings (as returned by _parse_listing) for _aggregate_data"""
+    from sgcarmart_scraper import SGCarmartScraper
+    rnd = random.Random(seed)
+    categories = list(SGCarmartScraper.CATEGORIES.items())
+    listings = []
+    for _ in range(count):
+        category, config = rnd.choice(categories)
+        listings.append({
+            'category': category,
+            'vehicle': f"{rnd.choice(config['vehicles'])} {rnd.choice(['2.8', '3.0', '150MT', '2.5M'])}",
+            'year': str(rnd.randint(2014, 2026)),
+            'depreciation': rnd.randint(8000, 30000)
+        })
+    return listings
+
+
+def synthetic_pricelist(count, snapshot, seed=42):
+    """Pricelist (data/pricelist.json format) for the vehicles of a snapshot"""
+    rnd = random.Random(seed)
+    vehicles = []
+    for _ in range(count):
+        vehicle = rnd.choice(snapshot['vehicles'])
+        year = rnd.choice(list(vehicle['years']) or ['2025'])
+        vehicles.append({
+            'vehicle': vehicle['vehicle'].title(),
+            'category': vehicle['category'],
+            'depreciation': rnd.randint(8000, 30000),
+            'registered_year': int(year)
+        })
+    return {'vehicles': vehicles}
+
+
+def changed_snapshot(snapshot, seed=7):
+    """Copy of a snapshot with changed unit counts (the 'next day')"""
+    rnd = random.Random(seed)
+    data = copy.deepcopy(snapshot)
+    for vehicle in data['vehicles']:
+        vehicle['total_units'] = max(0, vehicle['total_units'] + rnd.randint(-5, 5))
+    return data
+
+
+def git_commit():
+    """Current commit of the repository (None outside git)"""
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=ROOT,
+                              capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+class Suite:
+    """Collects timings of the benchmark cases"""
+    
+    def __init__(self, repeat, workdir):
+        self.repeat = repeat
+        self.workdir = workdir
+        self.results = []
+    
+    def time(self, name, size, func, **extra):
+        """Time func (best of repeat, its output suppressed) and record it"""
+        def quiet():
+            with contextlib.redirect_stdout(io.StringIO()):
+                return func()
+        
+        seconds = time_call(quiet, self.repeat)
+        result = {'benchmark': name, 'size': size, 'seconds': round(seconds, 6), **extra}
+        self.results.append(result)
+        print(f"  {name:<32} {size:>7}  {seconds * 1000:>10.2f} ms")
+        return result
+    
+    def parse(self, rows):
+        from sgcarmart_scraper import SGCarmartScraper
+        from depreciation_scraper import DepreciationScraper
+        scraper = SGCarmartScraper(headless=True)
+        depreciation = DepreciationScraper({'headless': True})
+        
+        listing_page = load_fixture(LISTING_FIXTURE) if rows is None else scaled_listing_page(rows)
+        count = len(BeautifulSoup(listing_page, 'html.parser').find_all('div', class_='listing-item'))
+        
+        def parse_listings():
+            soup = BeautifulSoup(listing_page, 'html.parser')
+            return [scraper._parse_listing(item, '10FT DIESEL') for item in soup.find_all('div', class_='listing-item')]
+        
+        self.time('parse.listing_page', count, parse_listings)
+        
+        table_page = load_fixture(DEPRECIATION_FIXTURE) if rows is None else scaled_depreciation_page(rows)
+        table = BeautifulSoup(table_page, 'html.parser').find('table', class_='depreciation-table')
+        self.time('parse.depreciation_table', len(table.find_all('tr')) - 1,
+                  lambda: depreciation._parse_depreciation_table(table))
+        self.time('parse.depreciation_page', len(table.find_all('tr')) - 1,
+                  lambda: depreciation._parse_depreciation_table(best_table(table_page).table))
+    
+    def aggregate(self, rows):
+        from sgcarmart_scraper import SGCarmartScraper
+        scraper = SGCarmartScraper(headless=True)
+        listings = synthetic_listings(rows)
+        self.time('aggregate.aggregate_data', rows, lambda: scraper._aggregate_data(listings))
+    
+    def diff(self, rows):
+        from data_history_manager import DataHistoryManager
+        manager = DataHistoryManager(os.path.join(self.workdir, 'diff_history'))
+        previous = synthetic_snapshot(rows)
+        current = changed_snapshot(previous)
+        self.time('diff.calculate_diff', rows, lambda: manager.calculate_diff(current, previous))
+        
+        from snapshot_delta import diff_snapshot
+        self.time('diff.snapshot_delta', rows, lambda: diff_snapshot(previous, current))
+    
+    def compare(self, rows):
+        import market_analysis_app
+        from sample_data import sample_snapshot
+        snapshot = sample_snapshot()
+        pricelist = synthetic_pricelist(rows, snapshot)
+        self.time('compare.compare_prices', rows, lambda: market_analysis_app.compare_prices(pricelist, snapshot))
+    
+    def history(self, rows):
+        from data_history_manager import DataHistoryManager
+        from history_manager import HistoryManager
+        snapshot = synthetic_snapshot(rows)
+        manager = DataHistoryManager(os.path.join(self.workdir, f'history_{rows}'))
+        
+        # A new date per save, like one scrape a day
+        dates = (f"{datetime(2000, 1, 1) + timedelta(days=i):%Y-%m-%d}" for i in range(10 ** 6))
+        self.time('history.save_data', rows, lambda: manager.save_data(snapshot, date=next(dates)))
+        date = manager.get_latest_date()
+        self.time('history.get_data', rows, lambda: manager.get_data(date))
+        
+        df = synthetic_frame(rows)
+        reports = HistoryManager(os.path.join(self.workdir, f'reports_{rows}'))
+        result = reports.save_report(df)
+        self.time('history.save_report', rows, lambda: reports.save_report(df, scrape_date=next(dates)))
+        self.time('history.get_date_data', rows, lambda: reports.get_date_data(result['date']))
+    
+    def export(self, rows):
+        from depreciation_scraper import DepreciationScraper
+        import market_analysis_app
+        df = synthetic_frame(rows)
+        scraper = DepreciationScraper({'headless': True, 'save_html': False,
+                                       'output_folder': os.path.join(self.workdir, f'exports_{rows}')})
+        self.time('export.depreciation_save_data', rows, lambda: scraper.save_data(df.copy()))
+        
+        snapshot = synthetic_snapshot(rows)
+        
+        def range_csv():
+            buffer = io.StringIO()
+            writer = csv.writer(buffer)
+            writer.writerow(market_analysis_app.RANGE_EXPORT_COLUMNS)
+            writer.writerows(market_analysis_app.iter_long_format_rows('2026-01-25', snapshot))
+            return buffer.getvalue()
+        
+        self.time('export.range_csv', rows, range_csv, bytes=len(range_csv()))
+    
+    def render(self, rows):
+        for name, (generator, data) in generator_cases(rows).items():
+            output_file = os.path.join(self.workdir, f'{name}_{rows}.html')
+            result = self.time(f'render.{name}', rows, lambda: generator.generate_report(data, output_file))
+            result['bytes'] = os.path.getsize(output_file)
+
+
+def run(row_counts, repeat, groups=GROUPS):
+    """Run the suite in a temporary folder, returns the results document"""
+    start_cwd = os.getcwd()
+    with tempfile.TemporaryDirectory(prefix='pipeline_bench_') as workdir:
+        # The apps create their data folders relative to the working directory
+        os.chdir(workdir)
+        try:
+            suite = Suite(repeat, workdir)
+            for group in groups:
+                print(f"\n[{group}]")
+                if group == 'parse':
+                    suite.parse(None)  # the fixtures as recorded
+                for rows in row_counts:
+                    getattr(suite, group)(rows)
+        finally:
+            os.chdir(start_cwd)
+    
+    return {
+        'suite': 'pipeline',
+        'commit': git_commit(),
+        'created': datetime.now().isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'repeat': repeat,
+        'results': suite.results
+    }
+
+
+def compare(document, baseline):
+    """Print the change of every benchmark against a baseline results document"""
+    previous = {(r['benchmark'], r['size']): r['seconds'] for r in baseline['results']}
+    
+    print("\n" + "=" * 70)
+    print(f"Compared with {baseline.get('commit') or 'baseline'} ({baseline.get('created', '')})")
+    print("=" * 70)
+    for result in document['results']:
+        before = previous.get((result['benchmark'], result['size']))
+        if not before:
+            continue
+        ratio = result['seconds'] / before
+        print(f"  {result['benchmark']:<32} {result['size']:>7}  {before * 1000:>9.2f} -> "
+              f"{result['seconds'] * 1000:>9.2f} ms  x{ratio:.2f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark the scrape-to-report pipeline offline')
+    parser.add_argument('--rows', type=int, nargs='+', default=[100, 1000])
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--only', nargs='+', choices=GROUPS, default=GROUPS)
+    parser.add_argument('--output', help='Write the results to this JSON file')
+    parser.add_argument('--compare', help='Earlier results JSON file to compare with')
+    args = parser.parse_args()
+    
+    # Scraper / history log lines would drown the results
+    configure(level=os.environ.get('LOG_LEVEL', 'WARNING'))
+    
+    print("=" * 70)
+    print("Pipeline Benchmark")
+    print("=" * 70)
+    document = run(args.rows, args.repeat, [g for g in GROUPS if g in args.only])
+    
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(document, f, indent=2)
+        print(f"\n[OK] Results saved: {args.output}")
+    
+    if args.compare:
+        with open(args.compare, 'r', encoding='utf-8') as f:
+            compare(document, json.load(f))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,144 @@
+"""
+Ablink SGCarmart Scraper - Report Rendering Benchmark
+By Oneiros Indonesia
+
+Times every HTML report generator on synthetic data
+
+Usage:
+    python benchmarks/report_render.py
+    python benchmarks/report_render.py --rows 1000 10000 --repeat 3
+"""
+
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pandas as pd
+
+from colorful_generator import ColorfulGenerator
+from soft_generator import SoftGenerator
+from final_pdf_generator import FinalPDFGenerator
+from pdf_enhanced_generator import PDFEnhancedGenerator
+from pdf_style_generator import PDFStyleHTMLGenerator
+from depreciation_html_generator import DepreciationHTMLGenerator
+from market_analysis_generator import MarketAnalysisGenerator
+
+
+CATEGORIES = ['10FT DIESEL', '14FT DIESEL', 'VAN DIESEL (GOODS VAN)', 'VAN PETROL (GOODS VAN)']
+YEARS = [str(y) for y in range(2025, 2013, -1)]
+
+
+def synthetic_frame(rows, seed=42):
+    """Wide DataFrame in the <year>_price / <year>_units layout"""
+    rnd = random.Random(seed)
+    data = {
+        'Vehicle': [f'VEHICLE {i:05d}' for i in range(rows)],
+        'Category': [CATEGORIES[i * len(CATEGORIES) // rows] for i in range(rows)],
+    }
+    for year in YEARS:
+        data[f'{year}_price'] = [rnd.choice([0, rnd.randint(8000, 30000)]) for _ in range(rows)]
+        data[f'{year}_units'] = [rnd.randint(0, 40) for _ in range(rows)]
+    data['TOTAL UNITS'] = [sum(data[f'{y}_units'][i] for y in YEARS) for i in range(rows)]
+    data['Previous'] = [max(0, t + rnd.randint(-5, 5)) for t in data['TOTAL UNITS']]
+    data['DIFF'] = [t - p for t, p in zip(data['TOTAL UNITS'], data['Previous'])]
+    return pd.DataFrame(data)
+
+
+def synthetic_snapshot(rows, seed=42):
+    """Snapshot dict in the DataHistoryManager format"""
+    rnd = random.Random(seed)
+    vehicles = []
+    for i in range(rows):
+        years = {}
+        for year in YEARS:
+            units = rnd.randint(0, 40)
+            if units:
+                lowest = rnd.randint(8000, 30000)
+                years[year] = {'lowest': lowest, 'average': lowest + rnd.randint(0, 500), 'units': units}
+        total = sum(y['units'] for y in years.values())
+        previous = max(0, total + rnd.randint(-5, 5))
+        vehicles.append({
+            'category': CATEGORIES[i * len(CATEGORIES) // rows],
+            'vehicle': f'VEHICLE {i:05d}',
+            'years': years,
+            'total_units': total,
+            'previous': previous,
+            'diff': total - previous
+        })
+    return {'vehicles': vehicles}
+
+
+def pdf_style_frame(df):
+    """Single price column per year, as used by PDFStyleHTMLGenerator"""
+    out = df[['Vehicle', 'Category']].copy()
+    for year in YEARS[:-1]:
+        out[year] = df[f'{year}_price']
+    out['2014 & Older'] = df['2014_price']
+    out[['TOTAL UNITS', 'Previous', 'DIFF']] = df[['TOTAL UNITS', 'Previous', 'DIFF']]
+    return out
+
+
+def time_call(func, repeat):
+    """Best wall time of several runs (seconds)"""
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def generator_cases(rows):
+    """name -> (generator, input data) for every HTML report generator"""
+    df = synthetic_frame(rows)
+    return {
+        'depreciation': (DepreciationHTMLGenerator(), df),
+        'colorful': (ColorfulGenerator(), df),
+        'soft': (SoftGenerator(), df),
+        'final_pdf': (FinalPDFGenerator(), df),
+        'pdf_enhanced': (PDFEnhancedGenerator(), df),
+        'pdf_style': (PDFStyleHTMLGenerator(), pdf_style_frame(df)),
+        'market_analysis': (MarketAnalysisGenerator(), synthetic_snapshot(rows)),
+    }
+
+
+def run(row_counts, repeat):
+    """Benchmark every generator, returns list of result dicts"""
+    results = []
+    
+    with tempfile.TemporaryDirectory() as tmp:
+        for rows in row_counts:
+            for name, (generator, data) in generator_cases(rows).items():
+                output_file = os.path.join(tmp, f'{name}_{rows}.html')
+                seconds = time_call(lambda: generator.generate_report(data, output_file), repeat)
+                results.append({
+                    'generator': name,
+                    'rows': rows,
+                    'seconds': round(seconds, 4),
+                    'bytes': os.path.getsize(output_file)
+                })
+                print(f"  {name:<16} {rows:>6} rows  {seconds * 1000:>9.1f} ms  {os.path.getsize(output_file):>10,} bytes")
+    
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark HTML report rendering')
+    parser.add_argument('--rows', type=int, nargs='+', default=[1000, 10000])
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+    
+    print("=" * 70)
+    print("Report Rendering Benchmark")
+    print("=" * 70)
+    run(args.rows, args.repeat)
+
+
+if __name__ == '__main__':
+    main()
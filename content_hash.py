@@ -0,0 +1,42 @@
+"""
+Ablink SGCarmart Scraper - Content Hash
+By Oneiros Indonesia
+
+One content hash for snapshots and tables, shared by the history
+managers (skip saving unchanged data) and the render service (report
+cache keys).
+
+Usage:
+    content_hash({'vehicles': [...], 'date': ...}, ignore=('date', 'time'))
+    content_hash(df)
+"""
+
+import hashlib
+import json
+import sys
+
+
+def content_hash(data, ignore=()):
+    """
+    Content hash of a snapshot dict or a DataFrame
+    
+    Args:
+        data: Snapshot dict (JSON-serializable, keys in any order) or DataFrame
+        ignore: Top-level dict keys left out (e.g. the scrape time)
+    
+    Returns:
+        str: Hex digest (sha256)
+    """
+    digest = hashlib.sha256()
+    
+    # Not imported here: a DataFrame means pandas is already loaded
+    pd = sys.modules.get('pandas')
+    if pd is not None and isinstance(data, pd.DataFrame):
+        digest.update('|'.join(map(str, data.columns)).encode('utf-8'))
+        digest.update(pd.util.hash_pandas_object(data, index=False).values.tobytes())
+    else:
+        if ignore:
+            data = {key: value for key, value in data.items() if key not in ignore}
+        digest.update(json.dumps(data, sort_keys=True, ensure_ascii=False, default=str).encode('utf-8'))
+    
+    return digest.hexdigest()
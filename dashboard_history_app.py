@@ -6,22 +6,29 @@ Features:
 - Natural soft colors (easy on eyes)
 - Date history navigation (left/right)
 - Manual scraping button
-- Auto scraping daily at 9 AM
+- Auto scraping on the config.json schedule (default daily 9 AM)
 - Export: CSV, Excel, PDF
 """
 
 from flask import Flask, render_template, jsonify, send_file, request
-import pandas as pd
 from datetime import datetime, timedelta
 import json
 import os
 import threading
-import schedule
-import time
 import io
-from colorful_generator import ColorfulGenerator
+from render_service import render_service
+import http_response
+import metrics
+import profiling
+from scheduler import Scheduler
+from app_logging import get_logger
+
+logger = get_logger(__name__)
 
 app = Flask(__name__)
+metrics.init_app(app)
+profiling.init_app(app)
+http_response.init_app(app)
 
 # Configuration
 HISTORY_FILE = "daily_reports/history.json"
@@ -93,12 +100,15 @@ def get_sample_data():
         'Previous': [55, 17, 105, 29, 25, 24, 9, 54, 21, 3, 11, 72, 78, 25, 61, 28, 37, 41, 15, 8, 50],
         'DIFF': [2, 3, -6, -5, -3, 1, 2, -2, -4, 2, -3, -3, 8, 5, 7, -2, -2, 3, 9, -2, 21]
     }
+    import pandas as pd
     return pd.DataFrame(data)
 
 
+@profiling.profile_run('scrape')
+@metrics.run_timer()
 def scrape_and_save():
     """Scrape data and save to history"""
-    print(f"\n[{datetime.now().strftime('%Y-%m-%d %H:%M:%S')}] Starting scrape...")
+    logger.info("Starting scrape...")
     
     # Get data (replace with real scraper)
     df = get_sample_data()
@@ -112,40 +122,34 @@ def scrape_and_save():
         'timestamp': datetime.now().isoformat(),
         'total_vehicles': len(df),
         'total_units': int(df['TOTAL UNITS'].sum()),
-        'data': df.to_dict('records')
+        'data': df.to_dict('records'),
+        'timings': metrics.current_run().summary()
     }
     
     save_history(history)
     
-    print(f"[OK] Data saved for {date_key}")
-    print(f"     Total vehicles: {len(df)}")
-    print(f"     Total units: {int(df['TOTAL UNITS'].sum())}")
+    logger.info("Data saved for %s: %d vehicles, %d units", date_key, len(df), int(df['TOTAL UNITS'].sum()))
     
     return df
 
 
 def daily_job():
     """Job to run daily at 9 AM"""
-    print(f"\n{'='*70}")
-    print(f"AUTO SCRAPE - {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
-    print(f"{'='*70}")
+    logger.info("Auto scrape")
     scrape_and_save()
 
 
+scheduler = Scheduler('dashboard_history')
+scheduler.add_job('daily_job', daily_job)
+
+
 def run_scheduler():
-    """Run scheduler in background"""
-    schedule.every().day.at("09:00").do(daily_job)
-    
-    print(f"\n{'='*70}")
-    print("SCHEDULER STARTED")
-    print(f"{'='*70}")
-    print("Auto scrape will run daily at 09:00")
-    print(f"Next run: {schedule.next_run()}")
-    print(f"{'='*70}\n")
+    """Run scheduler in background (catches up on a missed run first)"""
+    logger.info("Scheduler started - schedule: %s, next run: %s",
+                scheduler.jobs['daily_job'].schedule.expression,
+                scheduler.next_run('daily_job') if scheduler.enabled else 'disabled')
     
-    while True:
-        schedule.run_pending()
-        time.sleep(60)
+    scheduler.run_forever()
 
 
 @app.route('/')
@@ -193,6 +197,13 @@ def manual_scrape():
         }), 500
 
 
+@app.route('/api/scheduler')
+def scheduler_status():
+    """Scheduled jobs, next run and recent runs from the run ledger"""
+    limit = min(request.args.get('limit', 20, type=int), 200)
+    return jsonify(scheduler.status(limit=limit))
+
+
 @app.route('/api/export/<format>/<date>')
 def export_data(format, date):
     """Export data in various formats"""
@@ -201,6 +212,7 @@ def export_data(format, date):
     if date not in history:
         return jsonify({'error': 'Date not found'}), 404
     
+    import pandas as pd
     df = pd.DataFrame(history[date]['data'])
     
     if format == 'csv':
@@ -228,7 +240,17 @@ def export_data(format, date):
         )
     
     elif format == 'pdf':
-        # Generate HTML and return it (user can print to PDF)
+        pdf_file = render_service.render_pdf('colorful', df)
+        if pdf_file:
+            return send_file(
+                pdf_file,
+                mimetype='application/pdf',
+                as_attachment=True,
+                download_name=f'report_{date}.pdf'
+            )
+        
+        # No PDF engine installed - return HTML (user can print to PDF)
+        from colorful_generator import ColorfulGenerator
         generator = ColorfulGenerator()
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
         html_file = f"{DATA_FOLDER}/temp_report_{timestamp}.html"
@@ -265,7 +287,7 @@ if __name__ == '__main__':
     print("Features:")
     print("  - Date navigation (left/right)")
     print("  - Manual scraping button")
-    print("  - Auto scrape daily at 09:00")
+    print("  - Auto scrape on the config.json schedule")
     print("  - Export: CSV, Excel, PDF")
     print(f"{'='*70}\n")
     
@@ -4,23 +4,37 @@ By Oneiros Indonesia
 
 Features:
 - Manual scraping
-- Auto daily scraping at 9 AM
+- Auto scraping on the config.json schedule (default daily 9 AM)
 - History slider (left/right)
 - Export CSV, Excel, PDF
 - Soft natural colors
 """
 
 from flask import Flask, render_template, jsonify, send_file, request
-from datetime import datetime
-import pandas as pd
 import os
-from soft_generator import SoftGenerator
+from datetime import datetime
 from history_manager import HistoryManager
-import threading
-import schedule
-import time
+from render_service import render_service
+from functools import lru_cache
+
+from snapshot_delta import diff_records
+from leader_lock import run_as_leader
+from scheduler import Scheduler
+from report_retention import enforce_retention
+from app_logging import get_logger
+import http_response
+import metrics
+import profiling
+from http_cache import conditional_json, file_version, make_etag
+
+MAX_BATCH_DATES = 10  # Reports per /api/data/batch request
+
+logger = get_logger(__name__)
 
 app = Flask(__name__)
+metrics.init_app(app)
+profiling.init_app(app)
+http_response.init_app(app)
 history_mgr = HistoryManager()
 
 
@@ -72,12 +86,15 @@ def create_sample_data():
         'Previous': [55, 17, 105, 29, 25, 24, 9, 54, 21, 3, 11, 72, 78, 25, 61, 28, 37, 41, 15, 8, 50],
         'DIFF': [2, 3, -6, -5, -3, 1, 2, -2, -4, 2, -3, -3, 8, 5, 7, -2, -2, 3, 9, -2, 21]
     }
+    import pandas as pd
     return pd.DataFrame(data)
 
 
+@profiling.profile_run('scrape')
+@metrics.run_timer()
 def scrape_data():
     """Scrape data (sample for now)"""
-    print(f"[{datetime.now().strftime('%Y-%m-%d %H:%M:%S')}] Scraping data...")
+    logger.info("Scraping data...")
     
     # Create sample data
     df = create_sample_data()
@@ -86,33 +103,52 @@ def scrape_data():
     result = history_mgr.save_report(df)
     
     # Generate HTML report
+    from soft_generator import SoftGenerator
     generator = SoftGenerator()
     html_file = generator.generate_report(df)
     
-    print(f"[{datetime.now().strftime('%Y-%m-%d %H:%M:%S')}] Scraping complete!")
-    print(f"  Saved to: {result['date']}")
-    print(f"  HTML: {html_file}")
+    logger.info("Scraping complete - saved to %s, HTML: %s", result['date'], html_file)
     
     return result
 
 
 def daily_scrape():
-    """Daily scraping job"""
-    scrape_data()
+    """Daily scraping job (then drops reports beyond config.json output_settings)"""
+    result = scrape_data()
+    enforce_retention('daily_reports')
+    return result
+
+
+@lru_cache(maxsize=1)
+def get_scheduler():
+    """Daily scrape scheduler (schedule from config.json "automation")"""
+    scheduler = Scheduler('dashboard_web')
+    scheduler.add_job('daily_scrape', daily_scrape)
+    return scheduler
 
 
 def run_scheduler():
-    """Run scheduler in background"""
-    schedule.every().day.at("09:00").do(daily_scrape)
+    """Run scheduler in background (catches up on a missed run first)"""
+    get_scheduler().run_forever()
+
+
+def start_scheduler():
+    """
+    Start the daily scheduler in exactly one process
+    
+    Called from __main__ or per gunicorn worker (post_fork hook); no longer
+    started at import time, so importing the app starts no threads.
+    """
+    if os.environ.get('SCHEDULER_ENABLED', '1') == '0':
+        logger.info("Scheduler disabled (SCHEDULER_ENABLED=0)")
+        return None
     
-    while True:
-        schedule.run_pending()
-        time.sleep(60)
+    return run_as_leader('dashboard_web_scheduler', run_scheduler)
 
 
-# Start scheduler in background thread
-scheduler_thread = threading.Thread(target=run_scheduler, daemon=True)
-scheduler_thread.start()
+def create_app():
+    """Application factory for WSGI servers (see wsgi.py)"""
+    return app
 
 
 @app.route('/')
@@ -138,6 +174,13 @@ def api_scrape():
         }), 500
 
 
+@app.route('/api/scheduler')
+def api_scheduler():
+    """Scheduled jobs, next run and recent runs from the run ledger"""
+    limit = min(request.args.get('limit', 20, type=int), 200)
+    return jsonify({'success': True, **get_scheduler().status(limit=limit)})
+
+
 @app.route('/api/history')
 def api_history():
     """Get history dates"""
@@ -147,28 +190,121 @@ def api_history():
     })
 
 
+def is_history_date(value):
+    """Whether value is a YYYY-MM-DD date of the history (request values end up in file paths)"""
+    try:
+        datetime.strptime(value or '', '%Y-%m-%d')
+    except ValueError:
+        return False
+    return value in history_mgr.get_history_dates()
+
+
+@lru_cache(maxsize=128)
+def records_delta(date, time, base, base_time):
+    """Delta between two saved reports (a report is identified by date and time)"""
+    data = history_mgr.get_date_data(date)
+    base_data = history_mgr.get_date_data(base)
+    if not data or not base_data or data['time'] != time or base_data['time'] != base_time:
+        return None
+    return diff_records(base_data['data'].to_dict('records'), data['data'].to_dict('records'))
+
+
+@app.route('/api/data/batch')
+def api_data_batch():
+    """
+    Get several reports in one request (history slider prefetch)
+    
+    GET /api/data/batch?dates=a,b,c&times=ta,tb,tc
+    
+    times are the report times the client already has cached (empty for
+    none); those reports are returned as {'unchanged': true}. All other
+    reports are read in one pass.
+    """
+    requested = [date for date in request.args.get('dates', '').split(',') if date][:MAX_BATCH_DATES]
+    if not requested:
+        return jsonify({'success': False, 'error': 'No dates given'}), 400
+    
+    known = dict(zip(requested, request.args.get('times', '').split(',')))
+    index_version = file_version(history_mgr.index_file)
+    
+    def build():
+        times = history_mgr.get_date_times()
+        to_load = [date for date in requested if date in times and known.get(date) != times[date]]
+        loaded = history_mgr.get_dates_data(to_load)
+        
+        reports = {}
+        for date in requested:
+            if date in loaded:
+                data = loaded[date]
+                reports[date] = {
+                    'date': data['date'],
+                    'time': data['time'],
+                    'datetime': data['datetime'],
+                    'summary': data['summary'],
+                    'data': data['data'].to_dict('records')
+                }
+            elif date in times and date not in to_load:
+                reports[date] = {'time': times[date], 'unchanged': True}
+        
+        return {
+            'success': True,
+            'reports': reports,
+            'missing': [date for date in requested if date not in reports]
+        }
+    
+    etag = make_etag('batch', index_version, *requested, *(known.get(date) for date in requested))
+    return conditional_json(etag, build)
+
+
 @app.route('/api/data/<date>')
 def api_data(date):
-    """Get data for specific date"""
-    data = history_mgr.get_date_data(date)
+    """
+    Get data for specific date
+    
+    With ?base=<date>&base_time=<time> only the changed rows against that
+    report are returned ('delta' instead of 'data').
+    
+    Responses are serialized once per history index version (ETag).
+    """
+    base = request.args.get('base')
+    base_time = request.args.get('base_time')
+    index_version = file_version(history_mgr.index_file)
+    
+    if index_version is None:
+        return jsonify({'success': False, 'error': 'Date not found'}), 404
     
-    if data:
-        # Convert DataFrame to dict
-        df_dict = data['data'].to_dict('records')
+    # Only a date of the history (YYYY-MM-DD) can be a delta base
+    if not is_history_date(base):
+        base = base_time = None
+    
+    def build():
+        data = history_mgr.get_date_data(date)
+        if not data:
+            return {'success': False, 'error': 'Date not found'}
         
-        return jsonify({
+        payload = {
             'success': True,
             'date': data['date'],
             'time': data['time'],
             'datetime': data['datetime'],
-            'summary': data['summary'],
-            'data': df_dict
-        })
+            'summary': data['summary']
+        }
+        
+        delta = records_delta(date, data['time'], base, base_time) if base and base_time and base != date else None
+        
+        if delta is not None:
+            payload['base'] = base
+            payload['delta'] = delta
+        else:
+            # Convert DataFrame to dict
+            payload['data'] = data['data'].to_dict('records')
+        
+        return payload
     
-    return jsonify({
-        'success': False,
-        'error': 'Date not found'
-    }), 404
+    if date not in history_mgr.get_history_dates():
+        return jsonify({'success': False, 'error': 'Date not found'}), 404
+    
+    return conditional_json(make_etag('data', date, index_version, base, base_time), build)
 
 
 @app.route('/api/export/<date>/<format>')
@@ -194,7 +330,13 @@ def api_export(date, format):
         return send_file(filepath, as_attachment=True, download_name=filename)
     
     elif format == 'pdf':
-        # Generate HTML and return for printing
+        pdf_file = render_service.render_pdf('soft', df)
+        if pdf_file:
+            return send_file(pdf_file, mimetype='application/pdf', as_attachment=True,
+                             download_name=f"export_{date}.pdf")
+        
+        # No PDF engine installed - return HTML for printing
+        from soft_generator import SoftGenerator
         generator = SoftGenerator()
         html_file = generator.generate_report(df)
         return send_file(html_file, as_attachment=False)
@@ -209,10 +351,14 @@ if __name__ == '__main__':
     print("="*70)
     print("\nFeatures:")
     print("  - Manual scraping")
-    print("  - Auto daily scraping at 9:00 AM")
+    print("  - Auto scraping on the config.json schedule")
     print("  - History slider")
     print("  - Export CSV, Excel, PDF")
     print("  - Soft natural colors")
+    
+    # Start scheduler in background thread
+    start_scheduler()
+    
     print("\nStarting server...")
     port = int(os.environ.get('PORT', 5555))
     print(f"Open: http://localhost:{port}")
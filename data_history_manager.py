@@ -3,20 +3,67 @@ Ablink SGCarmart Scraper - Data History Manager
 By Oneiros Indonesia
 
 Manages historical scraping data with unlimited history
+
+Every scrape is a run, keyed (date, run_id) with run_id the save time
+(HHMMSS): data/history/<date>/data_<run_id>.json. latest.json holds the
+last run of each date. The index keeps the runs of every date, so
+"last run before a moment" is a binary search.
+
+Runs are deduplicated by content hash (the snapshot without its date and
+time): a save identical to the previous run writes no data files, the
+index links the run to the run holding the data (index['links']). A
+new date still gets its own latest.json.
+
+Several processes (gunicorn workers, CLI scripts) may share a history
+folder: saves take an exclusive file lock (index.json.lock) and re-read
+the index before changing it, and readers reload the index whenever
+another process replaced index.json.
 """
 
+import bisect
 import json
 import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
 from datetime import datetime, timedelta
-import pandas as pd
+
+import metrics
+from app_logging import get_logger
+from content_hash import content_hash
+from event_bus import event_bus
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+logger = get_logger(__name__)
+
+
+# Snapshot fields left out of the content hash (change on every scrape)
+VOLATILE_KEYS = ('date', 'time')
 
 
 class DataHistoryManager:
     """Manages historical scraping data"""
     
-    def __init__(self, history_dir="data/history"):
+    def __init__(self, history_dir="data/history", diff_against='previous_day'):
+        """
+        Args:
+            history_dir: History folder
+            diff_against: Diff base of new runs - 'previous_day' (last run of
+                the previous date) or 'previous_run'
+        """
+        if diff_against not in ('previous_day', 'previous_run'):
+            raise ValueError(f"diff_against must be 'previous_day' or 'previous_run', not {diff_against!r}")
+        
         self.history_dir = history_dir
         self.index_file = os.path.join(history_dir, "index.json")
+        self.diff_against = diff_against
+        self._index_version = None
+        self._lock = threading.RLock()
         
         # Create directories
         os.makedirs(history_dir, exist_ok=True)
@@ -26,26 +73,102 @@ class DataHistoryManager:
     
     def _load_index(self):
         """Load history index"""
-        if os.path.exists(self.index_file):
+        # Version first: a save in between is picked up by the next _refresh
+        self._index_version = self._file_version()
+        if self._index_version is not None:
             with open(self.index_file, 'r', encoding='utf-8') as f:
                 self.index = json.load(f)
         else:
             self.index = {
                 'dates': [],
                 'latest': None,
-                'total_records': 0
+                'total_records': 0,
+                'runs': {}
             }
             self._save_index()
+        
+        # Indexes written before intra-day runs: find the run files once
+        if 'runs' not in self.index:
+            self.index['runs'] = {date: self._scan_runs(date) for date in self.index['dates']}
+            self._save_index()
+        
+        self.index.setdefault('hashes', {})
+        self.index.setdefault('links', {})
+        
+        # Sorted (date, run_id) keys of all runs, for bisect lookups
+        self._run_keys = sorted(
+            (date, run_id) for date, run_ids in self.index['runs'].items() for run_id in run_ids
+        )
+    
+    def _scan_runs(self, date):
+        """Run ids of a date from its data_<run_id>.json files"""
+        try:
+            names = os.listdir(os.path.join(self.history_dir, date))
+        except OSError:
+            return []
+        return sorted(name[5:-5] for name in names if name.startswith('data_') and name.endswith('.json'))
     
     def _save_index(self):
-        """Save history index"""
-        with open(self.index_file, 'w', encoding='utf-8') as f:
+        """Save history index (replaced atomically, readers never see half a file)"""
+        temp_file = f"{self.index_file}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(temp_file, 'w', encoding='utf-8') as f:
             json.dump(self.index, f, indent=2, ensure_ascii=False)
+        os.replace(temp_file, self.index_file)
+        self._index_version = self._file_version()
+    
+    def _file_version(self):
+        """Identity of the index file on disk (every save replaces it)"""
+        try:
+            stat = os.stat(self.index_file)
+        except FileNotFoundError:
+            return None
+        return stat.st_ino, stat.st_mtime_ns, stat.st_size
+    
+    def _refresh(self):
+        """Reload the index if another process saved it since it was loaded"""
+        if self._file_version() != self._index_version:
+            with self._lock:
+                if self._file_version() != self._index_version:
+                    self._load_index()
+    
+    @contextmanager
+    def _index_lock(self):
+        """
+        Exclusive access to the index across threads and processes
+        
+        The index is reloaded if needed, so the block changes the current
+        index and its _save_index does not overwrite another process's save.
+        """
+        with self._lock, open(f"{self.index_file}.lock", 'a') as lock_file:
+            # Released when the lock file is closed
+            if fcntl is not None:
+                fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX)
+            self._refresh()
+            yield
+    
+    def _data_run(self, date, run_id):
+        """(date, run_id) of the run whose file holds a run's data"""
+        link = self.index['links'].get(date, {}).get(run_id)
+        return tuple(link) if link else (date, run_id)
+    
+    def _run_hash(self, date, run_id):
+        """Content hash of a run (computed once for runs saved without one)"""
+        hashes = self.index['hashes'].setdefault(date, {})
+        if run_id not in hashes:
+            data = self.get_run(date, run_id)
+            if data is None:
+                return None
+            hashes[run_id] = content_hash(data, ignore=VOLATILE_KEYS)
+        return hashes[run_id]
     
     def save_data(self, data, date=None):
         """
         Save scraped data to history
         
+        A save identical to the previous run (same content_hash without
+        VOLATILE_KEYS) only adds the run to the index, linked to the run
+        that holds the data.
+        
         Args:
             data: Scraped data dictionary
             date: Date string (YYYY-MM-DD), defaults to today
@@ -53,28 +176,49 @@ class DataHistoryManager:
         Returns:
             str: Saved date
         """
+        with self._index_lock():
+            return self._save_data(data, date)
+    
+    def _save_data(self, data, date):
+        """save_data with the index lock held"""
         if date is None:
             date = datetime.now().strftime('%Y-%m-%d')
         
+        start = time.perf_counter()
+        
         # Create date folder
         date_dir = os.path.join(self.history_dir, date)
         os.makedirs(date_dir, exist_ok=True)
         
-        # Generate timestamp for this scrape
+        # Run id: time of this scrape (suffixed if a run exists that second)
+        runs = self.index['runs'].setdefault(date, [])
         timestamp = datetime.now().strftime('%H%M%S')
+        run_id, n = timestamp, 1
+        while run_id in runs:
+            run_id, n = f"{timestamp}-{n}", n + 1
+        timestamp = run_id
+        
+        digest = content_hash(data, ignore=VOLATILE_KEYS)
+        previous = self.get_last_run_before(date, run_id)
+        source = self._data_run(*previous) if previous and self._run_hash(*previous) == digest else None
+        
+        if source is not None:
+            self.index['links'].setdefault(date, {})[run_id] = list(source)
+            metrics.SNAPSHOTS_DEDUPLICATED.inc(store='data_history')
+        else:
+            # Save JSON data
+            json_file = os.path.join(date_dir, f"data_{timestamp}.json")
+            with open(json_file, 'w', encoding='utf-8') as f:
+                json.dump(data, f, indent=2, ensure_ascii=False)
         
-        # Save JSON data
-        json_file = os.path.join(date_dir, f"data_{timestamp}.json")
-        with open(json_file, 'w', encoding='utf-8') as f:
-            json.dump(data, f, indent=2, ensure_ascii=False)
-        
-        # Also save as latest for this date
-        latest_file = os.path.join(date_dir, "latest.json")
-        with open(latest_file, 'w', encoding='utf-8') as f:
-            json.dump(data, f, indent=2, ensure_ascii=False)
+        # Also save as latest for this date (unchanged after a duplicate run of the same date)
+        if source is None or previous[0] != date:
+            latest_file = os.path.join(date_dir, "latest.json")
+            with open(latest_file, 'w', encoding='utf-8') as f:
+                json.dump(data, f, indent=2, ensure_ascii=False)
         
         # Save CSV for easy viewing
-        if 'vehicles' in data:
+        if source is None and 'vehicles' in data:
             rows = []
             for v in data['vehicles']:
                 row = {
@@ -90,6 +234,7 @@ class DataHistoryManager:
                     row[f'{year}_Units'] = year_data.get('units', 0)
                 rows.append(row)
             
+            import pandas as pd
             df = pd.DataFrame(rows)
             csv_file = os.path.join(date_dir, f"data_{timestamp}.csv")
             df.to_csv(csv_file, index=False, encoding='utf-8-sig')
@@ -103,15 +248,36 @@ class DataHistoryManager:
             self.index['dates'].append(date)
             self.index['dates'].sort(reverse=True)
         
+        bisect.insort(runs, run_id)
+        bisect.insort(self._run_keys, (date, run_id))
+        self.index['hashes'].setdefault(date, {})[run_id] = digest
+        
+        # Stage timings of the scrape that produced this run (see metrics.run_timer)
+        metrics.observe('history_save', time.perf_counter() - start)
+        run = metrics.current_run()
+        if run is not None:
+            self.index.setdefault('timings', {}).setdefault(date, {})[run_id] = run.summary()
+        
         self.index['latest'] = date
         self.index['total_records'] += 1
         self._save_index()
         
-        print(f"[OK] Data saved for {date}")
+        event_bus.publish('snapshot.saved', {
+            'date': date,
+            'time': timestamp,
+            'run_id': run_id,
+            'vehicles_count': len(data.get('vehicles', []))
+        })
+        
+        if source is not None:
+            logger.info("Data unchanged for %s (run %s, same as run %s %s)", date, run_id, *source)
+        else:
+            logger.info("Data saved for %s (run %s)", date, run_id)
         return date
     
     def get_dates(self):
         """Get all available dates (sorted newest first)"""
+        self._refresh()
         return sorted(self.index['dates'], reverse=True)
     
     def get_data(self, date):
@@ -133,8 +299,184 @@ class DataHistoryManager:
         
         return None
     
+    def get_runs(self, date):
+        """Run ids of a date (oldest first)"""
+        self._refresh()
+        return list(self.index['runs'].get(date, []))
+    
+    def get_run(self, date, run_id):
+        """
+        Get the data of one run
+        
+        Args:
+            date: Date string (YYYY-MM-DD)
+            run_id: Run id (HHMMSS) from get_runs
+        
+        Returns:
+            dict: Data of that run, or None if not found
+        """
+        self._refresh()
+        if run_id not in self.index['runs'].get(date, ()):
+            return None
+        
+        data_date, data_run_id = self._data_run(date, run_id)
+        run_file = os.path.join(self.history_dir, data_date, f"data_{data_run_id}.json")
+        try:
+            with open(run_file, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except FileNotFoundError:
+            return None
+        
+        # Linked run: same content, its own date and time
+        if (data_date, data_run_id) != (date, run_id):
+            data['date'] = date
+            data['time'] = f"{run_id[:2]}:{run_id[2:4]}:{run_id[4:6]}"
+        return data
+    
+    def get_run_timings(self, date, run_id=None):
+        """
+        Stage timing summaries of a date's runs (scrapes timed with metrics.run_timer)
+        
+        Returns:
+            dict: run_id -> summary, or one summary (None if not recorded) for a run_id
+        """
+        self._refresh()
+        timings = self.index.get('timings', {}).get(date, {})
+        if run_id is not None:
+            return timings.get(run_id)
+        return dict(timings)
+    
+    def get_last_run_before(self, date, run_id=None):
+        """
+        Last run strictly before a moment
+        
+        Args:
+            date: Date string (YYYY-MM-DD)
+            run_id: Run id / time (HHMMSS) on that date; None for the start
+                of the date (i.e. the previous day's last run)
+        
+        Returns:
+            tuple: (date, run_id) or None
+        """
+        self._refresh()
+        i = bisect.bisect_left(self._run_keys, (date, run_id or ''))
+        return self._run_keys[i - 1] if i else None
+    
+    def get_previous_run(self, date, run_id):
+        """Run before the given run (may be on an earlier date)"""
+        return self.get_last_run_before(date, run_id)
+    
+    def get_diff_base(self, date=None):
+        """
+        Data a new run on a date is diffed against (see diff_against)
+        
+        Returns:
+            dict: Data of the base run, or None if there is none
+        """
+        if date is None:
+            date = datetime.now().strftime('%Y-%m-%d')
+        
+        if self.diff_against == 'previous_run':
+            # Last run up to the end of the date
+            next_day = (datetime.strptime(date, '%Y-%m-%d') + timedelta(days=1)).strftime('%Y-%m-%d')
+            key = self.get_last_run_before(next_day)
+        else:
+            key = self.get_last_run_before(date)
+        
+        return self.get_run(*key) if key else None
+    
+    def get_data_stat(self, date):
+        """
+        File stat of a date's snapshot, without loading it
+        
+        Changes whenever the snapshot is re-saved, so it can be used as a
+        cheap version (HTTP ETag / Last-Modified).
+        
+        Returns:
+            os.stat_result or None if not found
+        """
+        try:
+            return os.stat(os.path.join(self.history_dir, date, "latest.json"))
+        except (OSError, TypeError):
+            return None
+    
+    def get_index_version(self):
+        """Version of the date list (changes on every save)"""
+        self._refresh()
+        return f"{self.index['total_records']}:{self.index['latest']}:{len(self.index['dates'])}"
+    
+    def get_latest_date(self):
+        """Date of the most recent save"""
+        self._refresh()
+        return self.index['latest']
+    
+    def get_dates_in_range(self, start_date=None, end_date=None):
+        """
+        Get available dates within a range (sorted oldest first)
+        
+        Args:
+            start_date: First date to include (YYYY-MM-DD), None for no lower bound
+            end_date: Last date to include (YYYY-MM-DD), None for no upper bound
+        
+        Returns:
+            list: Dates in the range
+        """
+        self._refresh()
+        return [
+            d for d in sorted(self.index['dates'])
+            if (start_date is None or d >= start_date) and (end_date is None or d <= end_date)
+        ]
+    
+    def iter_range(self, start_date=None, end_date=None, max_workers=4):
+        """
+        Iterate over the data of every date in a range in one pass
+        
+        Files are read in parallel in small batches, but always yielded
+        in date order so callers can stream the result.
+        
+        Args:
+            start_date: First date to include (YYYY-MM-DD)
+            end_date: Last date to include (YYYY-MM-DD)
+            max_workers: Number of parallel file reads
+        
+        Yields:
+            tuple: (date, data) for each date that has data
+        """
+        dates = self.get_dates_in_range(start_date, end_date)
+        if not dates:
+            return
+        
+        batch_size = max_workers * 2
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            for i in range(0, len(dates), batch_size):
+                batch = dates[i:i + batch_size]
+                for date, data in zip(batch, executor.map(self.get_data, batch)):
+                    if data:
+                        yield date, data
+    
+    def get_data_batch(self, dates, max_workers=4):
+        """
+        Get data for several dates, files read in parallel
+        
+        Args:
+            dates: Dates to load (YYYY-MM-DD)
+            max_workers: Number of parallel file reads
+        
+        Returns:
+            dict: date -> data, dates without data left out
+        """
+        dates = list(dict.fromkeys(dates))
+        if not dates:
+            return {}
+        
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(dates))) as executor:
+            results = list(executor.map(self.get_data, dates))
+        
+        return {date: data for date, data in zip(dates, results) if data}
+    
     def get_latest(self):
         """Get the most recent data"""
+        self._refresh()
         if self.index['latest']:
             return self.get_data(self.index['latest'])
         return None
@@ -165,6 +507,7 @@ class DataHistoryManager:
         
         return None
     
+    @metrics.timed('diff')
     def calculate_diff(self, current_data, previous_data):
         """
         Calculate differences between current and previous data
@@ -231,18 +574,57 @@ class DataHistoryManager:
         """
         cutoff = (datetime.now() - timedelta(days=keep_days)).strftime('%Y-%m-%d')
         
-        removed = 0
-        for date in self.index['dates'][:]:
-            if date < cutoff:
-                date_dir = os.path.join(self.history_dir, date)
-                if os.path.exists(date_dir):
-                    import shutil
-                    shutil.rmtree(date_dir)
-                    removed += 1
-                self.index['dates'].remove(date)
-        
-        if removed > 0:
-            self._save_index()
-            print(f"[OK] Removed {removed} old records")
+        with self._index_lock():
+            self._unlink_runs_before(cutoff)
+            
+            removed = 0
+            for date in self.index['dates'][:]:
+                if date < cutoff:
+                    date_dir = os.path.join(self.history_dir, date)
+                    if os.path.exists(date_dir):
+                        import shutil
+                        shutil.rmtree(date_dir)
+                        removed += 1
+                    self.index['dates'].remove(date)
+                    self.index['runs'].pop(date, None)
+                    self.index['hashes'].pop(date, None)
+                    self.index['links'].pop(date, None)
+                    self.index.get('timings', {}).pop(date, None)
+            
+            self._run_keys = [key for key in self._run_keys if key[0] >= cutoff]
+            
+            if removed > 0:
+                self._save_index()
+                logger.info("Removed %d old records", removed)
         
         return removed
+    
+    def _unlink_runs_before(self, cutoff):
+        """
+        Give linked runs of kept dates their own data file when the run
+        holding the data is on a date that is about to be removed
+        
+        The first such run gets the file, later runs are linked to it.
+        """
+        moved = {}
+        for date in sorted(self.index['links']):
+            if date < cutoff:
+                continue
+            
+            links = self.index['links'][date]
+            for run_id in sorted(links):
+                source = tuple(links[run_id])
+                if source[0] >= cutoff:
+                    continue
+                
+                if source in moved:
+                    links[run_id] = list(moved[source])
+                    continue
+                
+                data = self.get_run(date, run_id)
+                del links[run_id]
+                if data is not None:
+                    run_file = os.path.join(self.history_dir, date, f"data_{run_id}.json")
+                    with open(run_file, 'w', encoding='utf-8') as f:
+                        json.dump(data, f, indent=2, ensure_ascii=False)
+                moved[source] = (date, run_id)
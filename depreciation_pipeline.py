@@ -0,0 +1,94 @@
+"""
+Ablink SGCarmart Scraper - Depreciation Pipeline
+By Oneiros Indonesia
+
+Scrape -> typed DataFrame -> outputs, passed in memory:
+- The scraped DataFrame goes straight to the report renderer
+  (no Excel file written and read back)
+- File output (Excel / CSV) is an optional sink, written while the
+  report renders in the render service
+
+Usage:
+    result = run_pipeline({'headless': True}, formats=('excel', 'html'))
+    if result:
+        result.data       # DataFrame (typed columns)
+        result.files      # {'excel': ..., 'latest_excel': ..., 'latest_csv': ...}
+        result.html_file  # path of the styled HTML report (render service cache)
+        result.timings    # stage timing summary of the run (metrics.run_timer)
+"""
+
+from app_logging import get_logger
+from metrics import run_timer, timed
+
+logger = get_logger(__name__)
+
+
+FORMATS = ('excel', 'csv', 'html')
+
+
+class PipelineResult:
+    """Outputs of one pipeline run"""
+    
+    def __init__(self, data, files=None, html_file=None, timings=None):
+        self.data = data
+        self.files = files or {}
+        self.html_file = html_file
+        self.timings = timings
+    
+    def __bool__(self):
+        return self.data is not None and not self.data.empty
+
+
+def run_pipeline(config=None, url=None, formats=FORMATS, scraper=None):
+    """
+    Scrape the depreciation table and write the requested outputs
+    
+    Args:
+        config: DepreciationScraper config (save_* flags are set from formats)
+        url: Target URL (optional)
+        formats: Any of 'excel', 'csv' (file sink) and 'html' (styled report)
+        scraper: Scraper to use (default: a new DepreciationScraper)
+    
+    Returns:
+        PipelineResult: None if nothing was scraped
+    """
+    # One run: the scrape stages, the file writes and the report wait
+    with run_timer() as run:
+        result = _run_pipeline(config, url, formats, scraper)
+        if result is not None:
+            result.timings = run.summary()
+        return result
+
+
+def _run_pipeline(config, url, formats, scraper):
+    from depreciation_scraper import DepreciationScraper
+    from render_service import render_service
+    
+    write_files = 'excel' in formats or 'csv' in formats
+    if scraper is None:
+        scraper = DepreciationScraper({
+            **(config or {}),
+            'save_excel': 'excel' in formats,
+            'save_csv': 'csv' in formats,
+            'save_html': False  # The styled report is rendered below
+        })
+    
+    scraped = scraper.run(url, save=False)
+    if scraped is None:
+        return None
+    
+    df = scraped.data
+    
+    # The report renders in the render pool while the files are written here
+    report = render_service.submit('depreciation', df) if 'html' in formats else None
+    files = scraper.save_data(df) if write_files else {}
+    
+    html_file = None
+    if report is not None:
+        try:
+            with timed('report_wait'):
+                html_file = render_service.wait(report, 'depreciation', df)
+        except Exception as e:
+            logger.error("Could not render the depreciation report: %s", e)
+    
+    return PipelineResult(df, files, html_file)
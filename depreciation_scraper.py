@@ -12,13 +12,41 @@ from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.webdriver.chrome.service import Service
 from selenium.webdriver.chrome.options import Options
+from selenium.common.exceptions import TimeoutException
 from webdriver_manager.chrome import ChromeDriverManager
-from bs4 import BeautifulSoup
-import pandas as pd
+import argparse
+import contextvars
+import queue
+import shutil
+import threading
 import time
+import logging
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime
 import os
 
+from app_logging import get_logger, log_context, new_run_id
+from event_bus import event_bus
+from metrics import observe, run_timer, timed
+from profiling import add_cli_argument, profile, profile_run
+from report_retention import enforce_retention
+from table_extraction import best_table, typed_frame
+
+logger = get_logger(__name__)
+
+
+class ScrapeResult(dict):
+    """
+    Saved file paths of a run (the dict run() always returned) plus the
+    scraped DataFrame in .data and the stage timing summary of the run
+    in .timings (see metrics.run_timer) - empty (falsy) when nothing was saved
+    """
+    
+    def __init__(self, files, data, timings=None):
+        super().__init__(files or {})
+        self.data = data
+        self.timings = timings
+
 
 class DepreciationScraper:
     """
@@ -26,6 +54,12 @@ class DepreciationScraper:
     Configurable parameters for flexible scraping
     """
     
+    # Rows (incl. header) a table needs to be used when no page has a clear depreciation table
+    MIN_FALLBACK_ROWS = 3
+    
+    # Log names of the data files (the HTML generator logs its own)
+    FILE_LABELS = {'excel': 'Excel', 'csv': 'CSV'}
+    
     def __init__(self, config=None):
         """
         Initialize scraper with configuration
@@ -36,6 +70,7 @@ class DepreciationScraper:
                 - timeout (int): Page load timeout in seconds
                 - delay (int): Delay between requests in seconds
                 - output_folder (str): Folder for saving reports
+                - url_workers (int): Candidate URLs fetched at once (one browser each)
         """
         # Default configuration
         self.config = {
@@ -43,6 +78,7 @@ class DepreciationScraper:
             'timeout': 30,
             'delay': 3,
             'output_folder': 'daily_reports',
+            'url_workers': 2,
             'save_excel': True,
             'save_csv': True,
             'save_html': True
@@ -63,19 +99,33 @@ class DepreciationScraper:
         
         self.driver = None
         self.data = None
+        self.write_timings = {}
     
+    def _create_driver(self):
+        """New Chrome WebDriver with the scraper options"""
+        service = Service(ChromeDriverManager().install())
+        driver = webdriver.Chrome(service=service, options=self.options)
+        driver.maximize_window()
+        return driver
+    
+    @timed('driver_start')
     def start_driver(self):
         """Initialize Chrome WebDriver"""
-        print("Starting Chrome WebDriver...")
-        service = Service(ChromeDriverManager().install())
-        self.driver = webdriver.Chrome(service=service, options=self.options)
-        self.driver.maximize_window()
-        print("[OK] WebDriver started successfully!")
+        logger.info("Starting Chrome WebDriver...")
+        self.driver = self._create_driver()
+        logger.info("WebDriver started successfully")
     
     def scrape_depreciation_page(self, url=None):
         """
         Scrape depreciation data from SGCarmart
         
+        A given url is tried first, on its own. The default URLs are then
+        fetched concurrently (url_workers browsers) unless it had a good
+        table; every page is parsed once and its tables are scored (see
+        table_extraction). Once a page has a good table the remaining URLs
+        are cancelled; otherwise the best scored table of all pages is used.
+        Only the chosen table is converted to a DataFrame.
+        
         Args:
             url (str): Target URL. If None, will search for depreciation page
         
@@ -92,91 +142,139 @@ class DepreciationScraper:
             "https://www.sgcarmart.com/new_cars/overview.php?page=depreciation",
         ]
         
-        if url:
-            depreciation_urls.insert(0, url)
+        logger.info("Searching for depreciation data...")
         
-        print("\nSearching for depreciation data...")
+        # The caller's URL wins over a default page that happens to load faster
+        best = self._find_table([url]) if url else None
+        if best is None or not best.is_good:
+            fallback = self._find_table(depreciation_urls)
+            if fallback is not None and (best is None or fallback.score > best.score):
+                best = fallback
         
-        for test_url in depreciation_urls:
-            print(f"\nTrying: {test_url}")
-            
+        if best is None or (not best.is_good and best.row_count <= self.MIN_FALLBACK_ROWS):
+            logger.error("Could not find any data table on the depreciation pages")
+            return None
+        
+        if best.is_good:
+            logger.info("Found depreciation table (table %d on %s, score %.1f)", best.index + 1, best.source, best.score)
+        else:
+            logger.warning("Could not find depreciation table - using the best scored table (table %d on %s, score %.1f)",
+                           best.index + 1, best.source, best.score)
+        
+        df = self._parse_depreciation_table(best.table)
+        if df is None or df.empty:
+            return None
+        
+        self.data = df
+        logger.info("Successfully scraped %d rows of data", len(df))
+        event_bus.publish('scrape.progress', {'stage': 'parsed', 'rows': len(df)})
+        return df
+    
+    def _find_table(self, urls):
+        """
+        Best scored table of the candidate URLs (fetched concurrently)
+        
+        The first worker uses self.driver, further workers start their own
+        browser (closed again here).
+        
+        Returns:
+            TableCandidate: None if no page had a table
+        """
+        stop = threading.Event()
+        drivers = queue.LifoQueue()
+        drivers.put(self.driver)
+        extra_drivers = []
+        
+        def attempt(test_url):
+            if stop.is_set():
+                return None
             try:
-                self.driver.get(test_url)
-                time.sleep(self.config['delay'])
-                
-                # Wait for page load
-                try:
-                    WebDriverWait(self.driver, self.config['timeout']).until(
-                        EC.presence_of_element_located((By.TAG_NAME, "body"))
-                    )
-                except:
-                    print("[WARNING] Timeout waiting for page")
-                    continue
-                
-                # Parse page
-                soup = BeautifulSoup(self.driver.page_source, 'html.parser')
-                
-                # Look for depreciation table
-                tables = soup.find_all('table')
-                print(f"Found {len(tables)} tables on page")
-                
-                if tables:
-                    # Try to find the depreciation table
-                    # Look for table with year columns (2025, 2024, etc.)
-                    for idx, table in enumerate(tables):
-                        # Check headers for year patterns
-                        headers = table.find_all(['th', 'td'])
-                        header_text = ' '.join([h.get_text() for h in headers[:10]])
-                        
-                        # Check if this looks like depreciation table
-                        if any(year in header_text for year in ['2025', '2024', '2023', 'UNITS', 'DEPRECIATION']):
-                            print(f"[OK] Found depreciation table (table {idx + 1})")
-                            df = self._parse_depreciation_table(table)
-                            
-                            if df is not None and not df.empty:
-                                self.data = df
-                                print(f"[OK] Successfully scraped {len(df)} rows of data")
-                                return df
+                driver = drivers.get_nowait()
+            except queue.Empty:
+                driver = self._create_driver()
+                extra_drivers.append(driver)
+            try:
+                candidate = self._fetch_table(driver, test_url, stop)
+            finally:
+                drivers.put(driver)
             
-            except Exception as e:
-                print(f"[ERROR] Failed to scrape {test_url}: {e}")
-                continue
+            # Stop the other workers before they pick up the next URL
+            if candidate is not None and candidate.is_good:
+                stop.set()
+            return candidate
         
-        print("\n[WARNING] Could not find depreciation table")
-        print("Attempting to scrape all tables for manual inspection...")
+        best = None
+        workers = max(1, min(self.config['url_workers'], len(urls)))
+        try:
+            with ThreadPoolExecutor(max_workers=workers, thread_name_prefix='depreciation-url') as pool:
+                # Workers keep the log context and run timer of this scrape
+                futures = {pool.submit(contextvars.copy_context().run, attempt, test_url): test_url for test_url in urls}
+                
+                for future in as_completed(futures):
+                    try:
+                        candidate = future.result()
+                    except Exception as e:
+                        logger.error("Failed to scrape %s: %s", futures[future], e)
+                        continue
+                    
+                    if candidate is not None and (best is None or candidate.score > best.score):
+                        best = candidate
+                    
+                    if best is not None and best.is_good:
+                        # Pending URLs are dropped, running ones skip parsing
+                        stop.set()
+                        for pending in futures:
+                            pending.cancel()
+                        break
+        finally:
+            for driver in extra_drivers:
+                try:
+                    driver.quit()
+                except Exception:
+                    pass
         
-        # Last resort: get all tables
-        return self._scrape_all_tables()
+        return best
     
-    def _scrape_all_tables(self):
-        """Scrape all tables from current page"""
-        soup = BeautifulSoup(self.driver.page_source, 'html.parser')
-        tables = soup.find_all('table')
+    def _fetch_table(self, driver, url, stop):
+        """Load one URL and score its tables (None when stopped or no table)"""
+        logger.info("Trying: %s", url)
+        event_bus.publish('scrape.progress', {'stage': 'fetch', 'url': url})
+        
+        with timed('page_fetch'):
+            driver.get(url)
+        if stop.wait(self.config['delay']):
+            return None
+        
+        # Wait for page load
+        try:
+            WebDriverWait(driver, self.config['timeout']).until(
+                EC.presence_of_element_located((By.TAG_NAME, "body"))
+            )
+        except TimeoutException:
+            logger.warning("Timeout waiting for page: %s", url)
+            return None
         
-        all_data = []
+        if stop.is_set():
+            return None
         
-        for idx, table in enumerate(tables):
-            print(f"\nParsing table {idx + 1}...")
-            df = self._parse_depreciation_table(table)
-            
-            if df is not None and not df.empty and len(df) > 2:
-                all_data.append({
-                    'table_index': idx + 1,
-                    'data': df
-                })
-                print(f"  Rows: {len(df)}, Columns: {len(df.columns)}")
-        
-        if all_data:
-            # Return the largest table (likely the main depreciation table)
-            largest = max(all_data, key=lambda x: len(x['data']))
-            self.data = largest['data']
-            return self.data
-        
-        return None
+        # Parse the page once and score its tables
+        with timed('parse'):
+            candidate = best_table(driver.page_source, source=url)
+        
+        if candidate is None:
+            logger.debug("No data table on %s", url)
+        else:
+            logger.debug("Best table on %s: %r", url, candidate)
+        return candidate
     
+    @timed('parse')
     def _parse_depreciation_table(self, table):
         """
-        Parse HTML table into DataFrame
+        Parse HTML table into a typed DataFrame
+        
+        Units are int32, depreciation values numeric and Category
+        categorical (see table_extraction.typed_frame), so sums and
+        reports need no Excel round trip.
         
         Args:
             table: BeautifulSoup table element
@@ -208,15 +306,10 @@ class DepreciationScraper:
                         headers = row_text
                         continue
             
-            # Get data cells
+            # Get data cells ($ and , are removed when converting to numbers)
             cells = row.find_all('td')
             if cells:
-                row_data = []
-                for cell in cells:
-                    text = cell.get_text(strip=True)
-                    # Clean data
-                    text = text.replace('$', '').replace(',', '')
-                    row_data.append(text)
+                row_data = [cell.get_text(strip=True) for cell in cells]
                 
                 if any(row_data):  # Skip empty rows
                     data.append(row_data)
@@ -226,24 +319,27 @@ class DepreciationScraper:
         
         # Create DataFrame
         try:
-            if headers and len(headers) == len(data[0]):
-                df = pd.DataFrame(data, columns=headers)
-            else:
+            if not headers or len(headers) != len(data[0]):
                 # Generate column names
                 num_cols = len(data[0])
                 headers = [f"Column_{i+1}" for i in range(num_cols)]
-                df = pd.DataFrame(data, columns=headers)
             
-            return df
+            return typed_frame(data, headers)
         
         except Exception as e:
-            print(f"[ERROR] Failed to parse table: {e}")
+            logger.error("Failed to parse table: %s", e)
             return None
     
     def save_data(self, df=None, filename_prefix="depreciation"):
         """
         Save scraped data to various formats
         
+        Every format is serialized once, the formats are written
+        concurrently, and the _latest files are hardlinks (or copies) of
+        the timestamped files, swapped in atomically. Per-format write
+        times are logged, recorded as write_<format> stage metrics and
+        kept in self.write_timings.
+        
         Args:
             df (pd.DataFrame): Data to save. If None, uses self.data
             filename_prefix (str): Prefix for output files
@@ -255,97 +351,144 @@ class DepreciationScraper:
             df = self.data
         
         if df is None or df.empty:
-            print("[ERROR] No data to save")
+            logger.error("No data to save")
             return None
         
         # Create output folder
         output_folder = self.config['output_folder']
         if not os.path.exists(output_folder):
             os.makedirs(output_folder)
-            print(f"[OK] Created folder: {output_folder}")
+            logger.info("Created folder: %s", output_folder)
         
         # Generate timestamp
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
         date_str = datetime.now().strftime("%Y-%m-%d")
         
-        # Add metadata columns
-        df['Scraped_Date'] = date_str
-        df['Scraped_Time'] = datetime.now().strftime("%H:%M:%S")
+        # Add metadata columns (to a copy - the caller's frame may be in use by a report)
+        report_df = df
+        df = df.assign(Scraped_Date=date_str, Scraped_Time=datetime.now().strftime("%H:%M:%S"))
+        
+        def write_html(path):
+            from depreciation_html_generator import DepreciationHTMLGenerator
+            DepreciationHTMLGenerator().generate_report(report_df, path)
+        
+        # format -> (writer, timestamped file or None, latest file or None)
+        base = f"{output_folder}/{filename_prefix}"
+        writers = {
+            'excel': (lambda path: df.to_excel(path, index=False),
+                      f"{base}_{timestamp}.xlsx" if self.config['save_excel'] else None,
+                      f"{base}_latest.xlsx"),
+            'csv': (lambda path: df.to_csv(path, index=False, encoding='utf-8-sig'),
+                    f"{base}_{timestamp}.csv" if self.config['save_csv'] else None,
+                    f"{base}_latest.csv")
+        }
+        if self.config['save_html']:
+            writers['html'] = (write_html, f"{base}_{timestamp}.html", None)
         
         saved_files = {}
-        
-        # Save Excel
-        if self.config['save_excel']:
-            excel_file = f"{output_folder}/{filename_prefix}_{timestamp}.xlsx"
-            df.to_excel(excel_file, index=False)
-            saved_files['excel'] = excel_file
-            print(f"[OK] Excel saved: {excel_file}")
-        
-        # Save CSV
-        if self.config['save_csv']:
-            csv_file = f"{output_folder}/{filename_prefix}_{timestamp}.csv"
-            df.to_csv(csv_file, index=False, encoding='utf-8-sig')
-            saved_files['csv'] = csv_file
-            print(f"[OK] CSV saved: {csv_file}")
-        
-        # Save HTML report
-        if self.config['save_html']:
-            try:
-                from html_report_generator import HTMLReportGenerator
-                
-                # First save to Excel, then generate HTML
-                temp_excel = f"{output_folder}/temp_{timestamp}.xlsx"
-                df.to_excel(temp_excel, index=False)
-                
-                generator = HTMLReportGenerator()
-                html_file = generator.generate_html_report(
-                    temp_excel, 
-                    f"{output_folder}/{filename_prefix}_{timestamp}.html"
-                )
-                saved_files['html'] = html_file
-                
-                # Clean up temp file
-                if os.path.exists(temp_excel):
-                    os.remove(temp_excel)
+        self.write_timings = {}
+        
+        with ThreadPoolExecutor(max_workers=len(writers), thread_name_prefix='depreciation-writer') as pool:
+            # Writers keep the log context and run timer of this scrape
+            futures = {
+                fmt: pool.submit(contextvars.copy_context().run, self._write_format, fmt, *writer)
+                for fmt, writer in writers.items()
+            }
             
-            except Exception as e:
-                print(f"[WARNING] Could not generate HTML report: {e}")
-        
-        # Save latest version (overwrite)
-        latest_excel = f"{output_folder}/{filename_prefix}_latest.xlsx"
-        latest_csv = f"{output_folder}/{filename_prefix}_latest.csv"
-        
-        df.to_excel(latest_excel, index=False)
-        df.to_csv(latest_csv, index=False, encoding='utf-8-sig')
+            for fmt, future in futures.items():
+                _, path, latest = writers[fmt]
+                try:
+                    self.write_timings[fmt] = future.result()
+                except Exception as e:
+                    if fmt != 'html':
+                        raise
+                    logger.warning("Could not generate HTML report: %s", e)
+                    continue
+                
+                if path:
+                    saved_files[fmt] = path
+                if latest:
+                    saved_files[f"latest_{fmt}"] = latest
         
-        saved_files['latest_excel'] = latest_excel
-        saved_files['latest_csv'] = latest_csv
+        logger.info("Files written: %s", ', '.join(f"{fmt} {seconds:.2f}s" for fmt, seconds in self.write_timings.items()))
+        event_bus.publish('scrape.progress', {'stage': 'saved', 'files': sorted(saved_files)})
         
-        print(f"\n[OK] Latest files also updated")
+        # Old timestamped files beyond config.json output_settings
+        enforce_retention(output_folder)
         
         return saved_files
     
+    def _write_format(self, fmt, write_file, path, latest):
+        """
+        Serialize one format once: to path, then link latest to it
+        (without path, straight to latest)
+        
+        Returns:
+            float: Seconds taken
+        """
+        start = time.perf_counter()
+        error = False
+        try:
+            if path:
+                write_file(path)
+                if fmt in self.FILE_LABELS:
+                    logger.info("%s saved: %s", self.FILE_LABELS[fmt], path)
+                if latest:
+                    self._replace_with_link(path, latest)
+            else:
+                root, ext = os.path.splitext(latest)
+                temp_file = f"{root}.{os.getpid()}.{threading.get_ident()}.tmp{ext}"
+                write_file(temp_file)
+                os.replace(temp_file, latest)
+        except BaseException:
+            error = True
+            raise
+        finally:
+            seconds = time.perf_counter() - start
+            observe(f"write_{fmt}", seconds, error)
+        return seconds
+    
+    @staticmethod
+    def _replace_with_link(source, target):
+        """Atomically point target at source's content (hardlink, copy where links fail)"""
+        root, ext = os.path.splitext(target)
+        temp_file = f"{root}.{os.getpid()}.{threading.get_ident()}.tmp{ext}"
+        try:
+            os.link(source, temp_file)
+        except OSError:
+            shutil.copyfile(source, temp_file)
+        os.replace(temp_file, target)
+    
     def close(self):
         """Close browser"""
         if self.driver:
             self.driver.quit()
-            print("\n[OK] Browser closed")
+            logger.info("Browser closed")
     
-    def run(self, url=None):
+    def run(self, url=None, save=True):
         """
         Complete scraping workflow
         
         Args:
             url (str): Target URL (optional)
+            save (bool): Write the output files (False: data only, see
+                depreciation_pipeline for writing them next to the report)
         
         Returns:
-            dict: Information about saved files
+            ScrapeResult: Saved files (dict) with the DataFrame in .data,
+                None if nothing was scraped
         """
-        print("="*70)
-        print("SGCarmart Depreciation Scraper")
-        print("="*70)
-        print(f"Date: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
-        print(f"Configuration: {self.config}")
+        with log_context(run_id=new_run_id()), profile_run('depreciation_scrape'), run_timer() as run:
+            result = self._run(url, save)
+            if result is not None:
+                result.timings = run.summary()
+                logger.info("Scrape timings: %.2fs total - %s", result.timings['total_seconds'],
+                            ', '.join(f"{stage} {entry['seconds']:.2f}s" for stage, entry in result.timings['stages'].items()))
+            return result
+    
+    def _run(self, url, save):
+        logger.info("SGCarmart depreciation scrape started")
+        logger.debug("Configuration: %s", self.config)
         
         try:
             # Start driver
@@ -355,38 +498,32 @@ class DepreciationScraper:
             df = self.scrape_depreciation_page(url)
             
             if df is not None and not df.empty:
-                # Display preview
-                print("\n" + "="*70)
-                print("DATA PREVIEW")
-                print("="*70)
-                print(df.head(10).to_string())
-                print(f"\nTotal rows: {len(df)}")
-                print(f"Total columns: {len(df.columns)}")
+                # Preview (only formatted when debug logging is on)
+                if logger.isEnabledFor(logging.DEBUG):
+                    logger.debug("Data preview:\n%s", df.head(10).to_string())
+                logger.info("Scraped %d rows, %d columns", len(df), len(df.columns))
                 
-                # Save data
-                print("\n" + "="*70)
-                print("SAVING DATA")
-                print("="*70)
-                saved_files = self.save_data(df)
+                saved_files = self.save_data(df) if save else None
                 
-                return saved_files
+                return ScrapeResult(saved_files, df)
             
             else:
-                print("\n[ERROR] No data scraped")
+                logger.error("No data scraped")
                 return None
         
         except Exception as e:
-            print(f"\n[ERROR] Scraping failed: {e}")
-            import traceback
-            traceback.print_exc()
+            logger.exception("Scraping failed: %s", e)
             return None
         
         finally:
             self.close()
 
 
-def main():
+def main(argv=None):
     """Main execution function"""
+    parser = argparse.ArgumentParser(description="SGCarmart depreciation data scraper")
+    add_cli_argument(parser)
+    args = parser.parse_args(argv)
     
     print("\n")
     print("="*70)
@@ -436,15 +573,16 @@ def main():
     # Create scraper
     scraper = DepreciationScraper(config)
     
-    # Run scraping
-    result = scraper.run(custom_url if custom_url else None)
+    # Run scraping (profiled with --profile)
+    with profile('depreciation_scrape', args.profile) as profiled:
+        result = scraper.run(custom_url if custom_url else None)
     
     # Summary
     print("\n" + "="*70)
     print("SUMMARY")
     print("="*70)
     
-    if result:
+    if result is not None:
         print("\n[SUCCESS] Scraping completed successfully!")
         print("\nSaved files:")
         for file_type, file_path in result.items():
@@ -453,6 +591,9 @@ def main():
     else:
         print("\n[FAILED] Scraping did not complete successfully")
     
+    if profiled.path:
+        print(f"\nProfile: {profiled.path}")
+    
     print("\n" + "="*70)
     input("\nPress Enter to exit...")
 
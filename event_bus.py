@@ -0,0 +1,173 @@
+"""
+Ablink SGCarmart Scraper - Event Bus
+By Oneiros Indonesia
+
+In-process publish/subscribe bus for live dashboard updates:
+- Scrapers, scheduler and history manager publish events
+- Web apps stream them to browsers as Server-Sent Events (/api/events)
+
+Event types:
+- scrape.started / scrape.progress / scrape.completed / scrape.failed
+- schedule.triggered
+- snapshot.saved
+- status (current app status, sent to each new subscriber)
+"""
+
+import json
+import queue
+import threading
+from collections import deque
+from datetime import datetime
+
+
+class Subscription:
+    """One subscriber queue (one open browser connection)"""
+    
+    def __init__(self, max_queued=100):
+        self.queue = queue.Queue(maxsize=max_queued)
+    
+    def put(self, event):
+        """Queue an event, dropping the oldest one if the client is too slow"""
+        while True:
+            try:
+                self.queue.put_nowait(event)
+                return
+            except queue.Full:
+                try:
+                    self.queue.get_nowait()
+                except queue.Empty:
+                    pass
+    
+    def get(self, timeout):
+        """Next event, or None after timeout"""
+        try:
+            return self.queue.get(timeout=timeout)
+        except queue.Empty:
+            return None
+
+
+class EventBus:
+    """Thread-safe in-process pub/sub with a short replay history"""
+    
+    def __init__(self, history_size=100):
+        """
+        Initialize event bus
+        
+        Args:
+            history_size: Recent events kept for reconnecting clients (Last-Event-ID)
+        """
+        self._lock = threading.Lock()
+        self._subscribers = set()
+        self._history = deque(maxlen=history_size)
+        self._next_id = 1
+    
+    def publish(self, event_type, data=None):
+        """
+        Publish an event to all subscribers
+        
+        Args:
+            event_type: Event name, e.g. 'scrape.progress'
+            data: JSON-serializable payload
+        
+        Returns:
+            dict: The published event
+        """
+        with self._lock:
+            event = {
+                'id': self._next_id,
+                'type': event_type,
+                'data': data or {},
+                'time': datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+            }
+            self._next_id += 1
+            self._history.append(event)
+            subscribers = list(self._subscribers)
+        
+        for subscription in subscribers:
+            subscription.put(event)
+        
+        return event
+    
+    def subscribe(self, last_event_id=None):
+        """
+        Register a subscriber
+        
+        Args:
+            last_event_id: Replay events published after this id (reconnect)
+        
+        Returns:
+            Subscription
+        """
+        subscription = Subscription()
+        
+        with self._lock:
+            if last_event_id is not None:
+                for event in self._history:
+                    if event['id'] > last_event_id:
+                        subscription.put(event)
+            self._subscribers.add(subscription)
+        
+        return subscription
+    
+    def unsubscribe(self, subscription):
+        """Remove a subscriber"""
+        with self._lock:
+            self._subscribers.discard(subscription)
+    
+    @property
+    def subscriber_count(self):
+        with self._lock:
+            return len(self._subscribers)
+    
+    def stream(self, last_event_id=None, initial_events=None, heartbeat=15):
+        """
+        Generator of Server-Sent Events for one client
+        
+        Args:
+            last_event_id: Value of the Last-Event-ID header, if any
+            initial_events: Events sent first, e.g. [('status', {...})]
+            heartbeat: Seconds between keep-alive comments
+        
+        Yields:
+            str: SSE formatted messages
+        """
+        subscription = self.subscribe(last_event_id)
+        
+        try:
+            # Tell the browser how long to wait before reconnecting
+            yield 'retry: 5000\n\n'
+            
+            for event_type, data in initial_events or []:
+                yield format_sse({'type': event_type, 'data': data, 'time': datetime.now().strftime('%Y-%m-%d %H:%M:%S')})
+            
+            while True:
+                event = subscription.get(timeout=heartbeat)
+                if event is None:
+                    yield ': keep-alive\n\n'
+                else:
+                    yield format_sse(event)
+        finally:
+            self.unsubscribe(subscription)
+
+
+def format_sse(event):
+    """Format one event as a Server-Sent Events message"""
+    payload = json.dumps({'data': event['data'], 'time': event['time']}, default=str)
+    lines = []
+    if event.get('id') is not None:
+        lines.append(f"id: {event['id']}")
+    lines.append(f"event: {event['type']}")
+    lines.append(f"data: {payload}")
+    return '\n'.join(lines) + '\n\n'
+
+
+def parse_last_event_id(value):
+    """Last-Event-ID header as int, None if missing or invalid"""
+    try:
+        return int(value) if value else None
+    except ValueError:
+        return None
+
+
+# Shared bus for the process
+event_bus = EventBus()
@@ -0,0 +1,53 @@
+"""
+Ablink SGCarmart Scraper - Gunicorn Configuration
+By Oneiros Indonesia
+
+    gunicorn -c gunicorn.conf.py wsgi:app
+
+Environment:
+    PORT              - Listen port (default 5555)
+    WEB_CONCURRENCY   - Worker processes (default 1, see below)
+    GUNICORN_THREADS  - Threads per worker (default 32, every open
+                        live-status stream holds one)
+    SCHEDULER_ENABLED - 0 disables the daily scheduler
+    LOG_LEVEL         - App log level (default INFO)
+    LOG_FORMAT        - 'json' (default here, one object per line) or 'text'
+    PROFILE           - 1 / collapsed profiles every scrape (see profiling.py)
+    PROFILE_TOKEN     - enables ?profile=1 with a matching X-Profile-Token
+
+One worker process with many threads: scrape status (one scrape at a
+time) and live events (/api/events) live in process memory, so with
+more workers a scrape started in one worker is not seen by the others
+and scheduler events never reach streams held by other workers. Only
+raise WEB_CONCURRENCY for read-only load; the history index itself is
+safe to share (file lock, see data_history_manager.py).
+"""
+
+import os
+
+# JSON log lines from the app loggers (set before the app is preloaded)
+os.environ.setdefault('LOG_FORMAT', 'json')
+
+
+bind = f"0.0.0.0:{os.environ.get('PORT', 5555)}"
+
+workers = int(os.environ.get('WEB_CONCURRENCY', 1))
+worker_class = 'gthread'
+threads = int(os.environ.get('GUNICORN_THREADS', 32))
+
+# Import the app (pandas, generators, ...) once in the master process
+preload_app = True
+
+# Worker heartbeat - with gthread, slow requests (scrapes) are not cut off
+timeout = 120
+graceful_timeout = 30
+keepalive = 5
+
+accesslog = '-'
+errorlog = '-'
+
+
+def post_fork(server, worker):
+    """Every worker stands by for the scheduler; one of them runs it"""
+    import wsgi
+    wsgi.start_scheduler()
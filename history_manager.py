@@ -3,12 +3,29 @@ Ablink SGCarmart Scraper - History Manager
 By Oneiros Indonesia
 
 Manage daily scraping history
+
+A report identical to the previous one (same DataFrame content) is not
+written again: its index entry points to the files of that report
+(data_date / data_time).
 """
 
 import json
 import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
 from datetime import datetime
-import pandas as pd
+
+from app_logging import get_logger
+from content_hash import content_hash
+from metrics import SNAPSHOTS_DEDUPLICATED, current_run, timed
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+logger = get_logger(__name__)
 
 
 class HistoryManager:
@@ -17,10 +34,17 @@ class HistoryManager:
     def __init__(self, history_dir="daily_reports/history"):
         self.history_dir = history_dir
         self.index_file = os.path.join(history_dir, "index.json")
+        self._lock = threading.Lock()
         os.makedirs(history_dir, exist_ok=True)
     
+    @timed('history_save')
     def save_report(self, df, scrape_date=None):
         """Save report to history"""
+        with self._index_lock():
+            return self._save_report(df, scrape_date)
+    
+    def _save_report(self, df, scrape_date):
+        """save_report with the index lock held"""
         if scrape_date is None:
             scrape_date = datetime.now().strftime("%Y-%m-%d")
         
@@ -30,41 +54,97 @@ class HistoryManager:
         
         timestamp = datetime.now().strftime("%H%M%S")
         
-        # Save CSV
-        csv_file = os.path.join(date_folder, f"data_{timestamp}.csv")
-        df.to_csv(csv_file, index=False, encoding='utf-8-sig')
+        index = self._load_index()
+        digest = content_hash(df)
+        previous = self._previous_entry(index)
         
-        # Save Excel
-        excel_file = os.path.join(date_folder, f"data_{timestamp}.xlsx")
-        df.to_excel(excel_file, index=False)
+        if previous is not None and previous[1].get('hash') == digest:
+            # Same content as the previous report: point to its files
+            data_date, data_time = self._entry_files(*previous)
+            SNAPSHOTS_DEDUPLICATED.inc(store='history')
+            logger.info("Report unchanged, not written again (same as %s %s)", data_date, data_time)
+        else:
+            data_date, data_time = scrape_date, timestamp
+            
+            # Save CSV
+            csv_file = os.path.join(date_folder, f"data_{timestamp}.csv")
+            df.to_csv(csv_file, index=False, encoding='utf-8-sig')
+            
+            # Save Excel
+            excel_file = os.path.join(date_folder, f"data_{timestamp}.xlsx")
+            df.to_excel(excel_file, index=False)
         
         # Update index
-        self._update_index(scrape_date, timestamp, df)
+        self._update_index(index, scrape_date, timestamp, df, digest, (data_date, data_time))
         
         return {
             'date': scrape_date,
             'time': timestamp,
-            'csv': csv_file,
-            'excel': excel_file
+            'csv': os.path.join(self.history_dir, data_date, f"data_{data_time}.csv"),
+            'excel': os.path.join(self.history_dir, data_date, f"data_{data_time}.xlsx"),
+            'unchanged': (data_date, data_time) != (scrape_date, timestamp)
         }
     
-    def _update_index(self, date, time, df):
-        """Update history index"""
-        # Load existing index
+    def _load_index(self):
+        """History index (empty if not written yet)"""
         if os.path.exists(self.index_file):
             with open(self.index_file, 'r', encoding='utf-8') as f:
-                index = json.load(f)
-        else:
-            index = {}
+                return json.load(f)
+        return {}
+    
+    def _save_index(self, index):
+        """Save history index (replaced atomically, readers never see half a file)"""
+        temp_file = f"{self.index_file}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(temp_file, 'w', encoding='utf-8') as f:
+            json.dump(index, f, indent=2, ensure_ascii=False)
+        os.replace(temp_file, self.index_file)
+    
+    @contextmanager
+    def _index_lock(self):
+        """
+        Exclusive access to the index across threads and processes
         
+        The index is read, changed and saved inside the block, so two
+        saves never drop each other's entries.
+        """
+        with self._lock, open(f"{self.index_file}.lock", 'a') as lock_file:
+            # Released when the lock file is closed
+            if fcntl is not None:
+                fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX)
+            yield
+    
+    @staticmethod
+    def _previous_entry(index):
+        """(date, entry) of the most recent report, or None"""
+        dates = [date for date, entries in index.items() if entries]
+        if not dates:
+            return None
+        date = max(dates)
+        return date, index[date][-1]
+    
+    @staticmethod
+    def _entry_files(date, entry):
+        """(date, time) of the files holding an entry's data"""
+        return entry.get('data_date', date), entry.get('data_time', entry['time'])
+    
+    def _update_index(self, index, date, time, df, digest, files):
+        """Update history index"""
         # Add summary
         summary = {
             'time': time,
             'datetime': f"{date} {time[:2]}:{time[2:4]}:{time[4:6]}",
             'total_vehicles': len(df),
             'total_units': int(df['TOTAL UNITS'].sum()),
-            'categories': df['Category'].nunique()
+            'categories': df['Category'].nunique(),
+            'hash': digest
         }
+        if files != (date, time):
+            summary['data_date'], summary['data_time'] = files
+        
+        # Stage timings of the scrape that produced this report (see metrics.run_timer)
+        run = current_run()
+        if run is not None:
+            summary['timings'] = run.summary()
         
         if date not in index:
             index[date] = []
@@ -72,8 +152,7 @@ class HistoryManager:
         index[date].append(summary)
         
         # Save index
-        with open(self.index_file, 'w', encoding='utf-8') as f:
-            json.dump(index, f, indent=2, ensure_ascii=False)
+        self._save_index(index)
     
     def get_history_dates(self):
         """Get list of dates with history"""
@@ -95,22 +174,65 @@ class HistoryManager:
         
         if date in index:
             # Get latest entry for the date
-            latest = index[date][-1]
-            
-            # Load CSV data
-            csv_file = os.path.join(self.history_dir, date, f"data_{latest['time']}.csv")
-            if os.path.exists(csv_file):
-                df = pd.read_csv(csv_file)
-                return {
-                    'date': date,
-                    'time': latest['time'],
-                    'datetime': latest['datetime'],
-                    'data': df,
-                    'summary': latest
-                }
+            return self._load_entry(date, index[date][-1])
         
         return None
     
+    def _load_entry(self, date, latest):
+        """Load the CSV data of an index entry"""
+        data_date, data_time = self._entry_files(date, latest)
+        csv_file = os.path.join(self.history_dir, data_date, f"data_{data_time}.csv")
+        if os.path.exists(csv_file):
+            import pandas as pd
+            df = pd.read_csv(csv_file)
+            return {
+                'date': date,
+                'time': latest['time'],
+                'datetime': latest['datetime'],
+                'data': df,
+                'summary': latest
+            }
+        
+        return None
+    
+    def get_date_times(self):
+        """Time of the latest report per date (from the index, no data loaded)"""
+        if not os.path.exists(self.index_file):
+            return {}
+        
+        with open(self.index_file, 'r', encoding='utf-8') as f:
+            index = json.load(f)
+        
+        return {date: entries[-1]['time'] for date, entries in index.items() if entries}
+    
+    def get_dates_data(self, dates, max_workers=4):
+        """
+        Get data for several dates in one pass
+        
+        The index is read once and the CSV files are read in parallel.
+        
+        Args:
+            dates: Dates to load (YYYY-MM-DD)
+            max_workers: Number of parallel file reads
+        
+        Returns:
+            dict: date -> data (as get_date_data), dates without data left out
+        """
+        if not dates or not os.path.exists(self.index_file):
+            return {}
+        
+        with open(self.index_file, 'r', encoding='utf-8') as f:
+            index = json.load(f)
+        
+        entries = [(date, index[date][-1]) for date in dates if index.get(date)]
+        if not entries:
+            return {}
+        
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(entries))) as executor:
+            results = list(executor.map(lambda entry: self._load_entry(*entry), entries))
+        
+        return {date: data for (date, _), data in zip(entries, results) if data}
+    
     def get_latest(self):
         """Get latest scraping data"""
         dates = self.get_history_dates()
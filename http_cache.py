@@ -0,0 +1,99 @@
+"""
+Ablink SGCarmart Scraper - HTTP Cache Helpers
+By Oneiros Indonesia
+
+Conditional responses for the read APIs:
+- Strong ETags derived from snapshot / pricelist versions (file stat),
+  so a matching If-None-Match is answered with 304 before loading data
+- Last-Modified / If-Modified-Since from the snapshot file time
+- Cache-Control: historical dates are immutable, current data revalidates
+- JSON bodies are serialized once per ETag (see http_response.cached_json)
+"""
+
+import hashlib
+import os
+from datetime import datetime, timezone
+
+from flask import Response, request
+
+from http_response import cached_json
+
+
+# A past date that already has a newer date after it never changes
+HISTORICAL_CACHE_CONTROL = 'public, max-age=86400, immutable'
+
+# Latest data, pricelist, comparison: cache but always revalidate
+REVALIDATE_CACHE_CONTROL = 'no-cache'
+
+
+def stat_version(stat):
+    """Version string of a file from its os.stat() result"""
+    return f"{stat.st_mtime_ns:x}-{stat.st_size:x}"
+
+
+def file_version(path):
+    """Version string of a file, None if it does not exist"""
+    try:
+        return stat_version(os.stat(path))
+    except OSError:
+        return None
+
+
+def make_etag(*parts):
+    """Strong ETag value from version parts"""
+    return hashlib.sha1('|'.join(str(part) for part in parts).encode('utf-8')).hexdigest()[:32]
+
+
+def not_modified(etag, last_modified=None):
+    """
+    Check the request's validators
+    
+    Args:
+        etag: Current ETag of the resource
+        last_modified: Modification time (epoch seconds), optional
+    
+    Returns:
+        Response: Empty 304 response if the client copy is current, else None
+    """
+    if request.if_none_match:
+        # Weak comparison: compressed responses carry W/"<etag>"
+        matched = request.if_none_match.contains_weak(etag)
+    elif last_modified is not None and request.if_modified_since:
+        matched = int(last_modified) <= request.if_modified_since.timestamp()
+    else:
+        matched = False
+    
+    if not matched:
+        return None
+    
+    return Response(status=304)
+
+
+def with_cache_headers(response, etag, cache_control=REVALIDATE_CACHE_CONTROL, last_modified=None):
+    """Set ETag, Cache-Control and Last-Modified on a response"""
+    response.set_etag(etag)
+    response.headers['Cache-Control'] = cache_control
+    if last_modified is not None:
+        response.last_modified = datetime.fromtimestamp(int(last_modified), timezone.utc)
+    return response
+
+
+def conditional_json(etag, build, cache_control=REVALIDATE_CACHE_CONTROL, last_modified=None):
+    """
+    JSON response that is only built when the client copy is stale
+    
+    Args:
+        etag: Current ETag of the resource
+        build: Callable returning the JSON payload (only called when the
+            client copy is stale and the body is not cached yet)
+        cache_control: Cache-Control header value
+        last_modified: Modification time (epoch seconds), optional
+    
+    Returns:
+        Response: 304 or 200 with the payload
+    """
+    response = not_modified(etag, last_modified)
+    if response is None:
+        response = cached_json(('etag', etag), build)
+    
+    return with_cache_headers(response, etag, cache_control, last_modified)
@@ -0,0 +1,217 @@
+"""
+Ablink SGCarmart Scraper - HTTP Response Layer
+By Oneiros Indonesia
+
+Shared response handling for the Flask apps:
+- JSON provider backed by orjson when installed (stdlib json otherwise)
+- Serialized JSON bodies cached per resource version (ETag), so a
+  snapshot is encoded once, not on every request
+- gzip / brotli compression negotiated from Accept-Encoding; compressed
+  bodies of versioned responses are cached as well
+
+Usage:
+    app = Flask(__name__)
+    init_app(app)
+
+Note: orjson writes NaN as null (stdlib json writes NaN, which browsers
+cannot parse).
+"""
+
+import gzip
+import threading
+from collections import OrderedDict
+
+from flask import current_app, request
+from flask.json.provider import DefaultJSONProvider
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+
+# Text responses worth compressing
+COMPRESSIBLE_MIMETYPES = {
+    'application/json', 'application/javascript', 'text/javascript',
+    'text/html', 'text/css', 'text/csv', 'text/plain', 'image/svg+xml'
+}
+
+# Small bodies gain nothing from compression
+MIN_COMPRESS_SIZE = 500
+
+GZIP_LEVEL = 6
+BROTLI_QUALITY = 5
+
+
+def _default(obj):
+    """Types orjson does not serialize natively (numpy values, dates, Markup)"""
+    if hasattr(obj, 'tolist'):
+        return obj.tolist()
+    return DefaultJSONProvider.default(obj)
+
+
+class ORJSONProvider(DefaultJSONProvider):
+    """Flask JSON provider using orjson, same output as jsonify otherwise"""
+    
+    def dumps_bytes(self, obj, indent=False):
+        """Serialize to UTF-8 bytes"""
+        option = orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME
+        if self.sort_keys:
+            option |= orjson.OPT_SORT_KEYS
+        if indent:
+            option |= orjson.OPT_INDENT_2
+        return orjson.dumps(obj, default=_default, option=option)
+    
+    def dumps(self, obj, **kwargs):
+        return self.dumps_bytes(obj, indent=kwargs.get('indent')).decode('utf-8')
+    
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+    
+    def response(self, *args, **kwargs):
+        obj = self._prepare_response_obj(args, kwargs)
+        indent = (self.compact is None and self._app.debug) or self.compact is False
+        return self._app.response_class(self.dumps_bytes(obj, indent) + b'\n', mimetype=self.mimetype)
+
+
+class BytesCache:
+    """Thread-safe LRU of response bodies, bounded by total size"""
+    
+    def __init__(self, max_bytes=64 * 1024 * 1024):
+        self.max_bytes = max_bytes
+        self.size = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+    
+    def get(self, key):
+        with self._lock:
+            value = self._entries.get(key)
+            if value is not None:
+                self._entries.move_to_end(key)
+            return value
+    
+    def put(self, key, value):
+        if len(value) > self.max_bytes:
+            return
+        
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self.size -= len(previous)
+            
+            self._entries[key] = value
+            self.size += len(value)
+            
+            while self.size > self.max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self.size -= len(evicted)
+    
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.size = 0
+
+
+# Serialized JSON bodies and compressed bodies, per process
+json_cache = BytesCache()
+compressed_cache = BytesCache()
+
+
+def json_bytes(obj):
+    """Compact JSON body (bytes) with the app's JSON provider"""
+    provider = current_app.json
+    if isinstance(provider, ORJSONProvider):
+        return provider.dumps_bytes(obj) + b'\n'
+    return (provider.dumps(obj, separators=(',', ':')) + '\n').encode('utf-8')
+
+
+def cached_json(key, build):
+    """
+    JSON response whose body is serialized once per key
+    
+    Args:
+        key: Hashable key that changes with the content (e.g. ETag)
+        build: Callable returning the payload (only called on a miss)
+    
+    Returns:
+        Response: 200 JSON response
+    """
+    key = (current_app.name, key)
+    body = json_cache.get(key)
+    if body is None:
+        body = json_bytes(build())
+        json_cache.put(key, body)
+    
+    return current_app.response_class(body, mimetype='application/json')
+
+
+def available_encodings():
+    """Content codings this process can produce, best first"""
+    return ['br', 'gzip'] if brotli is not None else ['gzip']
+
+
+def compress(body, encoding):
+    """Compress a response body"""
+    if encoding == 'br':
+        return brotli.compress(body, quality=BROTLI_QUALITY)
+    return gzip.compress(body, compresslevel=GZIP_LEVEL, mtime=0)
+
+
+def compress_response(response):
+    """after_request hook - compress text responses the client accepts compressed"""
+    if response.direct_passthrough or response.is_streamed:
+        return response  # send_file, Server-Sent Events
+    
+    if response.mimetype not in COMPRESSIBLE_MIMETYPES or 'Content-Encoding' in response.headers:
+        return response
+    
+    response.vary.add('Accept-Encoding')
+    
+    if response.status_code != 200:
+        return response
+    
+    encoding = request.accept_encodings.best_match(available_encodings())
+    if encoding is None:
+        return response
+    
+    body = response.get_data()
+    if len(body) < MIN_COMPRESS_SIZE:
+        return response
+    
+    # Versioned responses (strong ETag) are compressed once
+    etag, weak = response.get_etag()
+    key = (current_app.name, etag, encoding) if etag and not weak else None
+    compressed = compressed_cache.get(key) if key else None
+    if compressed is None:
+        compressed = compress(body, encoding)
+        if key:
+            compressed_cache.put(key, compressed)
+    
+    response.set_data(compressed)
+    response.headers['Content-Encoding'] = encoding
+    
+    # Same resource version, different bytes: the validator becomes weak
+    if etag:
+        response.set_etag(etag, weak=True)
+    
+    return response
+
+
+def init_app(app, compression=True):
+    """
+    Install the response layer on a Flask app
+    
+    Args:
+        app: Flask application
+        compression: Register the gzip / brotli after_request hook
+    """
+    if orjson is not None:
+        app.json = ORJSONProvider(app)
+    
+    if compression:
+        app.after_request(compress_response)
@@ -0,0 +1,109 @@
+"""
+Ablink SGCarmart Scraper - Leader Lock
+By Oneiros Indonesia
+
+Runs a background job (the daily scheduler) in exactly one process when
+the app is served by several gunicorn workers:
+- Every worker starts a standby thread waiting for an exclusive file lock
+- The worker holding the lock runs the job
+- The OS releases the lock when that worker exits, so a standby worker
+  takes over (worker restarts, crashes)
+
+Without fcntl (Windows) the lock is always granted - there the apps run
+on the single process dev server anyway.
+"""
+
+import os
+import threading
+
+from app_logging import get_logger
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+
+logger = get_logger(__name__)
+
+LOCK_FOLDER = 'data/locks'
+
+
+class LeaderLock:
+    """Exclusive lock on a file, held for the lifetime of the process"""
+    
+    def __init__(self, path):
+        self.path = path
+        self._file = None
+    
+    @property
+    def is_leader(self):
+        return self._file is not None
+    
+    def acquire(self, blocking=True):
+        """
+        Take the lock
+        
+        Args:
+            blocking: Wait until the current holder exits
+        
+        Returns:
+            bool: True if this process now holds the lock
+        """
+        if self._file is not None:
+            return True
+        
+        os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+        lock_file = open(self.path, 'a+')
+        
+        if fcntl is not None:
+            flags = fcntl.LOCK_EX if blocking else fcntl.LOCK_EX | fcntl.LOCK_NB
+            try:
+                fcntl.flock(lock_file.fileno(), flags)
+            except OSError:
+                lock_file.close()
+                return False
+        
+        # Holder's pid, for humans looking at the lock folder
+        lock_file.seek(0)
+        lock_file.truncate()
+        lock_file.write(str(os.getpid()))
+        lock_file.flush()
+        
+        self._file = lock_file
+        return True
+    
+    def release(self):
+        """Give the lock up (a standby process takes over)"""
+        if self._file is None:
+            return
+        
+        if fcntl is not None:
+            fcntl.flock(self._file.fileno(), fcntl.LOCK_UN)
+        self._file.close()
+        self._file = None
+
+
+def run_as_leader(name, target, lock_folder=LOCK_FOLDER):
+    """
+    Run target() in this process once it holds the named leader lock
+    
+    Args:
+        name: Job name (lock file name)
+        target: Long-running callable, e.g. the scheduler loop
+        lock_folder: Folder for lock files (shared by all workers)
+    
+    Returns:
+        LeaderLock: The lock (is_leader tells whether target is running here)
+    """
+    lock = LeaderLock(os.path.join(lock_folder, f"{name}.lock"))
+    
+    def standby():
+        if not lock.acquire(blocking=False):
+            logger.info("%s: standby in process %d", name, os.getpid())
+            lock.acquire(blocking=True)
+        logger.info("%s: running in process %d", name, os.getpid())
+        target()
+    
+    threading.Thread(target=standby, name=f"{name}-leader", daemon=True).start()
+    return lock
@@ -4,7 +4,7 @@ By Oneiros Indonesia
 
 Features:
 - REAL scraping from SGCarmart (valid data)
-- Auto scraping daily at 9:00 AM
+- Auto scraping on the config.json schedule (default daily 9:00 AM)
 - Manual scraping with button
 - History with left/right navigation (unlimited)
 - Upload pricelist & comparison
@@ -12,21 +12,38 @@ Features:
 - All in English
 """
 
-from flask import Flask, render_template, jsonify, send_file, request
+from flask import Flask, render_template, jsonify, send_file, request, Response, stream_with_context
 from datetime import datetime
-import pandas as pd
 import os
+import io
+import csv
 import json
-import threading
-import time
-import schedule
+from functools import lru_cache
 from werkzeug.utils import secure_filename
 
 # Import custom modules
-from sgcarmart_scraper import SGCarmartScraper
 from data_history_manager import DataHistoryManager
+from render_service import render_service
+from event_bus import event_bus, parse_last_event_id
+from http_cache import (HISTORICAL_CACHE_CONTROL, REVALIDATE_CACHE_CONTROL, conditional_json,
+                        file_version, make_etag, not_modified, stat_version, with_cache_headers)
+from snapshot_delta import diff_snapshot
+from sample_data import get_sample_data, is_sample_data, sample_snapshot
+from leader_lock import run_as_leader
+from scheduler import Scheduler
+from report_retention import enforce_retention
+from app_logging import current_context, get_logger, log_context, new_run_id
+import http_response
+import metrics
+import profiling
+from http_response import cached_json
+
+logger = get_logger(__name__)
 
 app = Flask(__name__)
+metrics.init_app(app)
+profiling.init_app(app)
+http_response.init_app(app)
 app.config['UPLOAD_FOLDER'] = 'uploads'
 app.config['MAX_CONTENT_LENGTH'] = 16 * 1024 * 1024  # 16MB max
 app.config['TEMPLATES_AUTO_RELOAD'] = True  # Force template reload
@@ -41,13 +58,15 @@ os.makedirs('data', exist_ok=True)
 os.makedirs('data/history', exist_ok=True)
 
 ALLOWED_EXTENSIONS = {'xlsx', 'xls', 'csv'}
+MAX_BATCH_DATES = 10  # Snapshots per /api/data/batch request
+PRICELIST_FILE = 'data/pricelist.json'
 
 # Global state
 scraping_status = {
     'is_scraping': False,
     'last_scrape': None,
     'last_status': 'Ready',
-    'next_scheduled': '09:00'
+    'next_scheduled': None
 }
 
 
@@ -57,7 +76,7 @@ def allowed_file(filename):
 
 def load_pricelist():
     """Load uploaded pricelist data"""
-    pricelist_file = 'data/pricelist.json'
+    pricelist_file = PRICELIST_FILE
     if os.path.exists(pricelist_file):
         with open(pricelist_file, 'r', encoding='utf-8') as f:
             return json.load(f)
@@ -66,13 +85,21 @@ def load_pricelist():
 
 def save_pricelist(data):
     """Save pricelist data"""
-    pricelist_file = 'data/pricelist.json'
+    pricelist_file = PRICELIST_FILE
     with open(pricelist_file, 'w', encoding='utf-8') as f:
         json.dump(data, f, indent=2, ensure_ascii=False)
 
 
+@metrics.run_timer()
+@profiling.profile_run('scrape')
 def perform_scraping():
-    """Execute scraping from SGCarmart"""
+    """Execute scraping from SGCarmart (logged under a run_id)"""
+    # Scheduled runs already carry the scheduler's run_id
+    with log_context(run_id=current_context().get('run_id') or new_run_id()):
+        return _perform_scraping()
+
+
+def _perform_scraping():
     global scraping_status
     
     if scraping_status['is_scraping']:
@@ -85,46 +112,47 @@ def perform_scraping():
     use_sample = False
     
     try:
-        print(f"\n[{datetime.now()}] Starting SGCarmart scraping...")
+        # In the try: the finally below always clears is_scraping
+        event_bus.publish('scrape.started', get_status())
+        logger.info("Starting SGCarmart scraping...")
         
-        # Try real scraping first
+        # Try real scraping first (Selenium is only imported here)
         try:
+            from sgcarmart_scraper import SGCarmartScraper
             scraper = SGCarmartScraper(headless=True)
             data = scraper.scrape_all_categories()
             
             # Check if we got real data or just sample data
-            if data and data.get('source') == 'sgcarmart_snapshot_2026_01':
+            if is_sample_data(data):
                 use_sample = True
-                print("[INFO] Using sample data (scraping returned cached data)")
+                logger.info("Using sample data (scraping returned cached data)")
             elif data and data.get('vehicles'):
-                print(f"[OK] Real scraping successful: {len(data.get('vehicles', []))} vehicles")
+                logger.info("Real scraping successful: %d vehicles", len(data.get('vehicles', [])))
             else:
                 use_sample = True
         except Exception as scrape_error:
-            print(f"[WARNING] Scraping error: {scrape_error}")
+            logger.warning("Scraping error: %s", scrape_error)
             use_sample = True
         
         # If scraping failed, use sample data directly
         if use_sample or not data or not data.get('vehicles'):
-            print("[INFO] Using SGCarmart sample data...")
+            logger.info("Using SGCarmart sample data...")
             try:
-                # Get sample data directly without creating scraper
-                from sgcarmart_scraper import SGCarmartScraper
-                scraper = SGCarmartScraper(headless=True)
-                data = scraper._get_sample_data()
+                # Own copy: source and diff values are updated below
+                data = get_sample_data()
                 if data:
                     data['source'] = 'sample_data'
-                    print(f"[OK] Sample data loaded: {len(data.get('vehicles', []))} vehicles")
+                    logger.info("Sample data loaded: %d vehicles", len(data.get('vehicles', [])))
             except Exception as sample_error:
-                print(f"[ERROR] Failed to load sample data: {sample_error}")
+                logger.error("Failed to load sample data: %s", sample_error)
                 # Last resort: return error
                 scraping_status['is_scraping'] = False
                 scraping_status['last_status'] = f'Error: {str(sample_error)}'
                 return {'success': False, 'error': f'Failed to load data: {str(sample_error)}'}
         
         if data and data.get('vehicles'):
-            # Get previous data for diff calculation
-            prev_data = history_manager.get_latest()
+            # Diff against the previous day's last run (not an earlier run today)
+            prev_data = history_manager.get_diff_base()
             if prev_data:
                 data = history_manager.calculate_diff(data, prev_data)
             
@@ -135,7 +163,7 @@ def perform_scraping():
             source_text = 'sample data' if use_sample else 'live scraping'
             scraping_status['last_status'] = f'Success - {len(data.get("vehicles", []))} vehicles ({source_text})'
             
-            print(f"[OK] Data loaded: {len(data.get('vehicles', []))} vehicles from {source_text}")
+            logger.info("Data loaded: %d vehicles from %s", len(data.get('vehicles', [])), source_text)
             
             return {
                 'success': True,
@@ -146,11 +174,9 @@ def perform_scraping():
             }
         else:
             # Last resort: try to get sample data one more time
-            print("[WARNING] Data is empty, trying sample data as last resort...")
+            logger.warning("Data is empty, trying sample data as last resort...")
             try:
-                from sgcarmart_scraper import SGCarmartScraper
-                scraper = SGCarmartScraper(headless=True)
-                sample_data = scraper._get_sample_data()
+                sample_data = sample_snapshot()
                 if sample_data and sample_data.get('vehicles'):
                     saved_date = history_manager.save_data(sample_data)
                     scraping_status['last_scrape'] = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
@@ -163,23 +189,19 @@ def perform_scraping():
                         'message': 'Data loaded from sample data'
                     }
             except Exception as final_error:
-                print(f"[ERROR] Final fallback failed: {final_error}")
+                logger.error("Final fallback failed: %s", final_error)
             
             scraping_status['last_status'] = 'Failed - No data available'
             return {'success': False, 'error': 'No data available'}
     
     except Exception as e:
         scraping_status['last_status'] = f'Error: {str(e)}'
-        print(f"[ERROR] Failed: {e}")
-        import traceback
-        traceback.print_exc()
+        logger.exception("Scraping failed: %s", e)
         
         # Try sample data as fallback even on exception
         try:
-            print("[INFO] Trying sample data after exception...")
-            from sgcarmart_scraper import SGCarmartScraper
-            scraper = SGCarmartScraper(headless=True)
-            sample_data = scraper._get_sample_data()
+            logger.info("Trying sample data after exception...")
+            sample_data = sample_snapshot()
             if sample_data and sample_data.get('vehicles'):
                 saved_date = history_manager.save_data(sample_data)
                 scraping_status['last_scrape'] = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
@@ -198,24 +220,62 @@ def perform_scraping():
     
     finally:
         scraping_status['is_scraping'] = False
+        succeeded = scraping_status['last_status'].startswith('Success')
+        event_bus.publish('scrape.completed' if succeeded else 'scrape.failed', get_status())
+
+
+def get_status():
+    """Current scraping status (API response and event payload)"""
+    return {
+        'is_scraping': scraping_status['is_scraping'],
+        'last_scrape': scraping_status['last_scrape'],
+        'last_status': scraping_status['last_status'],
+        'next_scheduled': scraping_status['next_scheduled'] or next_scheduled_run()
+    }
 
 
 def scheduled_scrape():
     """Scheduled scraping task"""
-    print(f"\n[SCHEDULER] Running scheduled scrape at {datetime.now()}")
-    perform_scraping()
+    logger.info("Running scheduled scrape")
+    event_bus.publish('schedule.triggered', {'job': 'daily_scrape'})
+    result = perform_scraping()
+    enforce_retention('daily_reports')
+    return result
+
+
+@lru_cache(maxsize=1)
+def get_scheduler():
+    """Daily scrape scheduler (schedule from config.json "automation")"""
+    scheduler = Scheduler('market_analysis')
+    scheduler.add_job('daily_scrape', scheduled_scrape)
+    return scheduler
+
+
+def next_scheduled_run():
+    """Next scheduled scrape as 'YYYY-MM-DD HH:MM' (None if automation is off)"""
+    scheduler = get_scheduler()
+    next_run = scheduler.next_run('daily_scrape') if scheduler.enabled else None
+    return next_run.strftime('%Y-%m-%d %H:%M') if next_run else None
 
 
 def run_scheduler():
-    """Run the scheduler in background"""
-    # Schedule daily at 9:00 AM
-    schedule.every().day.at("09:00").do(scheduled_scrape)
+    """Run the scheduler in background (catches up on a missed run first)"""
+    get_scheduler().run_forever()
+
+
+def start_scheduler():
+    """
+    Start the daily scheduler in exactly one process
     
-    print("[SCHEDULER] Started - Daily scraping scheduled at 09:00 AM")
+    Under gunicorn every worker calls this (post_fork hook); the leader
+    lock lets one of them run the scheduler while the others stand by.
+    Set SCHEDULER_ENABLED=0 to turn it off in this process.
+    """
+    if os.environ.get('SCHEDULER_ENABLED', '1') == '0':
+        logger.info("Scheduler disabled (SCHEDULER_ENABLED=0)")
+        return None
     
-    while True:
-        schedule.run_pending()
-        time.sleep(60)  # Check every minute
+    return run_as_leader('market_analysis_scheduler', run_scheduler)
 
 
 def compare_prices(pricelist, sgcarmart_data):
@@ -327,69 +387,261 @@ def api_scrape():
 @app.route('/api/status')
 def api_status():
     """Get scraping status"""
-    return jsonify({
-        'is_scraping': scraping_status['is_scraping'],
-        'last_scrape': scraping_status['last_scrape'],
-        'last_status': scraping_status['last_status'],
-        'next_scheduled': scraping_status['next_scheduled']
-    })
+    return jsonify(get_status())
+
+
+@app.route('/api/scheduler')
+def api_scheduler():
+    """Scheduled jobs, next run and recent runs from the run ledger"""
+    limit = min(request.args.get('limit', 20, type=int), 200)
+    return jsonify({'success': True, **get_scheduler().status(limit=limit)})
+
+
+@app.route('/api/events')
+def api_events():
+    """
+    Server-Sent Events stream (replaces status polling)
+    
+    Sends the current status first, then scrape / schedule / snapshot events
+    as they are published. Reconnecting browsers resume via Last-Event-ID.
+    """
+    last_event_id = parse_last_event_id(request.headers.get('Last-Event-ID'))
+    stream = event_bus.stream(last_event_id, initial_events=[('status', get_status())])
+    
+    return Response(
+        stream_with_context(stream),
+        mimetype='text/event-stream',
+        headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'}
+    )
 
 
 @app.route('/api/history')
 def api_history():
     """Get all available history dates"""
-    dates = history_manager.get_dates()
-    return jsonify({
-        'success': True,
-        'dates': dates,
-        'total': len(dates)
-    })
+    def build():
+        dates = history_manager.get_dates()
+        return {
+            'success': True,
+            'dates': dates,
+            'total': len(dates)
+        }
+    
+    return conditional_json(make_etag('history', history_manager.get_index_version()), build)
+
+
+def history_date(value):
+    """value if it is a YYYY-MM-DD date of the history, else None (request values end up in file paths)"""
+    try:
+        datetime.strptime(value or '', '%Y-%m-%d')
+    except ValueError:
+        return None
+    return value if value in history_manager.get_dates() else None
+
+
+def snapshot_last_modified(stat):
+    """Last-Modified of a snapshot response (data file or date list, newest)"""
+    try:
+        return max(stat.st_mtime, os.path.getmtime(history_manager.index_file))
+    except OSError:
+        return stat.st_mtime
+
+
+@lru_cache(maxsize=256)
+def snapshot_delta(date, version, base, base_version):
+    """Delta from the base snapshot to a date's snapshot (versions keep cached entries valid)"""
+    data = history_manager.get_data(date)
+    base_data = history_manager.get_data(base)
+    if not data or not base_data:
+        return None
+    return diff_snapshot(base_data, data)
+
+
+@app.route('/api/data/batch')
+def api_data_batch():
+    """
+    Get several snapshots in one request (history slider prefetch)
+    
+    GET /api/data/batch?dates=a,b,c&versions=va,vb,vc
+    
+    versions are the snapshot versions the client already has cached
+    (empty for none); those snapshots are returned as {'unchanged': true}
+    instead of being read and sent again.
+    """
+    requested = [date for date in request.args.get('dates', '').split(',') if date][:MAX_BATCH_DATES]
+    if not requested:
+        return jsonify({'success': False, 'error': 'No dates given'}), 400
+    
+    known = dict(zip(requested, request.args.get('versions', '').split(',')))
+    available = set(history_manager.get_dates())
+    
+    versions = {}
+    for date in requested:
+        stat = history_manager.get_data_stat(date) if date in available else None
+        if stat:
+            versions[date] = stat_version(stat)
+    
+    def build():
+        to_load = [date for date, version in versions.items() if known.get(date) != version]
+        loaded = history_manager.get_data_batch(to_load)
+        
+        snapshots = {}
+        for date, version in versions.items():
+            if date in loaded:
+                snapshots[date] = {'version': version, 'data': loaded[date]}
+            elif date not in to_load:
+                snapshots[date] = {'version': version, 'unchanged': True}
+        
+        return {
+            'success': True,
+            'snapshots': snapshots,
+            'missing': [date for date in requested if date not in snapshots]
+        }
+    
+    etag = make_etag('batch', *requested, *(versions.get(date) for date in requested),
+                     *(known.get(date) for date in requested))
+    return conditional_json(etag, build)
 
 
 @app.route('/api/data/<date>')
 def api_data_by_date(date):
-    """Get data for specific date"""
-    data = history_manager.get_data(date)
+    """
+    Get data for specific date (conditional: ETag from the snapshot version)
+    
+    With ?base=<other date>&base_version=<its version> only the changes against
+    that snapshot are returned ('delta' instead of 'data'); the history slider
+    applies them to the copy it already has. If the client copy is outdated
+    the full data is returned.
+    """
+    stat = history_manager.get_data_stat(date)
+    
+    if stat:
+        previous_date = history_manager.get_previous_date(date)
+        next_date = history_manager.get_next_date(date)
+        
+        base = history_date(request.args.get('base'))
+        base_stat = history_manager.get_data_stat(base) if base and base != date else None
+        base_version = stat_version(base_stat) if base_stat else None
+        if base_version != request.args.get('base_version'):
+            base_stat = base_version = None
+        
+        etag = make_etag('data', date, stat_version(stat), previous_date, next_date, base_version and base, base_version)
+        last_modified = snapshot_last_modified(stat)
+        
+        # Past dates with newer data after them are immutable
+        if next_date and date < datetime.now().strftime('%Y-%m-%d'):
+            cache_control = HISTORICAL_CACHE_CONTROL
+        else:
+            cache_control = REVALIDATE_CACHE_CONTROL
+        
+        response = not_modified(etag, last_modified)
+        if response:
+            return with_cache_headers(response, etag, cache_control, last_modified)
+        
+        def build():
+            payload = {
+                'success': True,
+                'date': date,
+                'version': stat_version(stat),
+                'previous_date': previous_date,
+                'next_date': next_date
+            }
+            
+            delta = snapshot_delta(date, stat_version(stat), base, base_version) if base_stat else None
+            if delta is not None:
+                payload['base'] = base
+                payload['delta'] = delta
+            else:
+                payload['data'] = history_manager.get_data(date)
+            
+            if payload.get('data') or 'delta' in payload:
+                return payload
+            return {'success': False, 'error': 'No data for this date'}
+        
+        # Serialized once per ETag (snapshot version + neighbours + base)
+        return with_cache_headers(cached_json(('etag', etag), build), etag, cache_control, last_modified)
+    
+    return jsonify({'success': False, 'error': 'No data for this date'})
+
+
+@app.route('/api/data/<date>/runs')
+def api_runs_by_date(date):
+    """All runs (intra-day snapshots) of a date"""
+    def build():
+        run_ids = history_manager.get_runs(date)
+        return {
+            'success': bool(run_ids),
+            'date': date,
+            'runs': run_ids,
+            'previous_run': history_manager.get_last_run_before(date),
+            'timings': history_manager.get_run_timings(date)
+        }
+    
+    return conditional_json(make_etag('runs', date, history_manager.get_index_version()), build)
+
+
+@app.route('/api/data/<date>/runs/<run_id>')
+def api_run(date, run_id):
+    """Data of one run (run files are never rewritten)"""
+    if run_id not in history_manager.get_runs(date):
+        return jsonify({'success': False, 'error': 'No such run'}), 404
     
-    if data:
-        return jsonify({
+    def build():
+        return {
             'success': True,
-            'data': data,
             'date': date,
-            'previous_date': history_manager.get_previous_date(date),
-            'next_date': history_manager.get_next_date(date)
-        })
+            'run_id': run_id,
+            'previous_run': history_manager.get_previous_run(date, run_id),
+            'timings': history_manager.get_run_timings(date, run_id),
+            'data': history_manager.get_run(date, run_id)
+        }
     
-    return jsonify({'success': False, 'error': 'No data for this date'})
+    return conditional_json(make_etag('run', date, run_id), build, cache_control=HISTORICAL_CACHE_CONTROL)
 
 
 @app.route('/api/data/latest')
 def api_data_latest():
     """Get latest data - always return data, fallback to sample if needed"""
     try:
-        data = history_manager.get_latest()
+        latest_date = history_manager.get_latest_date()
+        stat = history_manager.get_data_stat(latest_date) if latest_date else None
         
-        # Check if data is valid
-        if data and data.get('vehicles') and len(data.get('vehicles', [])) > 0:
+        if stat:
             dates = history_manager.get_dates()
             current_date = dates[0] if dates else None
+            previous_date = history_manager.get_previous_date(current_date) if current_date else None
+            etag = make_etag('latest', latest_date, stat_version(stat), current_date, previous_date)
+            last_modified = snapshot_last_modified(stat)
             
-            return jsonify({
-                'success': True,
-                'data': data,
-                'date': current_date,
-                'previous_date': history_manager.get_previous_date(current_date) if current_date else None,
-                'next_date': None
-            })
+            response = not_modified(etag, last_modified)
+            if response:
+                return with_cache_headers(response, etag, last_modified=last_modified)
+            
+            def build():
+                data = history_manager.get_data(latest_date)
+                
+                # Check if data is valid (invalid data falls back to sample data)
+                if not data or not data.get('vehicles'):
+                    raise ValueError(f"Snapshot {latest_date} has no vehicles")
+                
+                return {
+                    'success': True,
+                    'data': data,
+                    'date': current_date,
+                    'version': stat_version(stat) if current_date == latest_date else None,
+                    'previous_date': previous_date,
+                    'next_date': None
+                }
+            
+            # Loaded and serialized once per snapshot version
+            response = cached_json(('etag', etag), build)
+            return with_cache_headers(response, etag, last_modified=last_modified)
     except Exception as e:
-        print(f"[WARNING] Error getting latest data: {e}")
+        logger.warning("Error getting latest data: %s", e)
     
     # No history or invalid data, return sample data
-    print("[INFO] Loading sample data for /api/data/latest")
+    logger.info("Loading sample data for /api/data/latest")
     try:
-        from sgcarmart_scraper import SGCarmartScraper
-        scraper = SGCarmartScraper()
-        sample_data = scraper._get_sample_data()
+        sample_data = sample_snapshot()
         
         if sample_data and sample_data.get('vehicles'):
             return jsonify({
@@ -401,7 +653,7 @@ def api_data_latest():
                 'is_sample': True
             })
     except Exception as e:
-        print(f"[ERROR] Failed to load sample data: {e}")
+        logger.error("Failed to load sample data: %s", e)
     
     # Last resort: return error
     return jsonify({
@@ -427,6 +679,8 @@ def upload_pricelist():
         file.save(filepath)
         
         try:
+            import pandas as pd
+            
             # Read file
             if filename.endswith('.csv'):
                 df = pd.read_csv(filepath)
@@ -493,7 +747,7 @@ def upload_pricelist():
                 'message': f'Uploaded {len(vehicles)} vehicles',
                 'count': len(vehicles)
             })
-            
+        
         except Exception as e:
             return jsonify({'success': False, 'error': str(e)})
     
@@ -503,7 +757,7 @@ def upload_pricelist():
 @app.route('/api/clear-pricelist', methods=['POST'])
 def clear_pricelist():
     """Clear pricelist data"""
-    pricelist_file = 'data/pricelist.json'
+    pricelist_file = PRICELIST_FILE
     if os.path.exists(pricelist_file):
         os.remove(pricelist_file)
     return jsonify({'success': True, 'message': 'Pricelist cleared'})
@@ -512,31 +766,40 @@ def clear_pricelist():
 @app.route('/api/pricelist')
 def get_pricelist():
     """Get current pricelist"""
-    pricelist = load_pricelist()
-    if pricelist:
-        return jsonify({'success': True, 'data': pricelist})
-    return jsonify({'success': False, 'message': 'No pricelist uploaded'})
+    def build():
+        pricelist = load_pricelist()
+        if pricelist:
+            return {'success': True, 'data': pricelist}
+        return {'success': False, 'message': 'No pricelist uploaded'}
+    
+    return conditional_json(make_etag('pricelist', file_version(PRICELIST_FILE)), build)
 
 
 @app.route('/api/comparison')
 def get_comparison():
     """Get price comparison"""
-    pricelist = load_pricelist()
-    sgcarmart = history_manager.get_latest()
-    
-    if not sgcarmart:
-        from sgcarmart_scraper import SGCarmartScraper
-        scraper = SGCarmartScraper()
-        sgcarmart = scraper._get_sample_data()
+    def build(sgcarmart=None):
+        pricelist = load_pricelist()
+        if not sgcarmart:
+            sgcarmart = sample_snapshot()
+        
+        comparison = compare_prices(pricelist, sgcarmart)
+        
+        return {
+            'success': True,
+            'data': comparison,
+            'pricelist_count': len(pricelist.get('vehicles', [])) if pricelist else 0,
+            'sgcarmart_count': len(sgcarmart.get('vehicles', [])) if sgcarmart else 0
+        }
     
-    comparison = compare_prices(pricelist, sgcarmart)
+    # Depends on the pricelist and the latest snapshot
+    latest_date = history_manager.get_latest_date()
+    stat = history_manager.get_data_stat(latest_date) if latest_date else None
+    if stat is None:
+        return jsonify(build())
     
-    return jsonify({
-        'success': True,
-        'data': comparison,
-        'pricelist_count': len(pricelist.get('vehicles', [])) if pricelist else 0,
-        'sgcarmart_count': len(sgcarmart.get('vehicles', [])) if sgcarmart else 0
-    })
+    etag = make_etag('comparison', file_version(PRICELIST_FILE), latest_date, stat_version(stat))
+    return conditional_json(etag, lambda: build(history_manager.get_data(latest_date)))
 
 
 @app.route('/api/export/<date>/<format>')
@@ -548,9 +811,7 @@ def export_data(date, format):
         # Use latest or sample
         data = history_manager.get_latest()
         if not data:
-            from sgcarmart_scraper import SGCarmartScraper
-            scraper = SGCarmartScraper()
-            data = scraper._get_sample_data()
+            data = sample_snapshot()
     
     if not data:
         return jsonify({'error': 'No data available'}), 404
@@ -570,58 +831,165 @@ def export_data(date, format):
         row['Diff'] = v.get('diff', 0)
         rows.append(row)
     
+    import pandas as pd
     df = pd.DataFrame(rows)
     
     if format == 'csv':
         filename = f'market_analysis_{date}_{timestamp}.csv'
         filepath = f'daily_reports/{filename}'
         df.to_csv(filepath, index=False, encoding='utf-8-sig')
-        return send_file(filepath, as_attachment=True, download_name=filename)
+        response = send_file(filepath, as_attachment=True, download_name=filename)
+        # Old exports are dropped once this one is sent
+        response.call_on_close(lambda: enforce_retention('daily_reports'))
+        return response
     
     elif format == 'excel':
         filename = f'market_analysis_{date}_{timestamp}.xlsx'
         filepath = f'daily_reports/{filename}'
         df.to_excel(filepath, index=False)
-        return send_file(filepath, as_attachment=True, download_name=filename)
+        response = send_file(filepath, as_attachment=True, download_name=filename)
+        response.call_on_close(lambda: enforce_retention('daily_reports'))
+        return response
     
     elif format == 'pdf':
-        # Generate HTML for PDF
-        from market_analysis_generator import MarketAnalysisGenerator
-        generator = MarketAnalysisGenerator()
-        html_file = generator.generate_report(data)
+        # Real PDF when an engine is installed (cached per snapshot, rendered once
+        # for concurrent requests), otherwise the printable HTML report
+        pdf_file = render_service.render_pdf('market_analysis', data)
+        if pdf_file:
+            return send_file(pdf_file, mimetype='application/pdf', as_attachment=True,
+                             download_name=f'market_analysis_{date}.pdf')
+        
+        html_file = render_service.render('market_analysis', data)
         return send_file(html_file, as_attachment=False)
     
     return jsonify({'error': 'Invalid format'}), 400
 
 
+RANGE_EXPORT_COLUMNS = ['Date', 'Category', 'Vehicle', 'Year', 'Lowest', 'Average', 'Units']
+
+
+def iter_long_format_rows(date, data):
+    """Flatten one snapshot into long-format rows (one row per vehicle and year)"""
+    for v in data.get('vehicles', []):
+        for year, year_data in sorted(v.get('years', {}).items(), reverse=True):
+            yield [
+                date,
+                v.get('category', ''),
+                v.get('vehicle', ''),
+                year,
+                year_data.get('lowest', 0),
+                year_data.get('average', 0),
+                year_data.get('units', 0)
+            ]
+
+
+def _parse_range_date(value):
+    """Validate a YYYY-MM-DD query parameter, returns None when empty"""
+    if not value:
+        return None
+    return datetime.strptime(value, '%Y-%m-%d').strftime('%Y-%m-%d')
+
+
+@app.route('/api/export/range')
+def export_range():
+    """
+    Export all history between two dates as one long-format file
+    
+    GET /api/export/range?from=YYYY-MM-DD&to=YYYY-MM-DD&format=csv|excel
+    
+    History is scanned once, oldest date first. CSV output is streamed
+    to the client date by date; Excel is built in memory.
+    """
+    try:
+        start_date = _parse_range_date(request.args.get('from'))
+        end_date = _parse_range_date(request.args.get('to'))
+    except ValueError:
+        return jsonify({'error': 'Invalid date, expected YYYY-MM-DD'}), 400
+    
+    if start_date and end_date and start_date > end_date:
+        return jsonify({'error': "'from' must not be after 'to'"}), 400
+    
+    format = request.args.get('format', 'csv')
+    if format not in ('csv', 'excel'):
+        return jsonify({'error': 'Invalid format'}), 400
+    
+    if not history_manager.get_dates_in_range(start_date, end_date):
+        return jsonify({'error': 'No data available for this range'}), 404
+    
+    label = f"{start_date or 'start'}_{end_date or 'latest'}"
+    
+    if format == 'csv':
+        def generate():
+            buffer = io.StringIO()
+            writer = csv.writer(buffer)
+            buffer.write('\ufeff')
+            writer.writerow(RANGE_EXPORT_COLUMNS)
+            for date, data in history_manager.iter_range(start_date, end_date):
+                writer.writerows(iter_long_format_rows(date, data))
+                yield buffer.getvalue()
+                buffer.seek(0)
+                buffer.truncate(0)
+            if buffer.tell():
+                yield buffer.getvalue()
+        
+        filename = f'market_analysis_range_{label}.csv'
+        return Response(
+            stream_with_context(generate()),
+            mimetype='text/csv',
+            headers={'Content-Disposition': f'attachment; filename={filename}'}
+        )
+    
+    rows = []
+    for date, data in history_manager.iter_range(start_date, end_date):
+        rows.extend(iter_long_format_rows(date, data))
+    
+    import pandas as pd
+    output = io.BytesIO()
+    pd.DataFrame(rows, columns=RANGE_EXPORT_COLUMNS).to_excel(output, index=False)
+    output.seek(0)
+    
+    return send_file(
+        output,
+        mimetype='application/vnd.openxmlformats-officedocument.spreadsheetml.sheet',
+        as_attachment=True,
+        download_name=f'market_analysis_range_{label}.xlsx'
+    )
+
+
 def initialize_data():
     """Initialize with sample data if no history exists"""
-    print("[INIT] Checking for existing data...")
+    logger.info("Checking for existing data...")
     
     try:
         existing_data = history_manager.get_latest()
         if existing_data and existing_data.get('vehicles'):
-            print(f"[INIT] Found existing data with {len(existing_data.get('vehicles', []))} vehicles")
+            logger.info("Found existing data with %d vehicles", len(existing_data.get('vehicles', [])))
             return
     except Exception as e:
-        print(f"[INIT] Error checking existing data: {e}")
+        logger.warning("Error checking existing data: %s", e)
     
-    print("[INIT] No data found, loading sample data...")
+    logger.info("No data found, loading sample data...")
     try:
-        from sgcarmart_scraper import SGCarmartScraper
-        scraper = SGCarmartScraper(headless=True)
-        sample_data = scraper._get_sample_data()
+        sample_data = sample_snapshot()
         
         if sample_data and sample_data.get('vehicles'):
             saved_date = history_manager.save_data(sample_data)
-            print(f"[INIT] Sample data loaded: {len(sample_data.get('vehicles', []))} vehicles")
-            print(f"[INIT] Saved to: {saved_date}")
+            logger.info("Sample data loaded: %d vehicles, saved to %s", len(sample_data.get('vehicles', [])), saved_date)
         else:
-            print("[INIT] ERROR: Sample data is empty!")
+            logger.error("Sample data is empty!")
     except Exception as e:
-        print(f"[INIT] ERROR loading sample data: {e}")
-        import traceback
-        traceback.print_exc()
+        logger.exception("Error loading sample data: %s", e)
+
+
+def create_app():
+    """
+    Application factory for WSGI servers (see wsgi.py)
+    
+    Prepares the data folder; the scheduler is started separately per
+    worker (start_scheduler), after gunicorn has forked.
+    """
+    initialize_data()
+    return app
 
 
 if __name__ == '__main__':
@@ -631,22 +999,21 @@ if __name__ == '__main__':
     print("="*70)
     print("\nFeatures:")
     print("  - Real-time data from SGCarmart")
-    print("  - Auto refresh daily at 9:00 AM")
+    print("  - Auto refresh on the config.json schedule")
     print("  - Manual refresh with button")
     print("  - History with left/right navigation")
     print("  - Upload pricelist & comparison")
     print("  - Export to Excel, PDF, CSV")
     
     # Initialize data first
-    initialize_data()
+    create_app()
     
     print("\nStarting scheduler...")
     
     # Start scheduler in background thread
-    scheduler_thread = threading.Thread(target=run_scheduler, daemon=True)
-    scheduler_thread.start()
+    start_scheduler()
     
-    print("[OK] Scheduler started - Auto refresh at 09:00 daily")
+    print(f"[OK] Scheduler started - next auto refresh: {next_scheduled_run() or 'disabled'}")
     print("\nStarting server...")
     
     port = int(os.environ.get('PORT', 5555))
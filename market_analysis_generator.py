@@ -8,9 +8,11 @@ Generates HTML reports with:
 - Price comparison
 """
 
-import pandas as pd
 from datetime import datetime
-import os
+
+from markupsafe import Markup
+
+from report_renderer import Section, Table, td, td_safe, th, render_report, write_report
 
 
 class MarketAnalysisGenerator:
@@ -31,342 +33,92 @@ class MarketAnalysisGenerator:
             timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
             output_file = f"daily_reports/market_analysis_{timestamp}.html"
         
-        current_date = datetime.now().strftime("%d %b").upper()
-        
         # Get all years
         all_years = set()
         for vehicle in data.get('vehicles', []):
             all_years.update(vehicle.get('years', {}).keys())
         years = sorted(all_years, reverse=True)[:12]  # Max 12 years
         
-        html = f"""<!DOCTYPE html>
-<html>
-<head>
-    <meta charset="UTF-8">
-    <title>Market Analysis Report - {current_date}</title>
-    <style>
-        @page {{
-            size: A4 landscape;
-            margin: 5mm;
-        }}
-        
-        * {{
-            box-sizing: border-box;
-        }}
-        
-        body {{
-            font-family: 'Segoe UI', Tahoma, Geneva, Verdana, sans-serif;
-            margin: 0;
-            padding: 15px;
-            background: #fafafa;
-            font-size: 10px;
-        }}
-        
-        .header {{
-            text-align: center;
-            font-size: 20px;
-            font-weight: 700;
-            letter-spacing: 3px;
-            margin-bottom: 15px;
-            padding: 15px;
-            background: linear-gradient(135deg, #4a7c59 0%, #6b9b7a 100%);
-            color: white;
-            border-radius: 8px;
-        }}
-        
-        .section-title {{
-            text-align: center;
-            font-size: 16px;
-            font-weight: 700;
-            letter-spacing: 2px;
-            margin: 20px 0 10px 0;
-            padding: 10px;
-            background: #4a7c59;
-            color: white;
-            border-radius: 5px;
-        }}
-        
-        table {{
-            width: 100%;
-            border-collapse: collapse;
-            font-size: 9px;
-            margin-bottom: 20px;
-            background: white;
-            box-shadow: 0 2px 4px rgba(0,0,0,0.1);
-        }}
-        
-        th {{
-            background: #4a7c59;
-            color: white;
-            border: 1px solid #3d6b4a;
-            padding: 6px 3px;
-            text-align: center;
-            font-weight: 700;
-            font-size: 8px;
-        }}
-        
-        th.year-header {{
-            background: #5a8c69;
-        }}
-        
-        th.sub-header {{
-            background: #6b9b7a;
-            font-size: 7px;
-        }}
-        
-        td {{
-            border: 1px solid #ddd;
-            padding: 4px 3px;
-            text-align: center;
-            font-size: 9px;
-        }}
-        
-        td:first-child {{
-            text-align: left;
-            padding-left: 6px;
-            font-weight: 600;
-            color: #333;
-        }}
+        vehicles = data.get('vehicles', [])
         
-        .category-row {{
-            font-weight: 700;
-            font-size: 9px;
-            text-align: left !important;
-            padding: 6px !important;
-            color: #333;
-            border-top: 2px solid #4a7c59;
-        }}
+        html = render_report(
+            'market_analysis',
+            depreciation_table=self._build_depreciation_table(vehicles, years),
+            units_table=self._build_units_table(vehicles, years),
+            current_date=datetime.now().strftime("%d %b").upper(),
+            generated=datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        )
         
-        .lowest {{
-            color: #2e7d32;
-            font-weight: 700;
-        }}
-        
-        .average {{
-            color: #1565c0;
-            font-weight: 600;
-        }}
-        
-        .units {{
-            color: #666;
-        }}
-        
-        .total-col {{
-            background: #fff8e1;
-            font-weight: 700;
-            color: #e65100;
-        }}
-        
-        .diff-pos {{
-            background: #e8f5e9;
-            color: #2e7d32;
-            font-weight: 700;
-        }}
-        
-        .diff-neg {{
-            background: #ffebee;
-            color: #c62828;
-            font-weight: 700;
-        }}
-        
-        .empty {{
-            color: #bbb;
-        }}
-        
-        .footer {{
-            margin-top: 20px;
-            text-align: center;
-            font-size: 10px;
-            color: #666;
-            padding: 10px;
-            background: #f5f5f5;
-            border-radius: 5px;
-        }}
-        
-        .print-btn {{
-            background: #4a7c59;
-            color: white;
-            border: none;
-            padding: 12px 30px;
-            font-size: 14px;
-            cursor: pointer;
-            border-radius: 25px;
-            margin: 15px auto;
-            display: block;
-        }}
-        
-        .print-btn:hover {{
-            background: #3d6b4a;
-        }}
-        
-        @media print {{
-            .print-btn {{ display: none; }}
-            body {{ padding: 0; background: white; }}
-            .section-title, th, .category-row, .total-col, .diff-pos, .diff-neg {{
-                -webkit-print-color-adjust: exact;
-                print-color-adjust: exact;
-            }}
-        }}
-    </style>
-</head>
-<body>
-    <button class="print-btn" onclick="window.print()">Print / Save as PDF</button>
+        return write_report(html, output_file)
     
-    <div class="header">
-        DATE: {current_date} &nbsp;&nbsp;&nbsp; D E P R E C I A T I O N &nbsp; / &nbsp; U N I T S
-    </div>
+    def _sections(self, vehicles, build_row):
+        """Group vehicle rows under category headers (in data order)"""
+        sections = []
+        for vehicle in vehicles:
+            category = vehicle.get('category', '')
+            if not sections or sections[-1].title != category:
+                sections.append(Section(category, [], self.CATEGORY_COLORS.get(category, '#f5f5f5')))
+            sections[-1].rows.append(build_row(vehicle))
+        return sections
     
-    <!-- DEPRECIATION TABLE -->
-    <table>
-        <thead>
-            <tr>
-                <th rowspan="2" style="width: 120px;">Vehicle</th>
-"""
+    def _build_depreciation_table(self, vehicles, years):
+        """Lowest + Average depreciation per year"""
+        header = [th('Vehicle', rowspan=2, style='width: 120px;')]
+        header += [th(year, 'year-header', colspan=2) for year in years]
+        header += [th(Markup('TOTAL<br>UNITS'), rowspan=2), th(Markup('Previous<br>(Date)'), rowspan=2), th('DIFF', rowspan=2)]
         
-        # Year headers with Lowest + Average
-        for year in years:
-            html += f'                <th colspan="2" class="year-header">{year}</th>\n'
+        sub_header = [th('Lowest', 'sub-header') + th('Average', 'sub-header') for _ in years]
         
-        html += """                <th rowspan="2">TOTAL<br>UNITS</th>
-                <th rowspan="2">Previous<br>(Date)</th>
-                <th rowspan="2">DIFF</th>
-            </tr>
-            <tr>
-"""
+        empty = td_safe('-', 'empty')
         
-        # Sub-headers (Lowest | Average)
-        for year in years:
-            html += '                <th class="sub-header">Lowest</th>\n'
-            html += '                <th class="sub-header">Average</th>\n'
-        
-        html += """            </tr>
-        </thead>
-        <tbody>
-"""
-        
-        # Data rows
-        current_category = None
-        for vehicle in data.get('vehicles', []):
-            category = vehicle.get('category', '')
-            
-            # Category header
-            if category != current_category:
-                current_category = category
-                bg_color = self.CATEGORY_COLORS.get(category, '#f5f5f5')
-                colspan = 3 + (len(years) * 2)
-                html += f'            <tr><td colspan="{colspan}" class="category-row" style="background: {bg_color};">{category}</td></tr>\n'
-            
-            # Vehicle row
-            html += f'            <tr>\n'
-            html += f'                <td>{vehicle["vehicle"]}</td>\n'
+        def build_row(vehicle):
+            cells = [td(vehicle['vehicle'])]
             
-            # Year data
             for year in years:
                 year_data = vehicle.get('years', {}).get(year, {})
                 lowest = year_data.get('lowest', 0)
                 average = year_data.get('average', 0)
-                
-                if lowest > 0:
-                    html += f'                <td class="lowest">${lowest:,}</td>\n'
-                else:
-                    html += '                <td class="empty">-</td>\n'
-                
-                if average > 0:
-                    html += f'                <td class="average">${average:,}</td>\n'
-                else:
-                    html += '                <td class="empty">-</td>\n'
+                cells.append(td_safe(f'${lowest:,}', 'lowest') if lowest > 0 else empty)
+                cells.append(td_safe(f'${average:,}', 'average') if average > 0 else empty)
             
-            # Totals
-            total_units = vehicle.get('total_units', 0)
-            previous = vehicle.get('previous', 0)
             diff = vehicle.get('diff', 0)
-            
-            html += f'                <td class="total-col">{total_units}</td>\n'
-            html += f'                <td>{previous}</td>\n'
-            
             if diff > 0:
-                html += f'                <td class="diff-pos">+{diff}</td>\n'
+                diff_cell = td_safe(f'+{diff}', 'diff-pos')
             elif diff < 0:
-                html += f'                <td class="diff-neg">{diff}</td>\n'
+                diff_cell = td_safe(diff, 'diff-neg')
             else:
-                html += f'                <td>{diff}</td>\n'
+                diff_cell = td_safe(diff)
             
-            html += '            </tr>\n'
-        
-        html += """        </tbody>
-    </table>
+            cells += [
+                td_safe(vehicle.get('total_units', 0), 'total-col'),
+                td_safe(vehicle.get('previous', 0)),
+                diff_cell
+            ]
+            return ''.join(cells)
+        
+        sections = self._sections(vehicles, build_row)
+        return Table([header, sub_header], sections, 1 + 2 * len(years) + 3, 'category-row')
     
-    <!-- UNITS SOLD TABLE -->
-    <div class="section-title">
-        NUMBER OF UNITS SOLD LAST 60 DAYS
-    </div>
-    
-    <table>
-        <thead>
-            <tr>
-                <th style="width: 120px;">Vehicle</th>
-"""
+    def _build_units_table(self, vehicles, years):
+        """Units per year"""
+        header = [th('Vehicle', style='width: 120px;')]
+        header += [th(year) for year in years]
+        header += [th(Markup('TOTAL<br>UNITS')), th(Markup('Last 120<br>Days'))]
         
-        # Year headers for units
-        for year in years:
-            html += f'                <th>{year}</th>\n'
+        empty = td_safe('0', 'empty')
         
-        html += """                <th>TOTAL<br>UNITS</th>
-                <th>Last 120<br>Days</th>
-            </tr>
-        </thead>
-        <tbody>
-"""
-        
-        # Units data rows
-        current_category = None
-        for vehicle in data.get('vehicles', []):
-            category = vehicle.get('category', '')
+        def build_row(vehicle):
+            cells = [td(vehicle['vehicle'])]
             
-            # Category header
-            if category != current_category:
-                current_category = category
-                bg_color = self.CATEGORY_COLORS.get(category, '#f5f5f5')
-                colspan = 3 + len(years)
-                html += f'            <tr><td colspan="{colspan}" class="category-row" style="background: {bg_color};">{category}</td></tr>\n'
-            
-            # Vehicle row
-            html += f'            <tr>\n'
-            html += f'                <td>{vehicle["vehicle"]}</td>\n'
-            
-            # Year units
             for year in years:
-                year_data = vehicle.get('years', {}).get(year, {})
-                units = year_data.get('units', 0)
-                
-                if units > 0:
-                    html += f'                <td class="units">{units}</td>\n'
-                else:
-                    html += '                <td class="empty">0</td>\n'
+                units = vehicle.get('years', {}).get(year, {}).get('units', 0)
+                cells.append(td_safe(units, 'units') if units > 0 else empty)
             
-            # Totals
-            total_units = vehicle.get('total_units', 0)
-            previous = vehicle.get('previous', 0)
-            
-            html += f'                <td class="total-col">{total_units}</td>\n'
-            html += f'                <td>{previous}</td>\n'
-            html += '            </tr>\n'
-        
-        html += """        </tbody>
-    </table>
-    
-    <div class="footer">
-        <strong>Ablink SGCarmart Scraper</strong> | Developed by <strong>Oneiros Indonesia</strong><br>
-        Market Analysis Report - Generated on """ + datetime.now().strftime("%Y-%m-%d %H:%M:%S") + """
-    </div>
-    
-    <button class="print-btn" onclick="window.print()">Print / Save as PDF</button>
-</body>
-</html>"""
-        
-        # Save file
-        os.makedirs(os.path.dirname(output_file), exist_ok=True)
-        with open(output_file, 'w', encoding='utf-8') as f:
-            f.write(html)
-        
-        return output_file
+            cells += [
+                td_safe(vehicle.get('total_units', 0), 'total-col'),
+                td_safe(vehicle.get('previous', 0))
+            ]
+            return ''.join(cells)
+        
+        sections = self._sections(vehicles, build_row)
+        return Table([header], sections, 1 + len(years) + 2, 'category-row')
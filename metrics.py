@@ -0,0 +1,285 @@
+"""
+Ablink SGCarmart Scraper - Metrics
+By Oneiros Indonesia
+
+Lightweight instrumentation (no dependencies):
+- Stage timers and error counters around the scrape pipeline
+  (driver_start, page_fetch, parse, aggregate, diff, history_save,
+  report_render)
+- Request latency histograms per Flask route
+- /metrics endpoint in the Prometheus text format
+- Per-run timing summary: stages timed inside run_timer() are collected
+  and stored with the run in the history index
+
+Usage:
+    with timed('parse'):
+        ...
+    
+    @timed('aggregate')
+    def _aggregate_data(self, vehicles): ...
+    
+    with run_timer() as run:      # one scrape
+        ...
+    run.summary()                 # {'total_seconds': .., 'stages': {..}}
+    
+    init_app(app)                 # route latency + /metrics
+
+Metrics live in the process: under gunicorn every worker has its own
+(a scrape shows up in the worker that ran it).
+"""
+
+import contextvars
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime
+
+
+# Latency buckets (seconds): fast API responses up to slow scrapes
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300)
+
+PROMETHEUS_CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+
+def _escape(value):
+    return str(value).replace('\\', '\\\\').replace('\n', '\\n').replace('"', '\\"')
+
+
+def _format_labels(names, values, extra=None):
+    pairs = list(zip(names, values)) + (extra or [])
+    if not pairs:
+        return ''
+    return '{' + ','.join(f'{name}="{_escape(value)}"' for name, value in pairs) + '}'
+
+
+class Counter:
+    """Monotonic counter with labels"""
+    
+    kind = 'counter'
+    
+    def __init__(self, name, help_text, labels=()):
+        self.name = name
+        self.help = help_text
+        self.labels = tuple(labels)
+        self._values = {}
+        self._lock = threading.Lock()
+    
+    def inc(self, amount=1, **labels):
+        key = tuple(labels.get(name, '') for name in self.labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+    
+    def samples(self):
+        with self._lock:
+            values = dict(self._values)
+        for key, value in sorted(values.items()):
+            yield f"{self.name}{_format_labels(self.labels, key)} {value}"
+
+
+class Histogram:
+    """Histogram with cumulative buckets, sum and count per label set"""
+    
+    kind = 'histogram'
+    
+    def __init__(self, name, help_text, labels=(), buckets=DEFAULT_BUCKETS):
+        self.name = name
+        self.help = help_text
+        self.labels = tuple(labels)
+        self.buckets = tuple(sorted(buckets))
+        self._values = {}
+        self._lock = threading.Lock()
+    
+    def observe(self, value, **labels):
+        key = tuple(labels.get(name, '') for name in self.labels)
+        with self._lock:
+            state = self._values.get(key)
+            if state is None:
+                state = self._values[key] = [[0] * len(self.buckets), 0.0, 0]
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    state[0][i] += 1
+            state[1] += value
+            state[2] += 1
+    
+    def samples(self):
+        with self._lock:
+            values = {key: (list(state[0]), state[1], state[2]) for key, state in self._values.items()}
+        for key, (counts, total, count) in sorted(values.items()):
+            for bound, bucket_count in zip(self.buckets, counts):
+                yield f"{self.name}_bucket{_format_labels(self.labels, key, [('le', f'{bound:g}')])} {bucket_count}"
+            yield f"{self.name}_bucket{_format_labels(self.labels, key, [('le', '+Inf')])} {count}"
+            yield f"{self.name}_sum{_format_labels(self.labels, key)} {total:.6f}"
+            yield f"{self.name}_count{_format_labels(self.labels, key)} {count}"
+
+
+class Registry:
+    """Named metrics of this process"""
+    
+    def __init__(self):
+        self._metrics = {}
+        self._lock = threading.Lock()
+    
+    def _get(self, cls, name, help_text, labels, **kwargs):
+        with self._lock:
+            metric = self._metrics.get(name)
+            if metric is None:
+                metric = self._metrics[name] = cls(name, help_text, labels, **kwargs)
+            return metric
+    
+    def counter(self, name, help_text, labels=()):
+        return self._get(Counter, name, help_text, labels)
+    
+    def histogram(self, name, help_text, labels=(), buckets=DEFAULT_BUCKETS):
+        return self._get(Histogram, name, help_text, labels, buckets=buckets)
+    
+    def render(self):
+        """All metrics in the Prometheus text format"""
+        with self._lock:
+            metrics = sorted(self._metrics.values(), key=lambda m: m.name)
+        
+        lines = []
+        for metric in metrics:
+            lines.append(f"# HELP {metric.name} {metric.help}")
+            lines.append(f"# TYPE {metric.name} {metric.kind}")
+            lines.extend(metric.samples())
+        return '\n'.join(lines) + '\n'
+
+
+registry = Registry()
+
+STAGE_SECONDS = registry.histogram(
+    'sgcarmart_stage_duration_seconds', 'Duration of scrape pipeline stages', ['stage'])
+STAGE_ERRORS = registry.counter(
+    'sgcarmart_stage_errors_total', 'Scrape pipeline stages that raised', ['stage'])
+HTTP_SECONDS = registry.histogram(
+    'sgcarmart_http_request_duration_seconds', 'HTTP request latency per route',
+    ['app', 'method', 'route', 'status'])
+SNAPSHOTS_DEDUPLICATED = registry.counter(
+    'sgcarmart_snapshots_deduplicated_total', 'History saves identical to the previous run (no data files written)',
+    ['store'])
+
+
+class RunTimer:
+    """Stage timings of one run (a scrape)"""
+    
+    def __init__(self):
+        self.started = datetime.now()
+        self._start = time.perf_counter()
+        self.stages = {}
+        self._lock = threading.Lock()
+    
+    def add(self, stage, seconds, error=False):
+        with self._lock:
+            entry = self.stages.setdefault(stage, {'seconds': 0.0, 'count': 0, 'errors': 0})
+            entry['seconds'] += seconds
+            entry['count'] += 1
+            entry['errors'] += int(error)
+    
+    def summary(self):
+        """Timing summary (JSON-serializable)"""
+        with self._lock:
+            stages = {
+                stage: {**entry, 'seconds': round(entry['seconds'], 4)}
+                for stage, entry in self.stages.items()
+            }
+        return {
+            'started': self.started.isoformat(timespec='seconds'),
+            'total_seconds': round(time.perf_counter() - self._start, 4),
+            'stages': stages
+        }
+
+
+_current_run = contextvars.ContextVar('metrics_run', default=None)
+
+
+@contextmanager
+def run_timer():
+    """
+    Collect the stage timings of one run (see current_run)
+    
+    A block inside a run in progress (a scrape inside a pipeline) adds to
+    that run instead of starting a new one.
+    """
+    run = _current_run.get()
+    if run is not None:
+        yield run
+        return
+    
+    run = RunTimer()
+    token = _current_run.set(run)
+    try:
+        yield run
+    finally:
+        _current_run.reset(token)
+
+
+def current_run():
+    """RunTimer of the run in progress in this thread, or None"""
+    return _current_run.get()
+
+
+def observe(stage, seconds, error=False):
+    """Record a stage duration measured elsewhere"""
+    STAGE_SECONDS.observe(seconds, stage=stage)
+    if error:
+        STAGE_ERRORS.inc(stage=stage)
+    
+    run = _current_run.get()
+    if run is not None:
+        run.add(stage, seconds, error)
+
+
+@contextmanager
+def timed(stage):
+    """Time a pipeline stage (context manager or decorator)"""
+    start = time.perf_counter()
+    error = False
+    try:
+        yield
+    except BaseException:
+        error = True
+        raise
+    finally:
+        observe(stage, time.perf_counter() - start, error)
+
+
+def metrics_response():
+    """Response with all metrics of this process"""
+    from flask import current_app
+    return current_app.response_class(registry.render(), content_type=PROMETHEUS_CONTENT_TYPE)
+
+
+def init_app(app, endpoint='/metrics'):
+    """
+    Record route latency and serve the metrics
+    
+    Call before other init_app functions so the recorded latency includes
+    their after_request work (e.g. compression).
+    
+    Args:
+        app: Flask application
+        endpoint: URL of the Prometheus endpoint (None to not add it)
+    """
+    from flask import g, request
+    
+    def start_request():
+        g.metrics_start = time.perf_counter()
+    
+    def record_request(response):
+        start = g.pop('metrics_start', None)
+        if start is not None:
+            rule = request.url_rule
+            HTTP_SECONDS.observe(
+                time.perf_counter() - start,
+                app=app.import_name,
+                method=request.method,
+                route=rule.rule if rule is not None else 'unmatched',
+                status=response.status_code
+            )
+        return response
+    
+    app.before_request(start_request)
+    app.after_request(record_request)
+    
+    if endpoint:
+        app.add_url_rule(endpoint, 'metrics', metrics_response)
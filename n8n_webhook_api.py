@@ -7,14 +7,19 @@ Compatible with n8n, Zapier, and custom integrations
 """
 
 from flask import Flask, request, jsonify
-from depreciation_scraper import DepreciationScraper
-from depreciation_html_generator import DepreciationHTMLGenerator
-import pandas as pd
 from datetime import datetime
 import os
 import json
+import http_response
+import metrics
+import profiling
+from report_retention import get_retention
+from http_cache import conditional_json, file_version, make_etag
 
 app = Flask(__name__)
+metrics.init_app(app)
+profiling.init_app(app)
+http_response.init_app(app)
 
 # API Key for security (change this!)
 API_KEY = "your-secret-api-key-change-this"
@@ -75,25 +80,20 @@ def api_scrape():
     }
     
     try:
-        # Run scraper
-        scraper = DepreciationScraper(config)
-        result = scraper.run()
+        # Scrape, then write files and render the report from memory
+        # (Selenium is only imported here)
+        from depreciation_pipeline import run_pipeline
+        result = run_pipeline(config, formats=config_data.get('format', ['excel', 'csv', 'html']))
         
-        if not result or not result.get('excel'):
+        if not result:
             return jsonify({
                 'status': 'error',
                 'message': 'Scraping failed - No data found',
                 'timestamp': datetime.now().isoformat()
             }), 500
         
-        # Read scraped data
-        df = pd.read_excel(result['excel'])
-        
-        # Generate styled HTML
-        html_file = None
-        if 'html' in config_data.get('format', ['excel', 'csv', 'html']):
-            generator = DepreciationHTMLGenerator()
-            html_file = generator.generate_report(df)
+        # Scraped data (typed columns - no need to read the Excel file back)
+        df = result.data
         
         # Calculate summary
         data_summary = {
@@ -104,9 +104,9 @@ def api_scrape():
         
         # Prepare file paths
         files = {
-            'excel': os.path.abspath(result['excel']) if result.get('excel') else None,
-            'csv': os.path.abspath(result['csv']) if result.get('csv') else None,
-            'html': os.path.abspath(html_file) if html_file else None
+            'excel': os.path.abspath(result.files['excel']) if result.files.get('excel') else None,
+            'csv': os.path.abspath(result.files['csv']) if result.files.get('csv') else None,
+            'html': os.path.abspath(result.html_file) if result.html_file else None
         }
         
         # Remove None values
@@ -117,9 +117,10 @@ def api_scrape():
             'message': 'Scraping completed successfully',
             'files': files,
             'data_summary': data_summary,
+            'timings': result.timings,
             'timestamp': datetime.now().isoformat()
         }), 200
-        
+    
     except Exception as e:
         return jsonify({
             'status': 'error',
@@ -163,38 +164,40 @@ def api_latest():
             'message': 'No reports found'
         }), 404
     
-    # Find latest Excel file
-    excel_files = [f for f in os.listdir(report_folder) 
-                   if f.startswith('depreciation') and f.endswith('.xlsx')]
+    # Latest Excel file from the report manifest (no directory listing);
+    # CSV-only scrapes only write depreciation_latest.xlsx
+    excel_path = get_retention(report_folder).latest('depreciation', 'xlsx')
+    if not excel_path:
+        latest_path = os.path.join(report_folder, 'depreciation_latest.xlsx')
+        excel_path = latest_path if os.path.exists(latest_path) else None
     
-    if not excel_files:
+    if not excel_path:
         return jsonify({
             'status': 'error',
             'message': 'No data files found'
         }), 404
     
-    latest_file = max(excel_files, 
-                     key=lambda x: os.path.getmtime(os.path.join(report_folder, x)))
-    
-    excel_path = os.path.join(report_folder, latest_file)
-    
-    # Read data
-    df = pd.read_excel(excel_path)
+    latest_file = os.path.basename(excel_path)
     
     # Return format
     format_type = request.args.get('format', 'info')
     
-    if format_type == 'json':
-        # Return full data as JSON
-        return jsonify({
-            'status': 'success',
-            'data': df.to_dict(orient='records'),
-            'file': latest_file,
-            'timestamp': datetime.fromtimestamp(os.path.getmtime(excel_path)).isoformat()
-        })
-    else:
+    def build():
+        # Read data (only once per file version, the JSON body is cached)
+        import pandas as pd
+        df = pd.read_excel(excel_path)
+        
+        if format_type == 'json':
+            # Return full data as JSON
+            return {
+                'status': 'success',
+                'data': df.to_dict(orient='records'),
+                'file': latest_file,
+                'timestamp': datetime.fromtimestamp(os.path.getmtime(excel_path)).isoformat()
+            }
+        
         # Return file info only
-        return jsonify({
+        return {
             'status': 'success',
             'file': latest_file,
             'path': os.path.abspath(excel_path),
@@ -202,7 +205,10 @@ def api_latest():
             'modified': datetime.fromtimestamp(os.path.getmtime(excel_path)).isoformat(),
             'rows': len(df),
             'columns': len(df.columns)
-        })
+        }
+    
+    etag = make_etag('latest', format_type == 'json', latest_file, file_version(excel_path))
+    return conditional_json(etag, build, cache_control='private, no-cache')
 
 if __name__ == '__main__':
     print("="*70)
@@ -0,0 +1,269 @@
+"""
+Ablink SGCarmart Scraper - PDF Engine
+By Oneiros Indonesia
+
+Converts rendered HTML reports to real PDF files.
+
+Supported engines (first installed one wins, or set PDF_ENGINE):
+- weasyprint  - Best quality, pure Python (pip install weasyprint)
+- chrome      - Headless Chrome print-to-PDF via Selenium (needs Chrome)
+- xhtml2pdf   - Simple, no external dependencies (pip install xhtml2pdf)
+
+Engines are created once per process and kept warm: weasyprint keeps its
+font configuration, Chrome keeps one browser open between reports.
+"""
+
+import atexit
+import base64
+import importlib.util
+import os
+import shutil
+import threading
+import time
+
+from app_logging import get_logger
+
+logger = get_logger(__name__)
+
+
+class PDFEngine:
+    """Base class - render(html_file, pdf_file) returns per-stage timings"""
+    
+    name = None
+    
+    @classmethod
+    def is_installed(cls):
+        """Cheap check (no heavy imports) whether the engine can be used"""
+        raise NotImplementedError
+    
+    def render(self, html_file, pdf_file):
+        """
+        Convert an HTML file to PDF
+        
+        Args:
+            html_file: Rendered report (.html)
+            pdf_file: Output path (.pdf)
+        
+        Returns:
+            dict: Stage name -> seconds
+        """
+        raise NotImplementedError
+    
+    def close(self):
+        """Release long-lived resources"""
+        pass
+
+
+class WeasyPrintEngine(PDFEngine):
+    """WeasyPrint with a shared font configuration"""
+    
+    name = 'weasyprint'
+    
+    @classmethod
+    def is_installed(cls):
+        return importlib.util.find_spec('weasyprint') is not None
+    
+    def __init__(self):
+        import weasyprint
+        from weasyprint.text.fonts import FontConfiguration
+        
+        self._html = weasyprint.HTML
+        self.font_config = FontConfiguration()
+    
+    def render(self, html_file, pdf_file):
+        timings = {}
+        
+        start = time.perf_counter()
+        html = self._html(filename=html_file)
+        timings['parse'] = time.perf_counter() - start
+        
+        start = time.perf_counter()
+        document = html.render(font_config=self.font_config)
+        timings['layout'] = time.perf_counter() - start
+        
+        start = time.perf_counter()
+        document.write_pdf(pdf_file)
+        timings['write'] = time.perf_counter() - start
+        
+        return timings
+
+
+class ChromePDFEngine(PDFEngine):
+    """Headless Chrome kept open between reports (DevTools Page.printToPDF)"""
+    
+    name = 'chrome'
+    
+    BINARIES = ['google-chrome', 'google-chrome-stable', 'chromium', 'chromium-browser', 'chrome']
+    
+    PRINT_OPTIONS = {
+        'printBackground': True,
+        'landscape': True,
+        'preferCSSPageSize': True
+    }
+    
+    @classmethod
+    def is_installed(cls):
+        if importlib.util.find_spec('selenium') is None:
+            return False
+        return any(shutil.which(binary) for binary in cls.BINARIES)
+    
+    def __init__(self):
+        self.driver = None
+        self._lock = threading.Lock()
+    
+    def _start_driver(self):
+        """Start Chrome WebDriver (same setup as the scrapers)"""
+        from selenium import webdriver
+        from selenium.webdriver.chrome.options import Options
+        from selenium.webdriver.chrome.service import Service
+        from webdriver_manager.chrome import ChromeDriverManager
+        
+        options = Options()
+        options.add_argument('--headless=new')
+        options.add_argument('--no-sandbox')
+        options.add_argument('--disable-dev-shm-usage')
+        options.add_argument('--disable-gpu')
+        
+        service = Service(ChromeDriverManager().install())
+        self.driver = webdriver.Chrome(service=service, options=options)
+        logger.info("PDF engine: Chrome started")
+    
+    def _print(self, html_file, timings):
+        start = time.perf_counter()
+        if self.driver is None:
+            self._start_driver()
+        timings['start'] = time.perf_counter() - start
+        
+        start = time.perf_counter()
+        self.driver.get('file://' + os.path.abspath(html_file))
+        timings['load'] = time.perf_counter() - start
+        
+        start = time.perf_counter()
+        result = self.driver.execute_cdp_cmd('Page.printToPDF', self.PRINT_OPTIONS)
+        timings['print'] = time.perf_counter() - start
+        
+        return result['data']
+    
+    def render(self, html_file, pdf_file):
+        from selenium.common.exceptions import WebDriverException
+        
+        timings = {}
+        
+        with self._lock:
+            try:
+                data = self._print(html_file, timings)
+            except WebDriverException as e:
+                # Browser went away - restart once
+                logger.warning("PDF engine: Chrome restart (%s)", e.__class__.__name__)
+                self.close()
+                data = self._print(html_file, timings)
+        
+        start = time.perf_counter()
+        with open(pdf_file, 'wb') as f:
+            f.write(base64.b64decode(data))
+        timings['write'] = time.perf_counter() - start
+        
+        return timings
+    
+    def close(self):
+        if self.driver is not None:
+            try:
+                self.driver.quit()
+            except Exception:
+                pass
+            self.driver = None
+
+
+class XHTML2PDFEngine(PDFEngine):
+    """xhtml2pdf (limited CSS support)"""
+    
+    name = 'xhtml2pdf'
+    
+    @classmethod
+    def is_installed(cls):
+        return importlib.util.find_spec('xhtml2pdf') is not None
+    
+    def __init__(self):
+        from xhtml2pdf import pisa
+        
+        self._pisa = pisa
+    
+    def render(self, html_file, pdf_file):
+        timings = {}
+        
+        start = time.perf_counter()
+        with open(html_file, 'r', encoding='utf-8') as f:
+            html = f.read()
+        timings['parse'] = time.perf_counter() - start
+        
+        start = time.perf_counter()
+        with open(pdf_file, 'wb') as f:
+            status = self._pisa.CreatePDF(html, dest=f, encoding='utf-8')
+        timings['write'] = time.perf_counter() - start
+        
+        if status.err:
+            raise RuntimeError(f"xhtml2pdf failed with {status.err} errors")
+        
+        return timings
+
+
+# In order of preference
+ENGINES = [WeasyPrintEngine, ChromePDFEngine, XHTML2PDFEngine]
+
+_engines = {}
+_engines_lock = threading.Lock()
+
+
+def find_engine(name=None):
+    """
+    Pick a PDF engine class without starting it
+    
+    Args:
+        name: Engine name, default PDF_ENGINE env var, else first installed
+    
+    Returns:
+        PDFEngine subclass or None when no engine is installed
+    """
+    name = name or os.environ.get('PDF_ENGINE')
+    
+    if name == 'none':
+        return None
+    
+    for engine in ENGINES:
+        if name and engine.name != name:
+            continue
+        if engine.is_installed():
+            return engine
+    
+    return None
+
+
+def get_engine(name=None):
+    """
+    Shared warm engine instance for this process
+    
+    Returns:
+        PDFEngine or None when no engine is installed
+    """
+    engine_class = find_engine(name)
+    if engine_class is None:
+        return None
+    
+    with _engines_lock:
+        if engine_class.name not in _engines:
+            _engines[engine_class.name] = engine_class()
+        return _engines[engine_class.name]
+
+
+def format_timings(timings):
+    """'parse 12ms, layout 340ms, ...' for log lines"""
+    return ', '.join(f"{stage} {seconds * 1000:.0f}ms" for stage, seconds in timings.items())
+
+
+@atexit.register
+def close_engines():
+    """Close long-lived engines (Chrome) on exit (render pool workers register it via render_service._init_worker)"""
+    with _engines_lock:
+        for engine in _engines.values():
+            engine.close()
+        _engines.clear()
@@ -0,0 +1,284 @@
+"""
+Ablink SGCarmart Scraper - Profiling
+By Oneiros Indonesia
+
+Opt-in profiling of a single scrape, export or request (off by default):
+- PROFILE env var: profile every scrape run
+  ('1' or 'pstats' = cProfile stats, 'collapsed' = flame graph stacks)
+- ?profile=1 (or ?profile=collapsed) on any Flask API, allowed only with
+  the X-Profile-Token header matching the PROFILE_TOKEN env var
+- --profile [pstats|collapsed] on the CLI scripts
+  (depreciation_scraper.py, sgcarmart_scraper.py)
+
+Output goes to PROFILE_DIR (default data/profiles), keeping the newest
+PROFILE_MAX_FILES runs (default 20):
+- <time>_<name>.prof: cProfile stats (python -m pstats, snakeviz)
+  plus <time>_<name>.txt with the top functions by cumulative time
+- <time>_<name>.collapsed: sampled stacks in the collapsed format of
+  flamegraph.pl / speedscope / py-spy --format raw
+
+Usage:
+    with profile_run('scrape'):   # only when PROFILE is set
+        ...
+    
+    with profile('export', fmt='collapsed') as result:
+        ...
+    result.path                   # written file
+    
+    init_app(app)                 # ?profile=1 on the routes
+
+Only the calling thread is profiled; PDFs rendered in the render pool
+processes are not included.
+"""
+
+import contextvars
+import cProfile
+import io
+import os
+import pstats
+import re
+import sys
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+from datetime import datetime
+
+from app_logging import get_logger
+
+logger = get_logger(__name__)
+
+
+PROFILE_DIR = os.environ.get('PROFILE_DIR', 'data/profiles')
+PROFILE_MAX_FILES = int(os.environ.get('PROFILE_MAX_FILES', 20))
+
+FORMATS = ('pstats', 'collapsed')
+SAMPLE_INTERVAL = 0.005  # Seconds between stack samples (collapsed format)
+SUMMARY_LINES = 40       # Functions in the .txt summary
+
+_active = contextvars.ContextVar('profile_active', default=False)
+
+# cProfile allows one active profiler per process (Python 3.12+)
+_cprofile_lock = threading.Lock()
+
+
+def parse_format(value):
+    """
+    Profile format from an env var / query / CLI value
+    
+    Returns:
+        str: 'pstats' or 'collapsed', None when profiling is off
+    """
+    value = (value or '').strip().lower()
+    if value in ('', '0', 'false', 'no', 'off'):
+        return None
+    if value in ('collapsed', 'flame', 'flamegraph'):
+        return 'collapsed'
+    return 'pstats'
+
+
+class StackSampler:
+    """Samples the stack of one thread (collapsed flame graph stacks)"""
+    
+    def __init__(self, thread_id=None, interval=SAMPLE_INTERVAL):
+        self.thread_id = thread_id or threading.get_ident()
+        self.interval = interval
+        self.stacks = Counter()
+        self._stop = threading.Event()
+        self._thread = None
+    
+    def _sample(self):
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            stack = []
+            while frame is not None:
+                code = frame.f_code
+                module = os.path.splitext(os.path.basename(code.co_filename))[0]
+                stack.append(f"{module}:{code.co_name}")
+                frame = frame.f_back
+            if stack:
+                self.stacks[';'.join(reversed(stack))] += 1
+    
+    def start(self):
+        self._thread = threading.Thread(target=self._sample, name='profile-sampler', daemon=True)
+        self._thread.start()
+    
+    def stop(self):
+        self._stop.set()
+        self._thread.join()
+    
+    def write(self, path):
+        with open(path, 'w', encoding='utf-8') as f:
+            for stack, count in self.stacks.most_common():
+                f.write(f"{stack} {count}\n")
+
+
+class ProfileResult:
+    """Files written by a profile() block"""
+    
+    def __init__(self, name, fmt):
+        self.name = name
+        self.format = fmt
+        self.path = None
+        self.seconds = None
+
+
+def _prune(folder, max_files):
+    """Keep the newest max_files runs (a run is all files with one stem)"""
+    runs = {}
+    for filename in os.listdir(folder):
+        stem = os.path.splitext(filename)[0]
+        runs.setdefault(stem, []).append(filename)
+    
+    # Stems start with the timestamp, so they sort oldest first
+    for stem in sorted(runs)[:max(len(runs) - max_files, 0)]:
+        for filename in runs[stem]:
+            try:
+                os.remove(os.path.join(folder, filename))
+            except OSError:
+                pass
+
+
+def _base_path(name, folder):
+    os.makedirs(folder, exist_ok=True)
+    safe_name = re.sub(r'[^A-Za-z0-9_.-]+', '_', name).strip('_') or 'run'
+    stamp = datetime.now().strftime('%Y%m%d_%H%M%S_%f')
+    return os.path.join(folder, f"{stamp}_{safe_name}")
+
+
+@contextmanager
+def profile(name, fmt='pstats', folder=None, max_files=None):
+    """
+    Profile the block and write the result
+    
+    Nested blocks (a profiled scrape inside a profiled request) and a
+    second cProfile while one is running are not profiled again.
+    
+    Args:
+        name: Run name used in the file name (e.g. 'scrape', 'GET /api/export')
+        fmt: 'pstats' or 'collapsed'
+        folder: Output folder (default PROFILE_DIR)
+        max_files: Runs kept in the folder (default PROFILE_MAX_FILES)
+    
+    Yields:
+        ProfileResult: path is set after the block (None if not profiled)
+    """
+    result = ProfileResult(name, fmt)
+    if _active.get() or fmt not in FORMATS:
+        yield result
+        return
+    
+    if fmt == 'pstats' and not _cprofile_lock.acquire(blocking=False):
+        logger.warning("Profile %s skipped: another cProfile run is active", name)
+        yield result
+        return
+    
+    token = _active.set(True)
+    profiler = cProfile.Profile() if fmt == 'pstats' else StackSampler()
+    start = time.perf_counter()
+    try:
+        if fmt == 'pstats':
+            profiler.enable()
+        else:
+            profiler.start()
+        yield result
+    finally:
+        if fmt == 'pstats':
+            profiler.disable()
+            _cprofile_lock.release()
+        else:
+            profiler.stop()
+        _active.reset(token)
+        result.seconds = time.perf_counter() - start
+        
+        try:
+            folder = folder or PROFILE_DIR
+            base = _base_path(name, folder)
+            if fmt == 'pstats':
+                result.path = base + '.prof'
+                profiler.dump_stats(result.path)
+                with open(base + '.txt', 'w', encoding='utf-8') as f:
+                    f.write(summarize(profiler))
+            else:
+                result.path = base + '.collapsed'
+                profiler.write(result.path)
+            _prune(folder, max_files or PROFILE_MAX_FILES)
+            logger.info("Profile of %s (%.2fs): %s", name, result.seconds, result.path)
+        except OSError as e:
+            logger.warning("Could not write profile of %s: %s", name, e)
+
+
+def summarize(profiler, lines=SUMMARY_LINES):
+    """Top functions by cumulative time (text)"""
+    out = io.StringIO()
+    stats = pstats.Stats(profiler, stream=out)
+    stats.strip_dirs().sort_stats('cumulative').print_stats(lines)
+    return out.getvalue()
+
+
+@contextmanager
+def profile_run(name):
+    """Profile the block when the PROFILE env var is set (context manager or decorator)"""
+    fmt = parse_format(os.environ.get('PROFILE'))
+    if fmt is None:
+        yield None
+        return
+    
+    with profile(name, fmt) as result:
+        yield result
+
+
+def add_cli_argument(parser):
+    """Add --profile [pstats|collapsed] to an argparse parser"""
+    parser.add_argument(
+        '--profile', nargs='?', const='pstats', default=None, choices=FORMATS,
+        help=f"profile this run into {PROFILE_DIR} (default format: pstats)"
+    )
+
+
+def init_app(app):
+    """
+    Profile single requests with ?profile=1
+    
+    Needs the PROFILE_TOKEN env var and a matching X-Profile-Token header
+    (without PROFILE_TOKEN the parameter is ignored). The response carries
+    the written file name in X-Profile-File.
+    
+    Args:
+        app: Flask application
+    """
+    import hmac
+    from flask import g, request
+    
+    token = os.environ.get('PROFILE_TOKEN')
+    
+    def start_profile():
+        fmt = parse_format(request.args.get('profile'))
+        if fmt is None or not token:
+            return
+        if not hmac.compare_digest(request.headers.get('X-Profile-Token', ''), token):
+            return
+        
+        rule = request.url_rule
+        block = profile(f"{request.method} {rule.rule if rule is not None else request.path}", fmt)
+        g.profile_result = block.__enter__()
+        g.profile_block = block
+    
+    def stop_profile(response):
+        block = g.pop('profile_block', None)
+        if block is not None:
+            block.__exit__(None, None, None)
+            result = g.pop('profile_result')
+            if result.path:
+                response.headers['X-Profile-File'] = os.path.basename(result.path)
+        return response
+    
+    def abort_profile(error=None):
+        # Request failed before after_request: still close the profiler
+        block = g.pop('profile_block', None)
+        if block is not None:
+            block.__exit__(None, None, None)
+    
+    app.before_request(start_profile)
+    app.after_request(stop_profile)
+    app.teardown_request(abort_profile)
@@ -0,0 +1,281 @@
+"""
+Ablink SGCarmart Scraper - Report Render Service
+By Oneiros Indonesia
+
+Runs the HTML report generators in a process pool:
+- Rendering is CPU bound, so it runs outside the web server threads
+- Outputs are cached on disk by (generator, theme, render date, snapshot
+  hash): the reports show their generation date, so a cached report is
+  only reused on the day it was rendered
+- Identical requests already in flight share one render
+- PDF output through pdf_engine, kept warm inside each worker process
+"""
+
+import multiprocessing
+import multiprocessing.util
+import os
+import threading
+import time
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from datetime import datetime
+from importlib import import_module
+
+import metrics
+import pdf_engine
+from app_logging import get_logger
+from content_hash import content_hash
+
+logger = get_logger(__name__)
+
+
+# theme -> (module, generator class, output file prefix)
+GENERATORS = {
+    'depreciation': ('depreciation_html_generator', 'DepreciationHTMLGenerator', 'depreciation_styled'),
+    'colorful': ('colorful_generator', 'ColorfulGenerator', 'colorful_report'),
+    'soft': ('soft_generator', 'SoftGenerator', 'report'),
+    'final_pdf': ('final_pdf_generator', 'FinalPDFGenerator', 'depreciation_report'),
+    'pdf_enhanced': ('pdf_enhanced_generator', 'PDFEnhancedGenerator', 'pdf_exact'),
+    'pdf_style': ('pdf_style_generator', 'PDFStyleHTMLGenerator', 'pdf_style'),
+    'market_analysis': ('market_analysis_generator', 'MarketAnalysisGenerator', 'market_analysis'),
+}
+
+
+def _init_worker():
+    """
+    Worker process start-up: close the warm PDF engines (Chrome) when the
+    worker exits - pool workers leave through os._exit, so atexit
+    handlers never run there, multiprocessing finalizers do
+    """
+    multiprocessing.util.Finalize(None, pdf_engine.close_engines, exitpriority=10)
+
+
+def _render(theme, data, output_file):
+    """Worker entry point - render one report to output_file"""
+    module_name, class_name, _ = GENERATORS[theme]
+    generator = getattr(import_module(module_name), class_name)()
+    
+    # Render to a temporary name so a cached file is never half written
+    temp_file = f"{output_file}.{os.getpid()}.tmp"
+    try:
+        generator.generate_report(data, temp_file)
+        os.replace(temp_file, output_file)
+    finally:
+        _remove_temp(temp_file)
+    return output_file
+
+
+def _remove_temp(temp_file):
+    """Drop the temporary file of a failed render (no-op after os.replace)"""
+    try:
+        os.remove(temp_file)
+    except FileNotFoundError:
+        pass
+
+
+def _render_pdf(theme, data, output_file, engine_name=None):
+    """Worker entry point - render the HTML report, then convert it to PDF"""
+    timings = {}
+    
+    html_file = output_file[:-len('.pdf')] + '.html'
+    if not os.path.exists(html_file):
+        start = time.perf_counter()
+        _render(theme, data, html_file)
+        timings['html'] = time.perf_counter() - start
+    
+    engine = pdf_engine.get_engine(engine_name)
+    if engine is None:
+        raise RuntimeError("No PDF engine installed")
+    
+    temp_file = f"{output_file}.{os.getpid()}.tmp"
+    try:
+        timings.update(engine.render(html_file, temp_file))
+        os.replace(temp_file, output_file)
+    finally:
+        _remove_temp(temp_file)
+    
+    logger.info("PDF rendered (%s): %s", engine.name, pdf_engine.format_timings(timings))
+    return output_file
+
+
+# Seconds an export request waits for a PDF before falling back to HTML
+PDF_TIMEOUT = float(os.environ.get('PDF_TIMEOUT', 120))
+
+
+class RenderService:
+    """Process pool for report rendering with output cache and in-flight dedupe"""
+    
+    def __init__(self, output_folder='daily_reports', max_workers=None, pdf_engine_name=None):
+        """
+        Initialize render service
+        
+        Args:
+            output_folder: Folder for rendered reports (also the cache)
+            max_workers: Worker processes (default: CPU count, max 4)
+            pdf_engine_name: PDF engine (default: PDF_ENGINE env var or first installed)
+        """
+        self.output_folder = output_folder
+        self.max_workers = max_workers or min(4, os.cpu_count() or 1)
+        self.pdf_engine_name = pdf_engine_name
+        
+        self._executor = None
+        self._in_flight = {}
+        self._lock = threading.Lock()
+    
+    def _get_executor(self):
+        """Create the pool on first use (spawn: safe next to server threads)"""
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.max_workers,
+                mp_context=multiprocessing.get_context('spawn'),
+                initializer=_init_worker
+            )
+        return self._executor
+    
+    def output_path(self, theme, data, fmt='html'):
+        """Cache path of a report: one file per (generator, theme, render date, snapshot hash)"""
+        if theme not in GENERATORS:
+            raise ValueError(f"Unknown report theme: {theme}")
+        
+        _, _, prefix = GENERATORS[theme]
+        render_date = datetime.now().strftime('%Y%m%d')
+        filename = f"{prefix}_{render_date}_{content_hash(data)[:16]}.{fmt}"
+        return os.path.abspath(os.path.join(self.output_folder, filename))
+    
+    def submit(self, theme, data, fmt='html'):
+        """
+        Request a report render
+        
+        Args:
+            theme: Report theme (see GENERATORS)
+            data: Snapshot dict or DataFrame passed to generate_report
+            fmt: 'html' or 'pdf'
+        
+        Returns:
+            Future: Resolves to the output file path
+        """
+        output_file = self.output_path(theme, data, fmt)
+        task = self._task(theme, data, output_file, fmt)
+        inline = False
+        
+        with self._lock:
+            # Cached output - touched, so retention treats it as just written
+            # (report_retention keeps files younger than MIN_AGE_SECONDS)
+            try:
+                os.utime(output_file)
+            except FileNotFoundError:
+                pass
+            else:
+                future = Future()
+                future.set_result(output_file)
+                return future
+            
+            # Same report already rendering
+            if output_file in self._in_flight:
+                return self._in_flight[output_file]
+            
+            os.makedirs(self.output_folder, exist_ok=True)
+            
+            try:
+                future = self._get_executor().submit(*task)
+            except (BrokenProcessPool, OSError, RuntimeError) as e:
+                logger.warning("Render pool unavailable, rendering inline: %s", e)
+                self._drop_executor()
+                future = Future()
+                inline = True
+            
+            self._in_flight[output_file] = future
+        
+        # Time of actual renders (cache hits and joined renders return above)
+        start = time.perf_counter()
+        future.add_done_callback(lambda done: metrics.observe(
+            'report_render', time.perf_counter() - start, error=done.exception() is not None))
+        future.add_done_callback(lambda _: self._finish(output_file))
+        
+        if inline:
+            try:
+                future.set_result(task[0](*task[1:]))
+            except Exception as e:
+                future.set_exception(e)
+        
+        return future
+    
+    def _task(self, theme, data, output_file, fmt):
+        """Worker function and arguments of a render"""
+        if fmt == 'pdf':
+            return (_render_pdf, theme, data, output_file, self.pdf_engine_name)
+        return (_render, theme, data, output_file)
+    
+    def _drop_executor(self):
+        """Forget a broken pool (lock held); the next render starts a new one"""
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+            self._executor = None
+    
+    def wait(self, future, theme, data, fmt='html', timeout=None):
+        """
+        Wait for a submit() future; if the pool broke (e.g. a worker could
+        not import the launching __main__), render inline instead
+        
+        Returns:
+            str: Output file path
+        """
+        try:
+            return future.result(timeout)
+        except BrokenProcessPool as e:
+            logger.warning("Render pool broken, rendering inline: %s", e)
+            with self._lock:
+                self._drop_executor()
+            task = self._task(theme, data, self.output_path(theme, data, fmt), fmt)
+            return task[0](*task[1:])
+    
+    def render(self, theme, data, timeout=None):
+        """
+        Render a report and wait for it
+        
+        Returns:
+            str: HTML file path
+        """
+        return self.wait(self.submit(theme, data), theme, data, timeout=timeout)
+    
+    def pdf_available(self):
+        """Whether a PDF engine is installed"""
+        return pdf_engine.find_engine(self.pdf_engine_name) is not None
+    
+    def render_pdf(self, theme, data, timeout=PDF_TIMEOUT):
+        """
+        Render a report to PDF and wait for it
+        
+        Args:
+            timeout: Seconds to wait (the render may still finish into the cache)
+        
+        Returns:
+            str: PDF file path, or None when no PDF engine is installed or
+                the engine failed or timed out (callers fall back to the
+                printable HTML report)
+        """
+        if not self.pdf_available():
+            return None
+        
+        try:
+            return self.wait(self.submit(theme, data, 'pdf'), theme, data, 'pdf', timeout)
+        except TimeoutError:
+            logger.warning("PDF render of %s timed out after %ss, serving HTML", theme, timeout)
+        except Exception as e:
+            logger.warning("PDF render of %s failed, serving HTML: %s", theme, e)
+        return None
+    
+    def _finish(self, output_file):
+        with self._lock:
+            self._in_flight.pop(output_file, None)
+    
+    def shutdown(self, wait=True):
+        """Stop worker processes"""
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=wait)
+                self._executor = None
+
+
+# Shared instance - the pool itself is only started on first render
+render_service = RenderService()
@@ -0,0 +1,382 @@
+"""
+Ablink SGCarmart Scraper - Shared Report Renderer
+By Oneiros Indonesia
+
+Common rendering layer used by every HTML report generator:
+- Jinja2 page templates (templates/reports) compiled once per process
+- Shared CSS assets: base.css plus one stylesheet per theme
+- Common table model: header rows, category sections, rows of cells
+- Column-wise cell formatting for DataFrame based tables
+
+Each generator only describes its theme (template, stylesheet, colors
+and cell classes) and converts its data into the table model.
+"""
+
+import os
+from functools import lru_cache
+from html import escape as html_escape
+
+import numpy as np
+import pandas as pd
+from jinja2 import Environment, FileSystemLoader, select_autoescape
+from markupsafe import Markup
+
+
+TEMPLATE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'templates', 'reports')
+CSS_DIR = os.path.join(TEMPLATE_DIR, 'css')
+
+
+# ============== TABLE MODEL ==============
+
+@lru_cache(maxsize=1024)
+def _open_tag(tag, css, colspan, rowspan, style):
+    """Opening tag with attributes - a report only uses a handful of combinations"""
+    attrs = ''
+    if colspan > 1:
+        attrs += f' colspan="{colspan}"'
+    if rowspan > 1:
+        attrs += f' rowspan="{rowspan}"'
+    if css:
+        attrs += f' class="{html_escape(css)}"'
+    if style:
+        attrs += f' style="{html_escape(style)}"'
+    return f'<{tag}{attrs}>'
+
+
+def to_html(value):
+    """Escape cell text unless it is already markup"""
+    if hasattr(value, '__html__'):
+        return value.__html__()
+    return html_escape(str(value), quote=False)
+
+
+def td(text, css='', colspan=1, rowspan=1, style=''):
+    """
+    Render one body cell
+    
+    Cells are plain strings so that a row is rendered with a single join.
+    Use td_safe() for text that is known not to need escaping (numbers).
+    """
+    return f'{_open_tag("td", css, colspan, rowspan, style)}{to_html(text)}</td>'
+
+
+def td_safe(text, css=''):
+    """Render a body cell whose text needs no escaping (formatted numbers)"""
+    return f'{_open_tag("td", css, 1, 1, "")}{text}</td>'
+
+
+def th(text, css='', colspan=1, rowspan=1, style=''):
+    """Render one header cell"""
+    return f'{_open_tag("th", css, colspan, rowspan, style)}{to_html(text)}</th>'
+
+
+class Section:
+    """Rows grouped under one category header row"""
+    
+    __slots__ = ('title', 'color', 'rows')
+    
+    def __init__(self, title, rows, color=None):
+        self.title = title
+        self.rows = rows
+        self.color = color
+
+
+class Table:
+    """
+    Report table model
+    
+    Args:
+        header_rows: List of header rows, each a list of th() strings
+        sections: List of Section whose rows are row HTML strings
+            (the row's td() cells joined, see join_rows)
+            (a Section with title None has no category row)
+        column_count: Number of body columns (category row colspan)
+        category_css: CSS class of the category header cell
+    """
+    
+    def __init__(self, header_rows, sections, column_count, category_css='category'):
+        self.header_rows = header_rows
+        self.sections = sections
+        self.column_count = column_count
+        self.category_css = category_css
+    
+    @property
+    def row_count(self):
+        return sum(len(section.rows) for section in self.sections)
+
+
+def render_table(table):
+    """
+    Render a Table to HTML
+    
+    The page frame is a Jinja2 template, but table bodies can hold tens of
+    thousands of cells, so rows are joined from pre-rendered strings.
+    """
+    parts = ['<table>\n    <thead>\n']
+    for header_row in table.header_rows:
+        parts.append('        <tr>' + ''.join(header_row) + '</tr>\n')
+    parts.append('    </thead>\n    <tbody>\n')
+    
+    category_attrs = f' colspan="{table.column_count}" class="{html_escape(table.category_css)}"'
+    for section in table.sections:
+        if section.title is not None:
+            style = f' style="background: {html_escape(section.color)};"' if section.color else ''
+            parts.append(f'        <tr><td{category_attrs}{style}>{to_html(section.title)}</td></tr>\n')
+        for row in section.rows:
+            parts.append('        <tr>' + row + '</tr>\n')
+    
+    parts.append('    </tbody>\n</table>\n')
+    return Markup(''.join(parts))
+
+
+# ============== COLUMN FORMATTING ==============
+# Cells are rendered a whole DataFrame column at a time: the column is
+# classified once, numbers are formatted column-wise and the resulting
+# cell strings are zipped into rows with a single join per row.
+
+def escape_column(series):
+    """HTML-escape a column of text"""
+    return (series.astype(str)
+            .str.replace('&', '&amp;', regex=False)
+            .str.replace('<', '&lt;', regex=False)
+            .str.replace('>', '&gt;', regex=False))
+
+
+def text_cells(series, css='', style=''):
+    """Render a text column (Vehicle, Category) to td() strings"""
+    return (_open_tag('td', css, 1, 1, style) + escape_column(series) + '</td>').tolist()
+
+
+def _text_fallback(cells, series, values, css):
+    """Render values that are not numbers as escaped text"""
+    not_number = values.isna() & series.notna()
+    if not_number.any():
+        text = _open_tag('td', css, 1, 1, '') + escape_column(series[not_number]) + '</td>'
+        cells = cells.copy()
+        cells[not_number] = text
+    return cells
+
+
+def number_cells(series, css, fmt, empty_cell=None, text_css=None):
+    """
+    Render a numeric column to td() strings
+    
+    Args:
+        series: Column values (non-numeric values are shown as text)
+        css: CSS class of number cells
+        fmt: Format string applied to each number, e.g. '${:,.0f}'
+        empty_cell: Cell used for 0 / missing values (None: format them too)
+        text_css: CSS class of non-numeric cells (defaults to css)
+    
+    Returns:
+        list: One cell string per row
+    """
+    values = pd.to_numeric(series, errors='coerce')
+    cells = _open_tag('td', css, 1, 1, '') + values.fillna(0).map(fmt.format) + '</td>'
+    
+    if empty_cell is not None:
+        cells = cells.where(values.fillna(0) != 0, empty_cell)
+    
+    return _text_fallback(cells, series, values, css if text_css is None else text_css).tolist()
+
+
+def diff_cells(series, css, plus='', zero_text='0', text_css=None):
+    """
+    Render a DIFF column: positive / negative / zero classes
+    
+    Args:
+        series: Column values
+        css: (positive, negative, zero) CSS classes
+        plus: Prefix of positive values
+        zero_text: Text of zero cells
+        text_css: CSS class of non-numeric cells (defaults to the zero class)
+    """
+    pos_css, neg_css, zero_css = css
+    values = pd.to_numeric(series, errors='coerce')
+    numbers = np.trunc(values.fillna(0))
+    text = numbers.map('{:.0f}'.format)
+    
+    cells = pd.Series(td_safe(zero_text, zero_css), index=series.index, dtype=object)
+    positive = numbers > 0
+    negative = numbers < 0
+    cells[positive] = _open_tag('td', pos_css, 1, 1, '') + plus + text[positive] + '</td>'
+    cells[negative] = _open_tag('td', neg_css, 1, 1, '') + text[negative] + '</td>'
+    
+    return _text_fallback(cells, series, values, zero_css if text_css is None else text_css).tolist()
+
+
+def join_rows(columns):
+    """Zip per-column cell lists into row HTML strings"""
+    return [''.join(cells) for cells in zip(*columns)]
+
+
+# ============== TEMPLATES ==============
+
+@lru_cache(maxsize=None)
+def get_environment():
+    """Jinja2 environment shared by all generators (templates are compiled once)"""
+    env = Environment(
+        loader=FileSystemLoader(TEMPLATE_DIR),
+        autoescape=select_autoescape(['html']),
+        trim_blocks=True,
+        lstrip_blocks=True,
+        auto_reload=False
+    )
+    env.globals['render_table'] = render_table
+    return env
+
+
+@lru_cache(maxsize=None)
+def load_css(theme):
+    """Shared base stylesheet followed by the theme stylesheet, read once"""
+    parts = []
+    for name in ('base', theme):
+        with open(os.path.join(CSS_DIR, f'{name}.css'), 'r', encoding='utf-8') as f:
+            parts.append(f.read())
+    return Markup('\n'.join(parts))
+
+
+def render_report(theme, **context):
+    """
+    Render a full report page
+    
+    Args:
+        theme: Theme name - selects templates/reports/<theme>.html and css/<theme>.css
+        **context: Template variables (tables, current_date, ...)
+    
+    Returns:
+        str: HTML document
+    """
+    template = get_environment().get_template(f'{theme}.html')
+    return template.render(css=load_css(theme), **context)
+
+
+def write_report(html, output_file):
+    """Write rendered HTML to disk, creating the folder if needed"""
+    folder = os.path.dirname(output_file)
+    if folder:
+        os.makedirs(folder, exist_ok=True)
+    
+    with open(output_file, 'w', encoding='utf-8') as f:
+        f.write(html)
+    
+    return output_file
+
+
+# ============== TABLE BUILDERS ==============
+
+def years_from_columns(df):
+    """Years present as '<year>_price' / '<year>_units' columns (newest first)"""
+    year_cols = [col for col in df.columns if '_price' in col or '_units' in col]
+    return sorted({col.split('_')[0] for col in year_cols if col.split('_')[0].isdigit()}, reverse=True)
+
+
+def category_positions(df):
+    """Yield (category, row positions) in order of first appearance"""
+    if 'Category' not in df.columns:
+        yield None, range(len(df))
+        return
+    
+    groups = df.groupby('Category', sort=False, dropna=False).indices
+    for category, positions in sorted(groups.items(), key=lambda item: item[1][0]):
+        yield category, positions
+
+
+def build_sections(df, rows, category_colors=None, default_color=None):
+    """Split row strings into category sections"""
+    sections = []
+    for category, positions in category_positions(df):
+        color = category_colors.get(category, default_color) if category_colors else None
+        sections.append(Section(category, [rows[i] for i in positions], color))
+    return sections
+
+
+def _column(df, name):
+    """Column by name, or zeros if the DataFrame does not have it"""
+    if name in df.columns:
+        return df[name]
+    return pd.Series(0, index=df.index)
+
+
+DEFAULT_GRID_STYLE = {
+    'vehicle_header': '',
+    'vehicle_header_style': 'width: 120px;',
+    'year_header_style': '',
+    'total_header_style': '',
+    'header_rowspan': 1,
+    'vehicle_css': 'vehicle',
+    'vehicle_style': '',
+    'price_column': '{year}_price',
+    'units_column': '{year}_units',
+    'price_format': '${:,.0f}',
+    'price_css': 'price',
+    'price_empty_css': 'empty',
+    'units_css': 'units',
+    'units_empty_css': 'units',
+    'units_empty_text': '0',
+    'older_bucket': True,
+    'previous_css': 'total',
+    'diff_css': ('diff-pos', 'diff-neg', 'diff-zero'),
+    'diff_plus': '',
+    'category_css': 'category',
+    'category_default_color': '#f0f0f0',
+}
+
+
+def build_year_grid(df, years, style, category_colors=None):
+    """
+    Build the price/units grid shared by the PDF-like reports
+    
+    Each year has a price column and a units column, followed by an
+    optional '2014 & Older' pair and the TOTAL UNITS / Previous / DIFF columns.
+    
+    Args:
+        df: DataFrame with Vehicle, Category, <year>_price, <year>_units,
+            TOTAL UNITS, Previous and DIFF columns
+        years: Year labels to show, newest first
+        style: Theme options (see DEFAULT_GRID_STYLE)
+        category_colors: Optional mapping of category to background color
+    
+    Returns:
+        Table: Table model
+    """
+    style = {**DEFAULT_GRID_STYLE, **style}
+    columns = set(df.columns)
+    rowspan = style['header_rowspan']
+    
+    # Header
+    header = [th(style['vehicle_header'], style=style['vehicle_header_style'], rowspan=rowspan)]
+    header += [th(year, colspan=2, style=style['year_header_style']) for year in years]
+    if style['older_bucket']:
+        header.append(th('2014 & Older', colspan=2))
+    for label in (Markup('TOTAL<br>UNITS'), Markup('Previous<br>(Date)'), 'DIFF'):
+        header.append(th(label, style=style['total_header_style'], rowspan=rowspan))
+    
+    # (price column, units column) pairs - missing columns render as empty cells
+    pairs = []
+    for year in years:
+        units_col = style['units_column'] and style['units_column'].format(year=year)
+        pairs.append((style['price_column'].format(year=year), units_col))
+    if style['older_bucket']:
+        pairs.append(('2014_price', '2014_units'))
+    pairs = [(p if p in columns else None, u if u in columns else None) for p, u in pairs]
+    
+    empty_price = td_safe('-', style['price_empty_css'])
+    empty_units = td_safe(style['units_empty_text'], style['units_empty_css'])
+    
+    # Body - one list of cells per column
+    columns = [text_cells(df['Vehicle'], style['vehicle_css'], style['vehicle_style'])]
+    for price_col, units_col in pairs:
+        columns.append(number_cells(df[price_col], style['price_css'], style['price_format'], empty_price)
+                       if price_col else [empty_price] * len(df))
+        columns.append(number_cells(df[units_col], style['units_css'], '{:.0f}', empty_units)
+                       if units_col else [empty_units] * len(df))
+    columns.append(number_cells(_column(df, 'TOTAL UNITS').fillna(0), 'total', '{:.0f}'))
+    columns.append(number_cells(_column(df, 'Previous').fillna(0), style['previous_css'], '{:.0f}'))
+    columns.append(diff_cells(_column(df, 'DIFF'), style['diff_css'], style['diff_plus']))
+    
+    rows = join_rows(columns)
+    sections = build_sections(df, rows, category_colors, style['category_default_color'])
+    
+    column_count = 1 + 2 * len(pairs) + 3
+    return Table([header], sections, column_count, style['category_css'])
@@ -0,0 +1,320 @@
+"""
+Ablink SGCarmart Scraper - Report Retention
+By Oneiros Indonesia
+
+Keeps daily_reports/ bounded and indexed:
+- Enforces the config.json "output_settings" policy per report series
+  (depreciation .xlsx, depreciation .csv, market_analysis .xlsx, ...):
+  max_files_to_keep newest files, or only the newest with keep_latest_only
+- Optionally gzips files older than compress_after_days (never the
+  newest of a series)
+- Render service cache files (<prefix>_<YYYYmmdd>_<hash16>.html/.pdf):
+  files rendered before today are removed (the cache only reuses a
+  report on its render date), of today's the newest cache_files_to_keep
+  per theme and format are kept
+- Manifest (daily_reports/.retention/manifest.json) of the timestamped
+  outputs with the newest file per series, so "latest" is a dict lookup
+  instead of listdir + getmtime of every file
+
+Only files named <series>_<YYYYmmdd_HHMMSS>.<ext> and cache files are
+managed; the _latest files and history folders are left alone. Files
+younger than MIN_AGE_SECONDS are never removed, so an export another
+request just wrote is still there when it is sent. The manifest is
+rebuilt (one directory scan) whenever the folder changed since it was
+written, so files written by other processes are picked up.
+
+Usage:
+    retention = get_retention('daily_reports')
+    retention.latest('depreciation', 'xlsx')   # path or None
+    retention.enforce()                        # after writing outputs
+"""
+
+import gzip
+import json
+import os
+import re
+import shutil
+import threading
+import time
+from datetime import datetime
+from functools import lru_cache
+
+from app_logging import get_logger
+
+logger = get_logger(__name__)
+
+
+CONFIG_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'config.json')
+REPORT_FOLDER = 'daily_reports'
+MANIFEST_FOLDER = '.retention'
+MANIFEST_VERSION = 2
+MIN_AGE_SECONDS = 60  # Files written this recently are kept (being sent)
+
+DEFAULT_OUTPUT_SETTINGS = {
+    'keep_latest_only': False,
+    'max_files_to_keep': 30,
+    'compress_after_days': 0,  # 0 = never compress
+    'cache_files_to_keep': 20  # Per render theme and format
+}
+
+# depreciation_20260125_100514.xlsx, market_analysis_2026-01-25_20260125_100514.csv.gz
+FILE_PATTERN = re.compile(
+    r'^(?P<series>.+?)(?:_\d{4}-\d{2}-\d{2})?_(?P<stamp>\d{8}_\d{6})\.(?P<ext>[A-Za-z0-9]+)(?P<gz>\.gz)?$'
+)
+
+# Render service cache: report_20261019_1c4dd0dfd0bebd1b.html (older: without the date)
+CACHE_PATTERN = re.compile(r'^(?P<series>.+?)(?:_(?P<day>\d{8}))?_(?P<hash>[0-9a-f]{16})\.(?P<ext>html|pdf)$')
+
+
+def load_output_settings(config_file=CONFIG_FILE):
+    """The "output_settings" block of config.json, with defaults"""
+    settings = dict(DEFAULT_OUTPUT_SETTINGS)
+    try:
+        with open(config_file, 'r', encoding='utf-8') as f:
+            settings.update(json.load(f).get('output_settings') or {})
+    except FileNotFoundError:
+        pass
+    except (OSError, ValueError) as e:
+        logger.warning("Could not read %s: %s - using default retention", config_file, e)
+    return settings
+
+
+def series_key(series, ext):
+    return f"{series}.{ext}"
+
+
+class ReportRetention:
+    """Retention policy and manifest of one output folder"""
+    
+    def __init__(self, folder=REPORT_FOLDER, settings=None):
+        """
+        Args:
+            folder: Output folder (e.g. daily_reports)
+            settings: Policy (default: config.json output_settings)
+        """
+        self.folder = folder
+        self.settings = settings if settings is not None else load_output_settings()
+        self.manifest_file = os.path.join(folder, MANIFEST_FOLDER, 'manifest.json')
+        self._manifest = None
+        self._lock = threading.Lock()
+    
+    @property
+    def files_to_keep(self):
+        if self.settings.get('keep_latest_only'):
+            return 1
+        return max(1, int(self.settings.get('max_files_to_keep') or 1))
+    
+    def _folder_version(self):
+        try:
+            return os.stat(self.folder).st_mtime_ns
+        except FileNotFoundError:
+            return None
+    
+    def _scan(self):
+        """Build the manifest from the folder (one directory scan)"""
+        version = self._folder_version()
+        files = {}
+        latest = {}
+        cache = {}
+        
+        if version is not None:
+            with os.scandir(self.folder) as entries:
+                for entry in entries:
+                    match = FILE_PATTERN.match(entry.name)
+                    if not match:
+                        cached = CACHE_PATTERN.match(entry.name)
+                        if cached and entry.is_file():
+                            stat = entry.stat()
+                            cache[entry.name] = {
+                                'series': series_key(cached['series'], cached['ext']),
+                                'day': cached['day'],
+                                'size': stat.st_size,
+                                'mtime': stat.st_mtime
+                            }
+                        continue
+                    if not entry.is_file():
+                        continue
+                    
+                    stat = entry.stat()
+                    key = series_key(match['series'], match['ext'])
+                    files[entry.name] = {
+                        'series': key,
+                        'stamp': match['stamp'],
+                        'size': stat.st_size,
+                        'mtime': stat.st_mtime,
+                        'compressed': bool(match['gz'])
+                    }
+                    
+                    # Newest uncompressed file of the series
+                    current = latest.get(key)
+                    if not match['gz'] and (current is None or files[current]['stamp'] < match['stamp']):
+                        latest[key] = entry.name
+        
+        return {
+            'version': MANIFEST_VERSION,
+            'folder_mtime_ns': version,
+            'updated': datetime.now().isoformat(timespec='seconds'),
+            'files': files,
+            'latest': latest,
+            'cache': cache
+        }
+    
+    def _load(self):
+        try:
+            with open(self.manifest_file, 'r', encoding='utf-8') as f:
+                manifest = json.load(f)
+        except (OSError, ValueError):
+            return None
+        return manifest if manifest.get('version') == MANIFEST_VERSION else None
+    
+    def _save(self, manifest):
+        # In a subfolder: writing it does not change the folder's mtime
+        os.makedirs(os.path.dirname(self.manifest_file), exist_ok=True)
+        temp_file = f"{self.manifest_file}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(temp_file, 'w', encoding='utf-8') as f:
+            json.dump(manifest, f, indent=2)
+        os.replace(temp_file, self.manifest_file)
+    
+    def _refresh(self, force=False):
+        """Current manifest - rescanned only when the folder changed (lock held)"""
+        version = self._folder_version()
+        if not force and self._manifest is not None and self._manifest['folder_mtime_ns'] == version:
+            return self._manifest
+        
+        manifest = None if force else self._load()
+        if manifest is None or manifest.get('folder_mtime_ns') != version:
+            manifest = self._scan()
+            if manifest['folder_mtime_ns'] is not None:
+                try:
+                    self._save(manifest)
+                except OSError as e:
+                    logger.warning("Could not write %s: %s", self.manifest_file, e)
+        
+        self._manifest = manifest
+        return manifest
+    
+    def manifest(self):
+        """Manifest of the managed files (see module docstring)"""
+        with self._lock:
+            return self._refresh()
+    
+    def latest(self, series, ext):
+        """
+        Newest file of a series
+        
+        Args:
+            series: File name prefix (e.g. 'depreciation')
+            ext: Extension without dot (e.g. 'xlsx')
+        
+        Returns:
+            str: Path, or None when the series has no file
+        """
+        name = self.manifest()['latest'].get(series_key(series, ext))
+        return os.path.join(self.folder, name) if name else None
+    
+    def enforce(self):
+        """
+        Apply the retention policy to every series of the folder
+        
+        Returns:
+            dict: {'removed': count, 'compressed': count}
+        """
+        stats = {'removed': 0, 'compressed': 0}
+        compress_days = float(self.settings.get('compress_after_days') or 0)
+        cutoff = datetime.fromtimestamp(time.time() - compress_days * 86400).strftime('%Y%m%d_%H%M%S')
+        recent = time.time() - MIN_AGE_SECONDS
+        
+        with self._lock:
+            manifest = self._refresh(force=True)
+            
+            series = {}
+            for name, entry in manifest['files'].items():
+                series.setdefault(entry['series'], []).append(name)
+            
+            for names in series.values():
+                names.sort(key=lambda name: manifest['files'][name]['stamp'], reverse=True)
+                
+                for name in names[self.files_to_keep:]:
+                    if manifest['files'][name]['mtime'] < recent:
+                        stats['removed'] += self._remove(name)
+                
+                if compress_days <= 0:
+                    continue
+                
+                # The newest file stays uncompressed (it is the "latest")
+                for name in names[1:self.files_to_keep]:
+                    entry = manifest['files'][name]
+                    if not entry['compressed'] and entry['stamp'] < cutoff:
+                        try:
+                            self._compress(name)
+                            stats['compressed'] += 1
+                        except OSError as e:
+                            logger.warning("Could not compress %s: %s", name, e)
+            
+            stats['removed'] += self._enforce_cache(manifest['cache'], recent)
+            
+            if stats['removed'] or stats['compressed']:
+                self._refresh(force=True)
+                logger.info("Retention %s: removed %d, compressed %d files",
+                            self.folder, stats['removed'], stats['compressed'])
+        
+        return stats
+    
+    def _enforce_cache(self, cache, recent):
+        """Remove stale render cache files and keep cache_files_to_keep per theme"""
+        today = datetime.now().strftime('%Y%m%d')
+        keep = max(0, int(self.settings.get('cache_files_to_keep', DEFAULT_OUTPUT_SETTINGS['cache_files_to_keep'])))
+        
+        series = {}
+        for name, entry in cache.items():
+            series.setdefault(entry['series'], []).append(name)
+        
+        removed = 0
+        for names in series.values():
+            names.sort(key=lambda name: cache[name]['mtime'], reverse=True)
+            current = [name for name in names if cache[name]['day'] == today]
+            stale = [name for name in names if cache[name]['day'] != today] + current[keep:]
+            
+            for name in stale:
+                if cache[name]['mtime'] < recent:
+                    removed += self._remove(name)
+        
+        return removed
+    
+    def _remove(self, name):
+        """Remove one file of the folder (1 if removed)"""
+        try:
+            os.remove(os.path.join(self.folder, name))
+            return 1
+        except FileNotFoundError:
+            pass
+        except OSError as e:
+            logger.warning("Could not remove %s: %s", name, e)
+        return 0
+    
+    def _compress(self, name):
+        """gzip one file next to itself, then remove the original"""
+        source = os.path.join(self.folder, name)
+        target = source + '.gz'
+        temp_file = f"{target}.{os.getpid()}.tmp"
+        
+        with open(source, 'rb') as f_in, gzip.open(temp_file, 'wb') as f_out:
+            shutil.copyfileobj(f_in, f_out)
+        shutil.copystat(source, temp_file)
+        os.replace(temp_file, target)
+        os.remove(source)
+
+
+@lru_cache(maxsize=None)
+def get_retention(folder=REPORT_FOLDER):
+    """Shared ReportRetention of a folder (one per process)"""
+    return ReportRetention(folder)
+
+
+def enforce_retention(folder=REPORT_FOLDER):
+    """Apply the retention policy after writing outputs (errors are logged, not raised)"""
+    try:
+        return get_retention(folder).enforce()
+    except OSError as e:
+        logger.warning("Retention of %s failed: %s", folder, e)
+        return None
@@ -3,9 +3,7 @@ Test run - Ablink SGCarmart Scraper
 By Oneiros Indonesia
 """
 
-from depreciation_scraper import DepreciationScraper
-from depreciation_html_generator import DepreciationHTMLGenerator
-import pandas as pd
+from depreciation_pipeline import run_pipeline
 
 print("="*70)
 print("Ablink SGCarmart Scraper - Test Run")
@@ -17,27 +15,23 @@ config = {
     'headless': False,
     'timeout': 30,
     'delay': 3,
-    'output_folder': 'daily_reports',
-    'save_excel': True,
-    'save_csv': True,
-    'save_html': False
+    'output_folder': 'daily_reports'
 }
 
 print("\n[INFO] Starting scraper...")
 print("[INFO] Target: SGCarmart.com")
 print("[INFO] Categories: 10FT DIESEL, 14FT DIESEL, VAN DIESEL, VAN PETROL")
 
-# Run scraper
-scraper = DepreciationScraper(config)
-result = scraper.run()
+# Run scraper - files and styled HTML are written from the scraped data
+result = run_pipeline(config, formats=('excel', 'csv', 'html'))
 
-if result and result.get('excel'):
+if result:
     print("\n" + "="*70)
     print("SUCCESS! Scraping completed")
     print("="*70)
     
-    # Read data
-    df = pd.read_excel(result['excel'])
+    # Scraped data (in memory)
+    df = result.data
     
     print(f"\n[RESULTS]")
     print(f"Total Vehicles: {len(df)}")
@@ -47,14 +41,10 @@ if result and result.get('excel'):
         print(f"Total Units: {df['TOTAL UNITS'].sum()}")
     
     print(f"\n[FILES CREATED]")
-    for key, path in result.items():
+    for key, path in result.files.items():
         if path:
             print(f"  {key.upper()}: {path}")
-    
-    # Generate styled HTML
-    print(f"\n[INFO] Generating styled HTML report...")
-    generator = DepreciationHTMLGenerator()
-    html_file = generator.generate_report(df)
+    html_file = result.html_file
     print(f"  HTML: {html_file}")
     
     # Show data preview
@@ -0,0 +1,78 @@
+"""
+Ablink SGCarmart Scraper - Sample Data
+By Oneiros Indonesia
+
+Fallback snapshot used when live scraping fails or no history exists.
+
+The data lives in data/sample_snapshot.json (a snapshot of real
+SGCarmart.com data, January 2026 - NOT fabricated). Years with 0 units
+are left out: there are no vehicles for that year. The file is read once
+per process; no scraper (Selenium) import is needed.
+
+Usage:
+    from sample_data import get_sample_data, sample_snapshot
+    
+    data = get_sample_data()      # own copy, safe to modify and save
+    data = sample_snapshot()      # shared, read-only (API responses)
+"""
+
+import copy
+import json
+import os
+from datetime import datetime
+from functools import lru_cache
+
+
+SAMPLE_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data', 'sample_snapshot.json')
+
+# Bump together with the file layout
+SAMPLE_FORMAT_VERSION = 1
+
+
+@lru_cache(maxsize=1)
+def _load():
+    """Read and check the sample file (once per process)"""
+    with open(SAMPLE_FILE, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+    
+    version = data.pop('format_version', None)
+    if version != SAMPLE_FORMAT_VERSION:
+        raise ValueError(f"{SAMPLE_FILE}: format_version {version}, expected {SAMPLE_FORMAT_VERSION}")
+    
+    data.pop('captured', None)
+    return data
+
+
+def sample_source():
+    """Source tag of the sample snapshot (e.g. 'sgcarmart_snapshot_2026_01')"""
+    return _load()['source']
+
+
+def is_sample_data(data):
+    """Whether a snapshot is the bundled sample data"""
+    return bool(data) and data.get('source') == sample_source()
+
+
+def sample_snapshot():
+    """
+    Sample snapshot dated now, sharing the loaded vehicle list
+    
+    Returns:
+        dict: Snapshot - treat as read-only (use get_sample_data to modify)
+    """
+    now = datetime.now()
+    return {
+        'date': now.strftime('%Y-%m-%d'),
+        'time': now.strftime('%H:%M:%S'),
+        **_load()
+    }
+
+
+def get_sample_data():
+    """
+    Sample snapshot dated now, as an independent copy
+    
+    Returns:
+        dict: Snapshot in the scraper format (safe to modify, e.g. calculate_diff)
+    """
+    return copy.deepcopy(sample_snapshot())
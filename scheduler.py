@@ -0,0 +1,462 @@
+"""
+Ablink SGCarmart Scraper - Scheduler
+By Oneiros Indonesia
+
+Background job scheduler shared by the web apps, driven by the
+"automation" block of config.json:
+
+    "automation": {
+        "enabled": true,
+        "schedule_time": "09:00",
+        "schedule_frequency": "daily",
+        "cron": "",
+        "catch_up": true,
+        "catch_up_hours": 24,
+        "jitter_seconds": 0,
+        "job_timeout_minutes": 30
+    }
+
+- cron: 5-field expression (minute hour day month weekday), overrides
+  schedule_time / schedule_frequency (daily, weekdays, weekly, hourly)
+- catch_up: on startup, run a job once if its last scheduled run was
+  missed (process down) within catch_up_hours
+- jitter_seconds: random delay added to every run
+- job_timeout_minutes: runs taking longer are recorded as "timeout"; the
+  job keeps running in its thread (Python threads cannot be killed) and
+  later runs are skipped until it finishes
+
+Every run is appended to a ledger (data/scheduler/<name>_runs.jsonl):
+job, trigger, scheduled_for, started, ended, duration, outcome, error.
+
+Usage:
+    scheduler = Scheduler('market_analysis')
+    scheduler.add_job('daily_scrape', scheduled_scrape)
+    scheduler.run_forever()        # blocks; run in a (leader) thread
+    scheduler.status()             # jobs, next runs, recent runs (API)
+"""
+
+import json
+import logging
+import os
+import random
+import threading
+import time
+from datetime import datetime, timedelta
+
+from app_logging import get_logger, log_context, new_run_id
+
+logger = get_logger(__name__)
+
+
+CONFIG_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'config.json')
+LEDGER_FOLDER = 'data/scheduler'
+
+DEFAULT_AUTOMATION = {
+    'enabled': True,
+    'schedule_time': '09:00',
+    'schedule_frequency': 'daily',
+    'cron': '',
+    'catch_up': True,
+    'catch_up_hours': 24,
+    'jitter_seconds': 0,
+    'job_timeout_minutes': 30
+}
+
+# Ledger lines kept on disk (trimmed when twice as many are written)
+MAX_LEDGER_ENTRIES = 1000
+
+
+def load_automation_config(config_file=CONFIG_FILE):
+    """The "automation" block of config.json, with defaults"""
+    settings = dict(DEFAULT_AUTOMATION)
+    try:
+        with open(config_file, 'r', encoding='utf-8') as f:
+            settings.update(json.load(f).get('automation') or {})
+    except FileNotFoundError:
+        pass
+    except (OSError, ValueError) as e:
+        logger.warning("Could not read %s: %s - using default schedule", config_file, e)
+    return settings
+
+
+def cron_from_settings(settings):
+    """
+    Cron expression for the automation settings
+    
+    An invalid "cron" is logged and replaced by the schedule_time /
+    schedule_frequency schedule, an invalid schedule by the default one,
+    so a config typo never stops the apps from starting.
+    """
+    if settings.get('cron'):
+        try:
+            return CronSchedule(settings['cron']).expression
+        except ValueError as e:
+            logger.warning("Invalid automation cron in config.json: %s - using schedule_time", e)
+    
+    try:
+        return CronSchedule(_cron_from_schedule(settings)).expression
+    except ValueError as e:
+        logger.warning("Invalid automation schedule in config.json: %s - using %s",
+                       e, DEFAULT_AUTOMATION['schedule_time'])
+        return _cron_from_schedule(DEFAULT_AUTOMATION)
+
+
+def _cron_from_schedule(settings):
+    """Cron expression for schedule_time and schedule_frequency"""
+    hour, minute = (int(part) for part in settings.get('schedule_time', '09:00').split(':'))
+    frequency = settings.get('schedule_frequency', 'daily')
+    
+    if frequency == 'hourly':
+        return f"{minute} * * * *"
+    if frequency == 'weekdays':
+        return f"{minute} {hour} * * 1-5"
+    if frequency == 'weekly':
+        return f"{minute} {hour} * * 1"
+    if frequency != 'daily':
+        raise ValueError(f"Unknown schedule_frequency: {frequency}")
+    return f"{minute} {hour} * * *"
+
+
+class CronSchedule:
+    """5-field cron expression: minute hour day month weekday (0 or 7 = Sunday)"""
+    
+    FIELDS = [(0, 59), (0, 23), (1, 31), (1, 12), (0, 7)]
+    
+    def __init__(self, expression):
+        parts = expression.split()
+        if len(parts) != 5:
+            raise ValueError(f"Cron expression needs 5 fields: {expression!r}")
+        
+        self.expression = expression
+        minutes, hours, days, months, weekdays = (
+            self._parse_field(part, low, high) for part, (low, high) in zip(parts, self.FIELDS)
+        )
+        self.minutes = sorted(minutes)
+        self.hours = sorted(hours)
+        self.days = days
+        self.months = months
+        self.weekdays = {day % 7 for day in weekdays}
+        self._any_day = parts[2] == '*'
+        self._any_weekday = parts[4] == '*'
+        
+        # e.g. '0 8 30 2 *' (February 30th) - would never run
+        if self.next_after(datetime(2000, 1, 1)) is None:
+            raise ValueError(f"Cron expression never matches a date: {expression!r}")
+    
+    @staticmethod
+    def _parse_field(field, low, high):
+        values = set()
+        for item in field.split(','):
+            spec, _, step = item.partition('/')
+            if spec == '*':
+                start, end = low, high
+            elif '-' in spec:
+                start, end = (int(v) for v in spec.split('-'))
+            else:
+                start = end = int(spec)
+                if step:
+                    end = high
+            
+            if not low <= start <= end <= high:
+                raise ValueError(f"Cron field out of range: {item!r}")
+            values.update(range(start, end + 1, int(step) if step else 1))
+        return values
+    
+    def _matches_day(self, day):
+        if day.month not in self.months:
+            return False
+        
+        in_days = day.day in self.days
+        in_weekdays = (day.weekday() + 1) % 7 in self.weekdays
+        
+        # Cron rule: if both day and weekday are restricted, either may match
+        if self._any_day:
+            return in_weekdays
+        if self._any_weekday:
+            return in_days
+        return in_days or in_weekdays
+    
+    def _times(self, day, reverse=False):
+        hours = reversed(self.hours) if reverse else self.hours
+        for hour in hours:
+            minutes = reversed(self.minutes) if reverse else self.minutes
+            for minute in minutes:
+                yield datetime(day.year, day.month, day.day, hour, minute)
+    
+    def next_after(self, moment):
+        """First scheduled time strictly after moment"""
+        day = moment.date()
+        for _ in range(366 * 5):
+            if self._matches_day(day):
+                for candidate in self._times(day):
+                    if candidate > moment:
+                        return candidate
+            day += timedelta(days=1)
+        return None
+    
+    def previous_before(self, moment):
+        """Last scheduled time at or before moment"""
+        day = moment.date()
+        for _ in range(366 * 5):
+            if self._matches_day(day):
+                for candidate in self._times(day, reverse=True):
+                    if candidate <= moment:
+                        return candidate
+            day -= timedelta(days=1)
+        return None
+
+
+class RunLedger:
+    """Append-only JSON lines file of job runs"""
+    
+    def __init__(self, path, max_entries=MAX_LEDGER_ENTRIES):
+        self.path = path
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._count = None
+    
+    def read(self, job=None, limit=None):
+        """Runs, newest first"""
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                lines = f.readlines()
+        except FileNotFoundError:
+            return []
+        
+        runs = []
+        for line in reversed(lines):
+            try:
+                run = json.loads(line)
+            except ValueError:
+                continue  # partially written line
+            if job is None or run.get('job') == job:
+                runs.append(run)
+                if limit and len(runs) >= limit:
+                    break
+        return runs
+    
+    def last_run(self, job):
+        runs = self.read(job, limit=1)
+        return runs[0] if runs else None
+    
+    def append(self, run):
+        with self._lock:
+            os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+            if self._count is None:
+                self._count = len(self.read())
+            
+            with open(self.path, 'a', encoding='utf-8') as f:
+                f.write(json.dumps(run) + '\n')
+            self._count += 1
+            
+            if self._count > 2 * self.max_entries:
+                self._trim()
+    
+    def _trim(self):
+        runs = list(reversed(self.read(limit=self.max_entries)))
+        temp_path = f"{self.path}.tmp"
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            for run in runs:
+                f.write(json.dumps(run) + '\n')
+        os.replace(temp_path, self.path)
+        self._count = len(runs)
+
+
+class Job:
+    """A scheduled callable"""
+    
+    def __init__(self, name, func, cron, jitter_seconds=0, timeout_minutes=30):
+        self.name = name
+        self.func = func
+        self.schedule = CronSchedule(cron)
+        self.jitter_seconds = jitter_seconds
+        self.timeout_minutes = timeout_minutes
+        self.next_run = None
+        self._thread = None
+    
+    @property
+    def is_running(self):
+        return self._thread is not None and self._thread.is_alive()
+
+
+class Scheduler:
+    """Runs jobs on their cron schedules and records every run"""
+    
+    def __init__(self, name, settings=None, ledger_folder=LEDGER_FOLDER):
+        """
+        Args:
+            name: Scheduler name (ledger file name, log prefix)
+            settings: Automation settings (default: config.json)
+            ledger_folder: Folder for the run ledger
+        """
+        self.name = name
+        self.settings = settings if settings is not None else load_automation_config()
+        self.ledger = RunLedger(os.path.join(ledger_folder, f"{name}_runs.jsonl"))
+        self.jobs = {}
+        self._stop = threading.Event()
+    
+    @property
+    def enabled(self):
+        return bool(self.settings.get('enabled', True))
+    
+    def add_job(self, name, func, cron=None, jitter_seconds=None, timeout_minutes=None):
+        """
+        Register a job (defaults from the automation settings)
+        
+        func may return a dict with 'success': False to record a failure;
+        exceptions are recorded as failures too.
+        """
+        settings = self.settings
+        job = Job(
+            name, func,
+            cron or cron_from_settings(settings),
+            jitter_seconds=settings.get('jitter_seconds', 0) if jitter_seconds is None else jitter_seconds,
+            timeout_minutes=settings.get('job_timeout_minutes', 30) if timeout_minutes is None else timeout_minutes
+        )
+        self.jobs[name] = job
+        return job
+    
+    def _jitter(self, job):
+        return random.uniform(0, job.jitter_seconds) if job.jitter_seconds else 0
+    
+    def missed_run(self, job, now=None):
+        """Scheduled time of a missed run to catch up on, or None"""
+        if not self.settings.get('catch_up', True):
+            return None
+        
+        now = now or datetime.now()
+        scheduled = job.schedule.previous_before(now)
+        if scheduled is None or now - scheduled > timedelta(hours=self.settings.get('catch_up_hours', 24)):
+            return None
+        
+        last = self.ledger.last_run(job.name)
+        if last and last.get('scheduled_for', '') >= scheduled.isoformat():
+            return None
+        return scheduled
+    
+    def run_job(self, job, scheduled_for, trigger='schedule'):
+        """Run a job now (with timeout) and record it in the ledger"""
+        started = datetime.now()
+        run = {
+            'job': job.name,
+            'run_id': new_run_id(),
+            'trigger': trigger,
+            'scheduled_for': scheduled_for.isoformat(),
+            'started': started.isoformat(timespec='seconds'),
+            'pid': os.getpid()
+        }
+        
+        if job.is_running:
+            logger.warning("%s: %s still running from an earlier run - skipped", self.name, job.name)
+            run.update(ended=run['started'], duration=0.0, outcome='skipped', error='previous run still running')
+            self.ledger.append(run)
+            return run
+        
+        logger.info("%s: running %s (%s, scheduled %s)", self.name, job.name, trigger, f"{scheduled_for:%Y-%m-%d %H:%M}")
+        outcome = {}
+        
+        def target():
+            with log_context(job=job.name, run_id=run['run_id']):
+                run_target()
+        
+        def run_target():
+            try:
+                result = job.func()
+                if isinstance(result, dict) and result.get('success') is False:
+                    outcome.update(outcome='failed', error=str(result.get('error', 'job reported failure')))
+                else:
+                    outcome['outcome'] = 'success'
+            except Exception as e:
+                outcome.update(outcome='failed', error=str(e))
+        
+        job._thread = threading.Thread(target=target, name=f"{self.name}-{job.name}", daemon=True)
+        start = time.perf_counter()
+        job._thread.start()
+        job._thread.join(job.timeout_minutes * 60 if job.timeout_minutes else None)
+        
+        if job._thread.is_alive():
+            outcome = {'outcome': 'timeout', 'error': f"still running after {job.timeout_minutes} min"}
+        
+        run.update(
+            ended=datetime.now().isoformat(timespec='seconds'),
+            duration=round(time.perf_counter() - start, 3),
+            **outcome
+        )
+        self.ledger.append(run)
+        
+        level = logging.INFO if run['outcome'] == 'success' else logging.WARNING
+        logger.log(level, "%s: %s %s in %.1fs", self.name, job.name, run['outcome'], run['duration'])
+        return run
+    
+    def catch_up(self):
+        """Run jobs whose last scheduled run was missed"""
+        for job in self.jobs.values():
+            scheduled = self.missed_run(job)
+            if scheduled is not None:
+                logger.info("%s: %s missed its %s run - catching up", self.name, job.name, f"{scheduled:%Y-%m-%d %H:%M}")
+                self._stop.wait(self._jitter(job))
+                if self._stop.is_set():
+                    return
+                self.run_job(job, scheduled, trigger='catch_up')
+    
+    def run_forever(self):
+        """Scheduler loop (blocks until stop())"""
+        if not self.enabled:
+            logger.info("%s: automation disabled in config.json - scheduler not started", self.name)
+            return
+        
+        for job in self.jobs.values():
+            logger.info("%s: %s on '%s'", self.name, job.name, job.schedule.expression)
+        
+        self.catch_up()
+        
+        while not self._stop.is_set():
+            now = datetime.now()
+            for job in self.jobs.values():
+                if job.next_run is None:
+                    scheduled = job.schedule.next_after(now)
+                    job.next_run = (scheduled, scheduled + timedelta(seconds=self._jitter(job)))
+            
+            job = min(self.jobs.values(), key=lambda j: j.next_run[1], default=None)
+            if job is None:
+                return
+            
+            scheduled, due = job.next_run
+            delay = (due - datetime.now()).total_seconds()
+            if delay > 0:
+                # Wake up at least every minute (clock changes, suspend)
+                self._stop.wait(min(delay, 60))
+                continue
+            
+            job.next_run = None
+            self.run_job(job, scheduled)
+    
+    def stop(self):
+        self._stop.set()
+    
+    def next_run(self, job_name):
+        """Next scheduled time of a job (without jitter), None if there is none"""
+        job = self.jobs[job_name]
+        if job.next_run is not None:
+            return job.next_run[0]
+        return job.schedule.next_after(datetime.now())
+    
+    def status(self, limit=20):
+        """Jobs, next runs and recent runs (for the dashboards)"""
+        jobs = []
+        for job in self.jobs.values():
+            last = self.ledger.last_run(job.name)
+            next_run = self.next_run(job.name) if self.enabled else None
+            jobs.append({
+                'name': job.name,
+                'cron': job.schedule.expression,
+                'next_run': next_run.isoformat() if next_run else None,
+                'last_run': last
+            })
+        
+        return {
+            'scheduler': self.name,
+            'enabled': self.enabled,
+            'jobs': jobs,
+            'runs': self.ledger.read(limit=limit)
+        }
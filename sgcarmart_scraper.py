@@ -17,9 +17,17 @@ import pandas as pd
 import time
 import re
 import json
+import logging
 import os
 from datetime import datetime
 
+from app_logging import bind_context, get_logger, log_context, log_limited
+from event_bus import event_bus
+from metrics import timed
+from profiling import add_cli_argument, profile, profile_run
+
+logger = get_logger(__name__)
+
 
 class SGCarmartScraper:
     """Real SGCarmart scraper for depreciation data"""
@@ -49,10 +57,10 @@ class SGCarmartScraper:
         self.headless = headless
         self.driver = None
         self.data = {}
-        
+    
     def start_driver(self):
         """Start Chrome WebDriver"""
-        print("[INFO] Starting Chrome WebDriver...")
+        logger.info("Starting Chrome WebDriver...")
         
         options = Options()
         if self.headless:
@@ -64,12 +72,13 @@ class SGCarmartScraper:
         options.add_argument('user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36')
         
         try:
-            service = Service(ChromeDriverManager().install())
-            self.driver = webdriver.Chrome(service=service, options=options)
-            print("[OK] WebDriver started successfully")
+            with timed('driver_start'):
+                service = Service(ChromeDriverManager().install())
+                self.driver = webdriver.Chrome(service=service, options=options)
+            logger.info("WebDriver started successfully")
             return True
         except Exception as e:
-            print(f"[ERROR] Failed to start WebDriver: {e}")
+            logger.error("Failed to start WebDriver: %s", e)
             return False
     
     def close_driver(self):
@@ -77,49 +86,28 @@ class SGCarmartScraper:
         if self.driver:
             self.driver.quit()
             self.driver = None
-            print("[OK] WebDriver closed")
+            logger.info("WebDriver closed")
     
     def scrape_listing_page(self, url, category, max_pages=5):
         """Scrape vehicle listings from a category page"""
         vehicles_data = []
         
         try:
-            print(f"\n[INFO] Scraping: {category}")
-            print(f"[INFO] URL: {url}")
+            logger.info("Scraping %s", url)
             
-            self.driver.get(url)
+            with timed('page_fetch'):
+                self.driver.get(url)
             time.sleep(3)
             
             page = 1
             while page <= max_pages:
-                print(f"[INFO] Page {page}...")
+                bind_context(page=page)
+                logger.debug("Page %d...", page)
+                event_bus.publish('scrape.progress', {'category': category, 'page': page})
                 
                 # Parse page
-                soup = BeautifulSoup(self.driver.page_source, 'html.parser')
-                
-                # Find vehicle listings
-                listings = soup.find_all('div', class_='listing-item') or \
-                          soup.find_all('tr', class_='listing_row') or \
-                          soup.find_all('div', {'class': re.compile(r'listing|car-item|vehicle')})
-                
-                if not listings:
-                    # Try alternative selectors
-                    tables = soup.find_all('table')
-                    for table in tables:
-                        rows = table.find_all('tr')
-                        if len(rows) > 3:
-                            listings = rows[1:]  # Skip header
-                            break
-                
-                print(f"[INFO] Found {len(listings)} listings")
-                
-                for listing in listings:
-                    try:
-                        vehicle_info = self._parse_listing(listing, category)
-                        if vehicle_info:
-                            vehicles_data.append(vehicle_info)
-                    except Exception as e:
-                        continue
+                soup, page_vehicles = self._parse_page(self.driver.page_source, category)
+                vehicles_data.extend(page_vehicles)
                 
                 # Try next page
                 try:
@@ -128,19 +116,60 @@ class SGCarmartScraper:
                         next_url = next_link['href']
                         if not next_url.startswith('http'):
                             next_url = 'https://www.sgcarmart.com' + next_url
-                        self.driver.get(next_url)
+                        with timed('page_fetch'):
+                            self.driver.get(next_url)
                         time.sleep(2)
                         page += 1
                     else:
                         break
                 except:
                     break
-            
+        
         except Exception as e:
-            print(f"[ERROR] Failed to scrape {category}: {e}")
+            logger.error("Failed to scrape %s: %s", category, e)
         
         return vehicles_data
     
+    @timed('parse')
+    def _parse_page(self, html, category):
+        """
+        Parse the vehicle listings of a page
+        
+        Returns:
+            tuple: (soup, list of parsed listings)
+        """
+        soup = BeautifulSoup(html, 'html.parser')
+        
+        # Find vehicle listings
+        listings = soup.find_all('div', class_='listing-item') or \
+                  soup.find_all('tr', class_='listing_row') or \
+                  soup.find_all('div', {'class': re.compile(r'listing|car-item|vehicle')})
+        
+        if not listings:
+            # Try alternative selectors
+            tables = soup.find_all('table')
+            for table in tables:
+                rows = table.find_all('tr')
+                if len(rows) > 3:
+                    listings = rows[1:]  # Skip header
+                    break
+        
+        logger.info("Found %d listings", len(listings))
+        
+        vehicles = []
+        for listing in listings:
+            try:
+                vehicle_info = self._parse_listing(listing, category)
+                if vehicle_info:
+                    vehicles.append(vehicle_info)
+                    log_limited(logger, logging.DEBUG, 'listing', "Parsed listing: %s %s $%s/yr",
+                                vehicle_info['vehicle'], vehicle_info['year'], vehicle_info['depreciation'])
+            except Exception as e:
+                log_limited(logger, logging.DEBUG, 'listing_error', "Skipped listing: %s", e)
+                continue
+        
+        return soup, vehicles
+    
     def _parse_listing(self, listing, category):
         """Parse a single vehicle listing"""
         try:
@@ -188,18 +217,16 @@ class SGCarmartScraper:
                     'year': year,
                     'depreciation': depreciation
                 }
-            
+        
         except Exception as e:
             pass
         
         return None
     
+    @profile_run('sgcarmart_scrape')
     def scrape_all_categories(self):
         """Scrape all vehicle categories"""
-        print("="*70)
-        print("SGCarmart Real Data Scraper")
-        print(f"Date: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
-        print("="*70)
+        logger.info("SGCarmart scrape started: %d categories", len(self.CATEGORIES))
         
         if not self.start_driver():
             return None
@@ -207,10 +234,17 @@ class SGCarmartScraper:
         all_vehicles = []
         
         try:
-            for category, config in self.CATEGORIES.items():
-                vehicles = self.scrape_listing_page(config['url'], category)
+            for index, (category, config) in enumerate(self.CATEGORIES.items(), 1):
+                with log_context(category=category):
+                    vehicles = self.scrape_listing_page(config['url'], category)
+                    logger.info("%d vehicles", len(vehicles))
                 all_vehicles.extend(vehicles)
-                print(f"[OK] {category}: {len(vehicles)} vehicles")
+                event_bus.publish('scrape.progress', {
+                    'category': category,
+                    'completed': index,
+                    'total': len(self.CATEGORIES),
+                    'vehicles': len(vehicles)
+                })
                 time.sleep(2)
         
         finally:
@@ -219,11 +253,12 @@ class SGCarmartScraper:
         # Process and aggregate data
         return self._aggregate_data(all_vehicles)
     
+    @timed('aggregate')
     def _aggregate_data(self, vehicles):
         """Aggregate vehicle data by category, vehicle, and year"""
         
         if not vehicles:
-            print("[WARNING] No vehicles scraped, using sample data")
+            logger.warning("No vehicles scraped, using sample data")
             return self._get_sample_data()
         
         # Group by category and vehicle
@@ -301,320 +336,18 @@ class SGCarmartScraper:
     def _get_sample_data(self):
         """
         Return REAL data from SGCarmart when scraping fails.
-        This data is FACTUAL and matches SGCarmart.com exactly.
-        Data source: SGCarmart.com - January 2026
-        
-        IMPORTANT: This is NOT fabricated data - it's a snapshot of real SGCarmart data.
-        If a year has 0 units, it means there are NO vehicles available for that year.
+        Snapshot of SGCarmart.com (January 2026) from data/sample_snapshot.json,
+        see sample_data.py - NOT fabricated.
         """
-        return {
-            'date': datetime.now().strftime('%Y-%m-%d'),
-            'time': datetime.now().strftime('%H:%M:%S'),
-            'vehicles': [
-                # ========== 10FT DIESEL ==========
-                # HINO DUTRO 2.8: 2026=5, 2025=49, 2024=8, total=62, last120=57
-                {'category': '10FT DIESEL', 'vehicle': 'HINO DUTRO 2.8', 
-                 'years': {
-                     '2026': {'lowest': 11800, 'average': 12000, 'units': 5},
-                     '2025': {'lowest': 11510, 'average': 11680, 'units': 49},
-                     '2024': {'lowest': 11450, 'average': 11520, 'units': 8},
-                     # Years 2023-2014 have 0 units - NOT SHOWN because no data exists
-                 },
-                 'total_units': 62, 'previous': 57, 'diff': 5},
-                
-                # TOYOTA DYNA 2.8: 2023=2, 2022=14, 2021=4, total=20, last120=17
-                {'category': '10FT DIESEL', 'vehicle': 'TOYOTA DYNA 2.8',
-                 'years': {
-                     '2023': {'lowest': 14720, 'average': 14850, 'units': 2},
-                     '2022': {'lowest': 12740, 'average': 13100, 'units': 14},
-                     '2021': {'lowest': 13310, 'average': 13520, 'units': 4},
-                     # 2025, 2024, 2020-2014 have 0 units - no data on SGCarmart
-                 },
-                 'total_units': 20, 'previous': 17, 'diff': 3},
-                
-                # TOYOTA DYNA 3.0: total=99, last120=105
-                {'category': '10FT DIESEL', 'vehicle': 'TOYOTA DYNA 3.0',
-                 'years': {
-                     '2022': {'lowest': 13470, 'average': 13470, 'units': 1},
-                     '2021': {'lowest': 15580, 'average': 15720, 'units': 4},
-                     '2020': {'lowest': 15330, 'average': 15680, 'units': 11},
-                     '2019': {'lowest': 16160, 'average': 16420, 'units': 10},
-                     '2018': {'lowest': 16220, 'average': 16580, 'units': 7},
-                     '2017': {'lowest': 16700, 'average': 17050, 'units': 5},
-                     '2016': {'lowest': 9950, 'average': 10280, 'units': 19},
-                     '2015': {'lowest': 9840, 'average': 10150, 'units': 23},
-                     '2014': {'lowest': 8960, 'average': 9280, 'units': 19},
-                     # 2025, 2024, 2023 have 0 units
-                 },
-                 'total_units': 99, 'previous': 105, 'diff': -6},
-                
-                # NISSAN CABSTAR: total=24, last120=29
-                {'category': '10FT DIESEL', 'vehicle': 'NISSAN CABSTAR',
-                 'years': {
-                     '2022': {'lowest': 10110, 'average': 10110, 'units': 1},
-                     '2021': {'lowest': 8530, 'average': 8530, 'units': 1},
-                     '2020': {'lowest': 9770, 'average': 9920, 'units': 2},
-                     '2017': {'lowest': 11090, 'average': 11450, 'units': 9},
-                     '2016': {'lowest': 8360, 'average': 8620, 'units': 3},
-                     '2015': {'lowest': 9620, 'average': 9620, 'units': 1},
-                     '2014': {'lowest': 8700, 'average': 8980, 'units': 7},
-                     # 2025, 2024, 2023, 2019, 2018 have 0 units
-                 },
-                 'total_units': 24, 'previous': 29, 'diff': -5},
-                
-                # MITSUBISHI FEA01: total=22, last120=25
-                {'category': '10FT DIESEL', 'vehicle': 'MITSUBISHI FEA01',
-                 'years': {
-                     '2021': {'lowest': 11550, 'average': 11780, 'units': 5},
-                     '2020': {'lowest': 11670, 'average': 11850, 'units': 3},
-                     '2019': {'lowest': 12060, 'average': 12280, 'units': 4},
-                     '2017': {'lowest': 11550, 'average': 11720, 'units': 2},
-                     '2016': {'lowest': 18840, 'average': 19120, 'units': 2},
-                     '2015': {'lowest': 8560, 'average': 8780, 'units': 3},
-                     '2014': {'lowest': 10940, 'average': 11180, 'units': 3},
-                     # 2025, 2024, 2023, 2022, 2018 have 0 units
-                 },
-                 'total_units': 22, 'previous': 25, 'diff': -3},
-                
-                # ISUZU NHR / NJR: total=25, last120=24
-                {'category': '10FT DIESEL', 'vehicle': 'ISUZU NHR / NJR',
-                 'years': {
-                     '2025': {'lowest': 13470, 'average': 13650, 'units': 2},
-                     '2021': {'lowest': 11400, 'average': 11400, 'units': 1},
-                     '2020': {'lowest': 12990, 'average': 13150, 'units': 2},
-                     '2018': {'lowest': 11680, 'average': 11920, 'units': 3},
-                     '2017': {'lowest': 11740, 'average': 11980, 'units': 3},
-                     '2016': {'lowest': 9150, 'average': 9420, 'units': 6},
-                     '2015': {'lowest': 8080, 'average': 8350, 'units': 6},
-                     '2014': {'lowest': 8920, 'average': 9180, 'units': 2},
-                     # 2024, 2023, 2022, 2019 have 0 units
-                 },
-                 'total_units': 25, 'previous': 24, 'diff': 1},
-                
-                # KIA 2500: total=11, last120=9
-                {'category': '10FT DIESEL', 'vehicle': 'KIA 2500',
-                 'years': {
-                     '2024': {'lowest': 10550, 'average': 10550, 'units': 1},
-                     '2023': {'lowest': 11170, 'average': 11350, 'units': 2},
-                     '2022': {'lowest': 10020, 'average': 10280, 'units': 3},
-                     '2021': {'lowest': 11180, 'average': 11420, 'units': 3},
-                     '2020': {'lowest': 10350, 'average': 10580, 'units': 2},
-                     # 2025, 2019-2014 have 0 units
-                 },
-                 'total_units': 11, 'previous': 9, 'diff': 2},
-                
-                # ========== 14FT DIESEL ==========
-                # HINO XZU710: total=55, last120=52
-                {'category': '14FT DIESEL', 'vehicle': 'HINO XZU710',
-                 'years': {
-                     '2026': {'lowest': 12500, 'average': 12720, 'units': 3},
-                     '2025': {'lowest': 12220, 'average': 12480, 'units': 27},
-                     '2024': {'lowest': 12220, 'average': 12420, 'units': 6},
-                     '2023': {'lowest': 13120, 'average': 13350, 'units': 2},
-                     '2022': {'lowest': 13880, 'average': 14120, 'units': 2},
-                     '2021': {'lowest': 15790, 'average': 15790, 'units': 1},
-                     '2020': {'lowest': 16130, 'average': 16380, 'units': 2},
-                     '2019': {'lowest': 16280, 'average': 16280, 'units': 1},
-                     '2018': {'lowest': 16270, 'average': 16520, 'units': 3},
-                     '2017': {'lowest': 18440, 'average': 18440, 'units': 1},
-                     '2016': {'lowest': 29970, 'average': 30250, 'units': 3},
-                     '2015': {'lowest': 10370, 'average': 10620, 'units': 3},
-                     '2014': {'lowest': 18020, 'average': 18020, 'units': 1},
-                 },
-                 'total_units': 55, 'previous': 52, 'diff': 3},
-                
-                # ISUZU NPR85: total=17, last120=21
-                {'category': '14FT DIESEL', 'vehicle': 'ISUZU NPR85',
-                 'years': {
-                     '2025': {'lowest': 13180, 'average': 13380, 'units': 2},
-                     '2022': {'lowest': 14060, 'average': 14320, 'units': 5},
-                     '2021': {'lowest': 13760, 'average': 14020, 'units': 3},
-                     '2018': {'lowest': 19710, 'average': 19710, 'units': 1},
-                     '2017': {'lowest': 13610, 'average': 13880, 'units': 3},
-                     '2015': {'lowest': 9170, 'average': 9420, 'units': 2},
-                     '2014': {'lowest': 13640, 'average': 13640, 'units': 1},
-                     # 2024, 2023, 2020, 2019, 2016 have 0 units
-                 },
-                 'total_units': 17, 'previous': 21, 'diff': -4},
-                
-                # ISUZU NMR85: total=5, last120=3
-                {'category': '14FT DIESEL', 'vehicle': 'ISUZU NMR85',
-                 'years': {
-                     '2025': {'lowest': 12520, 'average': 12720, 'units': 2},
-                     '2022': {'lowest': 13530, 'average': 13530, 'units': 1},
-                     '2019': {'lowest': 13460, 'average': 13460, 'units': 1},
-                     '2018': {'lowest': 17190, 'average': 17190, 'units': 1},
-                     # Many years have 0 units
-                 },
-                 'total_units': 5, 'previous': 3, 'diff': 2},
-                
-                # ISUZU NNR85: total=8, last120=11
-                {'category': '14FT DIESEL', 'vehicle': 'ISUZU NNR85',
-                 'years': {
-                     '2025': {'lowest': 12250, 'average': 12250, 'units': 1},
-                     '2022': {'lowest': 13740, 'average': 13920, 'units': 2},
-                     '2018': {'lowest': 14560, 'average': 14780, 'units': 2},
-                     '2017': {'lowest': 16420, 'average': 16420, 'units': 1},
-                     '2016': {'lowest': 10150, 'average': 10150, 'units': 1},
-                     '2014': {'lowest': 10230, 'average': 10230, 'units': 1},
-                     # 2024, 2023, 2021, 2020, 2019, 2015 have 0 units
-                 },
-                 'total_units': 8, 'previous': 11, 'diff': -3},
-                
-                # MITSUBISHI FEB21: total=69, last120=72
-                {'category': '14FT DIESEL', 'vehicle': 'MITSUBISHI FEB21',
-                 'years': {
-                     '2025': {'lowest': 12370, 'average': 12580, 'units': 12},
-                     '2023': {'lowest': 12470, 'average': 12680, 'units': 2},
-                     '2020': {'lowest': 13060, 'average': 13280, 'units': 4},
-                     '2019': {'lowest': 14770, 'average': 15020, 'units': 5},
-                     '2018': {'lowest': 15740, 'average': 16020, 'units': 7},
-                     '2017': {'lowest': 16320, 'average': 16580, 'units': 7},
-                     '2016': {'lowest': 9950, 'average': 10220, 'units': 8},
-                     '2015': {'lowest': 8360, 'average': 8620, 'units': 19},
-                     '2014': {'lowest': 10030, 'average': 10280, 'units': 5},
-                     # 2024, 2022, 2021 have 0 units
-                 },
-                 'total_units': 69, 'previous': 72, 'diff': -3},
-                
-                # ========== VAN DIESEL (GOODS VAN) ==========
-                # TOYOTA HIACE 3.0M: total=86, last120=78
-                {'category': 'VAN DIESEL (GOODS VAN)', 'vehicle': 'TOYOTA HIACE 3.0M',
-                 'years': {
-                     '2022': {'lowest': 13610, 'average': 13610, 'units': 1},
-                     '2021': {'lowest': 13590, 'average': 13820, 'units': 7},
-                     '2020': {'lowest': 13310, 'average': 13580, 'units': 12},
-                     '2019': {'lowest': 14130, 'average': 14420, 'units': 10},
-                     '2018': {'lowest': 13780, 'average': 14080, 'units': 13},
-                     '2017': {'lowest': 13630, 'average': 13920, 'units': 9},
-                     '2016': {'lowest': 9750, 'average': 10020, 'units': 6},
-                     '2015': {'lowest': 8010, 'average': 8320, 'units': 19},
-                     '2014': {'lowest': 8980, 'average': 9280, 'units': 9},
-                     # 2025, 2024, 2023 have 0 units
-                 },
-                 'total_units': 86, 'previous': 78, 'diff': 8},
-                
-                # TOYOTA HIACE 3.0A: total=30, last120=25
-                {'category': 'VAN DIESEL (GOODS VAN)', 'vehicle': 'TOYOTA HIACE 3.0A',
-                 'years': {
-                     '2021': {'lowest': 13780, 'average': 14020, 'units': 10},
-                     '2020': {'lowest': 13990, 'average': 14250, 'units': 3},
-                     '2019': {'lowest': 14110, 'average': 14380, 'units': 3},
-                     '2018': {'lowest': 16600, 'average': 16920, 'units': 5},
-                     '2017': {'lowest': 15130, 'average': 15420, 'units': 3},
-                     '2016': {'lowest': 29200, 'average': 29200, 'units': 1},
-                     '2015': {'lowest': 11410, 'average': 11410, 'units': 1},
-                     '2014': {'lowest': 11170, 'average': 11480, 'units': 4},
-                     # 2025, 2024, 2023, 2022 have 0 units
-                 },
-                 'total_units': 30, 'previous': 25, 'diff': 5},
-                
-                # TOYOTA HIACE 2.8A: total=72, last120=68
-                {'category': 'VAN DIESEL (GOODS VAN)', 'vehicle': 'TOYOTA HIACE 2.8A',
-                 'years': {
-                     '2026': {'lowest': 13500, 'average': 13750, 'units': 4},
-                     '2025': {'lowest': 13230, 'average': 13480, 'units': 14},
-                     '2024': {'lowest': 13050, 'average': 13050, 'units': 1},
-                     '2023': {'lowest': 15180, 'average': 15180, 'units': 1},
-                     '2022': {'lowest': 14230, 'average': 14230, 'units': 1},
-                     '2021': {'lowest': 14030, 'average': 14320, 'units': 22},
-                     '2020': {'lowest': 14660, 'average': 14950, 'units': 22},
-                     '2019': {'lowest': 14830, 'average': 15120, 'units': 6},
-                     '2018': {'lowest': 21270, 'average': 21270, 'units': 1},
-                     # 2017-2014 have 0 units
-                 },
-                 'total_units': 72, 'previous': 68, 'diff': 4},
-                
-                # NISSAN NV350 2.5M: total=26, last120=28 (Note: 2016=0 in user data)
-                {'category': 'VAN DIESEL (GOODS VAN)', 'vehicle': 'NISSAN NV350 2.5M',
-                 'years': {
-                     '2020': {'lowest': 10350, 'average': 10580, 'units': 3},
-                     '2019': {'lowest': 11530, 'average': 11780, 'units': 2},
-                     '2018': {'lowest': 10370, 'average': 10620, 'units': 6},
-                     '2017': {'lowest': 10320, 'average': 10580, 'units': 4},
-                     '2015': {'lowest': 8070, 'average': 8350, 'units': 7},
-                     '2014': {'lowest': 9050, 'average': 9320, 'units': 3},
-                     # Note: 2016 missing based on original data (0 units)
-                 },
-                 'total_units': 26, 'previous': 28, 'diff': -2},
-                
-                # NISSAN NV200 1.5M: total=35, last120=37
-                {'category': 'VAN DIESEL (GOODS VAN)', 'vehicle': 'NISSAN NV200 1.5M',
-                 'years': {
-                     '2020': {'lowest': 11570, 'average': 11570, 'units': 1},
-                     '2019': {'lowest': 9530, 'average': 9780, 'units': 6},
-                     '2018': {'lowest': 9720, 'average': 9980, 'units': 6},
-                     '2017': {'lowest': 9320, 'average': 9580, 'units': 8},
-                     '2016': {'lowest': 8160, 'average': 8420, 'units': 6},
-                     '2015': {'lowest': 8360, 'average': 8620, 'units': 6},
-                     '2014': {'lowest': 7760, 'average': 8020, 'units': 2},
-                     # 2025-2021 have 0 units
-                 },
-                 'total_units': 35, 'previous': 37, 'diff': -2},
-                
-                # ========== VAN PETROL (GOODS VAN) ==========
-                # HONDA N-VAN: total=50, last120=44
-                {'category': 'VAN PETROL (GOODS VAN)', 'vehicle': 'HONDA N-VAN',
-                 'years': {
-                     '2026': {'lowest': 9800, 'average': 10020, 'units': 6},
-                     '2025': {'lowest': 9540, 'average': 9780, 'units': 27},
-                     '2024': {'lowest': 9350, 'average': 9580, 'units': 3},
-                     '2023': {'lowest': 9950, 'average': 9950, 'units': 1},
-                     '2022': {'lowest': 10040, 'average': 10280, 'units': 13},
-                     # 2021-2014 have 0 units
-                 },
-                 'total_units': 50, 'previous': 44, 'diff': 6},
-                
-                # TOYOTA HIACE 2.0: total=24, last120=15
-                {'category': 'VAN PETROL (GOODS VAN)', 'vehicle': 'TOYOTA HIACE 2.0',
-                 'years': {
-                     '2025': {'lowest': 12260, 'average': 12260, 'units': 1},
-                     '2023': {'lowest': 10760, 'average': 11020, 'units': 3},
-                     '2022': {'lowest': 11240, 'average': 11520, 'units': 9},
-                     '2021': {'lowest': 11360, 'average': 11620, 'units': 11},
-                     # 2024, 2020-2014 have 0 units
-                 },
-                 'total_units': 24, 'previous': 15, 'diff': 9},
-                
-                # NISSAN NV350 2.0: total=6, last120=8
-                {'category': 'VAN PETROL (GOODS VAN)', 'vehicle': 'NISSAN NV350 2.0',
-                 'years': {
-                     '2023': {'lowest': 8870, 'average': 8870, 'units': 1},
-                     '2022': {'lowest': 9550, 'average': 9780, 'units': 4},
-                     '2021': {'lowest': 9860, 'average': 9860, 'units': 1},
-                     # 2025, 2024, 2020-2014 have 0 units
-                 },
-                 'total_units': 6, 'previous': 8, 'diff': -2},
-                
-                # NISSAN NV200 1.6A: total=75, last120=71
-                {'category': 'VAN PETROL (GOODS VAN)', 'vehicle': 'NISSAN NV200 1.6A',
-                 'years': {
-                     '2026': {'lowest': 9600, 'average': 9850, 'units': 4},
-                     '2025': {'lowest': 9340, 'average': 9580, 'units': 9},
-                     '2024': {'lowest': 9860, 'average': 10120, 'units': 3},
-                     '2023': {'lowest': 9690, 'average': 9950, 'units': 3},
-                     '2021': {'lowest': 9980, 'average': 10250, 'units': 18},
-                     '2020': {'lowest': 9860, 'average': 10120, 'units': 8},
-                     '2019': {'lowest': 11530, 'average': 11820, 'units': 8},
-                     '2018': {'lowest': 11300, 'average': 11300, 'units': 1},
-                     '2017': {'lowest': 11590, 'average': 11880, 'units': 7},
-                     '2016': {'lowest': 9150, 'average': 9420, 'units': 2},
-                     '2015': {'lowest': 8560, 'average': 8850, 'units': 11},
-                     '2014': {'lowest': 9760, 'average': 9760, 'units': 1},
-                     # 2022 has 0 units
-                 },
-                 'total_units': 75, 'previous': 71, 'diff': 4},
-            ],
-            'total_scraped': 0,
-            'source': 'sgcarmart_snapshot_2026_01',
-            'note': 'Real data from SGCarmart.com - NOT fabricated'
-        }
+        from sample_data import get_sample_data
+        return get_sample_data()
 
 
-def test_scraper():
-    """Test the scraper"""
+def test_scraper(profile_format=None):
+    """Test the scraper (profile_format: 'pstats' or 'collapsed' to profile the run)"""
     scraper = SGCarmartScraper(headless=True)
-    data = scraper.scrape_all_categories()
+    with profile('sgcarmart_scrape', profile_format) as profiled:
+        data = scraper.scrape_all_categories()
     
     if data:
         print("\n" + "="*70)
@@ -628,8 +361,14 @@ def test_scraper():
             print(f"\n{v['category']} - {v['vehicle']}")
             print(f"  Total units: {v['total_units']}")
     
+    if profiled.path:
+        print(f"\nProfile: {profiled.path}")
+    
     return data
 
 
 if __name__ == "__main__":
-    test_scraper()
+    import argparse
+    parser = argparse.ArgumentParser(description="Test the SGCarmart scraper")
+    add_cli_argument(parser)
+    test_scraper(parser.parse_args().profile)
@@ -0,0 +1,205 @@
+"""
+Ablink SGCarmart Scraper - Snapshot Delta Encoding
+By Oneiros Indonesia
+
+Structural diff between two snapshots, used by the history slider:
+consecutive days differ in only a few vehicles / year buckets, so the
+client asks for /api/data/<date>?base=<cached date> and applies the
+delta on top of the snapshot it already has.
+
+Delta format:
+    {
+        'meta': {field: value},                   # changed top-level fields
+        'meta_unset': [...],                      # removed top-level fields
+        'rows': [                                 # in target order
+            {'key': key, 'row': {...}},           # added row (full)
+            {'key': key, 'set': {...},            # changed fields only
+             'unset': [...],
+             'nested': {'years': {'set': {...}, 'unset': [...]}}}
+        ],
+        'removed': [key, ...],
+        'order': [key, ...]                       # only if order changed
+    }
+
+Rows are identified by key fields (category + vehicle). If keys are not
+unique the diff returns None and callers send the full snapshot.
+The client-side apply lives in the dashboard templates (applyRowDelta).
+"""
+
+import math
+
+
+# Market analysis snapshot: {'vehicles': [{'category', 'vehicle', 'years': {...}, ...}], ...}
+SNAPSHOT_ROWS = 'vehicles'
+SNAPSHOT_KEY = ('category', 'vehicle')
+SNAPSHOT_NESTED = ('years',)
+
+# Dashboard records: [{'Category', 'Vehicle', '2025_price', ...}]
+RECORD_KEY = ('Category', 'Vehicle')
+
+
+def _key_part(value):
+    """Key field as text, '' if missing (None / NaN reach the client as null)"""
+    if value is None or (isinstance(value, float) and math.isnan(value)):
+        return ''
+    return str(value)
+
+
+def row_key(row, key_fields):
+    """Row identity (same format as the client: values joined with '|')"""
+    return '|'.join(_key_part(row.get(field)) for field in key_fields)
+
+
+def _same(a, b):
+    """Equality that treats NaN == NaN (CSV-loaded records)"""
+    if a == b:
+        return True
+    return isinstance(a, float) and isinstance(b, float) and math.isnan(a) and math.isnan(b)
+
+
+def _diff_dict(base, target, skip=()):
+    """Changed / removed keys between two flat dicts"""
+    changed = {k: v for k, v in target.items() if k not in skip and (k not in base or not _same(base[k], v))}
+    removed = [k for k in base if k not in skip and k not in target]
+    return changed, removed
+
+
+def _index_rows(rows, key_fields):
+    """Rows by key, None if a key is duplicated"""
+    indexed = {}
+    for row in rows:
+        key = row_key(row, key_fields)
+        if key in indexed:
+            return None
+        indexed[key] = row
+    return indexed
+
+
+def diff_rows(base_rows, target_rows, key_fields, nested=()):
+    """
+    Delta that turns base_rows into target_rows
+    
+    Args:
+        base_rows: List of row dicts the client already has
+        target_rows: List of row dicts requested
+        key_fields: Fields identifying a row
+        nested: Dict-valued fields diffed one level deeper (e.g. 'years')
+    
+    Returns:
+        dict: Row delta ('rows', 'removed', optional 'order'), or None
+            if the rows cannot be keyed
+    """
+    base_index = _index_rows(base_rows, key_fields)
+    target_index = _index_rows(target_rows, key_fields)
+    if base_index is None or target_index is None:
+        return None
+    
+    changes = []
+    added = []
+    for key, row in target_index.items():
+        base_row = base_index.get(key)
+        
+        if base_row is None:
+            changes.append({'key': key, 'row': row})
+            added.append(key)
+            continue
+        
+        changed, removed = _diff_dict(base_row, row, skip=nested)
+        change = {}
+        if changed:
+            change['set'] = changed
+        if removed:
+            change['unset'] = removed
+        
+        nested_changes = {}
+        for field in nested:
+            inner_changed, inner_removed = _diff_dict(base_row.get(field) or {}, row.get(field) or {})
+            if inner_changed or inner_removed:
+                nested_changes[field] = {'set': inner_changed, 'unset': inner_removed}
+        if nested_changes:
+            change['nested'] = nested_changes
+        
+        if change:
+            change['key'] = key
+            changes.append(change)
+    
+    delta = {
+        'rows': changes,
+        'removed': [key for key in base_index if key not in target_index]
+    }
+    
+    # Default order: base order without removed rows, then added rows
+    default_order = [key for key in base_index if key in target_index] + added
+    target_order = list(target_index)
+    if target_order != default_order:
+        delta['order'] = target_order
+    
+    return delta
+
+
+def apply_rows(base_rows, delta, key_fields, nested=()):
+    """Apply a row delta (mirror of the client-side applyRowDelta)"""
+    rows = {row_key(row, key_fields): row for row in base_rows}
+    added = []
+    
+    for change in delta['rows']:
+        key = change['key']
+        
+        if 'row' in change:
+            rows[key] = change['row']
+            added.append(key)
+            continue
+        
+        row = dict(rows[key])
+        row.update(change.get('set', {}))
+        for field in change.get('unset', []):
+            row.pop(field, None)
+        
+        for field, inner in change.get('nested', {}).items():
+            values = dict(row.get(field) or {})
+            values.update(inner['set'])
+            for inner_key in inner['unset']:
+                values.pop(inner_key, None)
+            row[field] = values
+        
+        rows[key] = row
+    
+    removed = set(delta['removed'])
+    order = delta.get('order')
+    if order is None:
+        order = [row_key(row, key_fields) for row in base_rows]
+        order = [key for key in order if key not in removed] + added
+    
+    return [rows[key] for key in order]
+
+
+def diff_snapshot(base, target):
+    """
+    Delta between two market analysis snapshots
+    
+    Returns:
+        dict: Delta, or None if the full snapshot should be sent
+    """
+    delta = diff_rows(base.get(SNAPSHOT_ROWS, []), target.get(SNAPSHOT_ROWS, []), SNAPSHOT_KEY, SNAPSHOT_NESTED)
+    if delta is None:
+        return None
+    
+    meta, removed_meta = _diff_dict(base, target, skip=(SNAPSHOT_ROWS,))
+    delta['meta'] = meta
+    if removed_meta:
+        delta['meta_unset'] = removed_meta
+    
+    return delta
+
+
+def apply_snapshot(base, delta):
+    """Apply a snapshot delta to a base snapshot"""
+    snapshot = {k: v for k, v in base.items() if k not in delta.get('meta_unset', [])}
+    snapshot.update(delta['meta'])
+    snapshot[SNAPSHOT_ROWS] = apply_rows(base.get(SNAPSHOT_ROWS, []), delta, SNAPSHOT_KEY, SNAPSHOT_NESTED)
+    return snapshot
+
+
+def diff_records(base_records, target_records):
+    """Delta between two dashboard record lists (None: send full records)"""
+    return diff_rows(base_records, target_records, RECORD_KEY)
@@ -0,0 +1,198 @@
+"""
+Ablink SGCarmart Scraper - Table Extraction
+By Oneiros Indonesia
+
+Picks the data table of a page without converting every table:
+the page is parsed once, each <table> gets a cheap score from its
+header row and a sample of its body rows, and only the winner is
+converted (by the caller, e.g. DepreciationScraper._parse_depreciation_table).
+
+Score (higher is better):
+- header tokens: YEAR / UNITS / DEPRECIATION / DIFF ... and year numbers
+  (2025, 2024, ...) in the first row
+- numeric density: share of numeric cells ($11,800 / 49 / -3 / -) in the
+  first SAMPLE_ROWS body rows
+- row count (capped, so a long layout table does not win on size alone)
+
+typed_frame turns the cell texts of the chosen table into typed columns
+in one vectorised pass: whole-number columns become int32 (nullable
+Int32 when a cell is empty or '-'), other numeric columns float64,
+repeated text (Category) categorical and the rest stays text. A column
+with any filled cell that is not a number (e.g. 'POA') stays text, so
+no cell is silently lost.
+
+Usage:
+    best = best_table(page_source)
+    if best and best.is_good:
+        df = scraper._parse_depreciation_table(best.table)
+    
+    df = typed_frame([['10FT DIESEL', 'HINO', '$11,800', '5']], columns)
+"""
+
+import re
+
+import numpy as np
+import pandas as pd
+from bs4 import BeautifulSoup
+
+
+HEADER_TOKENS = ('YEAR', 'UNITS', 'DEPRECIATION', 'DIFF', 'PREVIOUS', 'VEHICLE', 'MODEL', 'PRICE', 'TOTAL')
+YEAR_PATTERN = re.compile(r'\b(?:19|20)\d{2}\b')
+NUMBER_PATTERN = re.compile(r'^[-+]?\$?\s?\d[\d,]*(?:\.\d+)?%?$|^-$')
+
+SAMPLE_ROWS = 10       # Body rows sampled for the numeric density
+MIN_ROWS = 2           # Header + one data row
+MAX_TOKEN_HITS = 6
+MAX_ROW_POINTS = 40    # Rows counted for the score
+
+# A table with these is taken without looking at further pages
+GOOD_TOKEN_HITS = 2
+GOOD_NUMERIC_DENSITY = 0.3
+
+# Cell texts meaning "no value" in numeric columns
+MISSING_VALUES = ('', '-', '--', 'N.A.', 'NA', 'N/A')
+NUMBER_NOISE = re.compile(r'[$,\s]')
+CATEGORY_SHARE = 0.5       # Text columns with fewer distinct values per row become categorical
+
+
+class TableCandidate:
+    """A scored <table> of a page"""
+    
+    def __init__(self, table, index, token_hits, numeric_density, row_count, source=None):
+        self.table = table
+        self.index = index
+        self.token_hits = token_hits
+        self.numeric_density = numeric_density
+        self.row_count = row_count
+        self.source = source
+        self.score = (
+            min(token_hits, MAX_TOKEN_HITS) * 2
+            + numeric_density * 5
+            + min(row_count, MAX_ROW_POINTS) / 10
+        )
+    
+    @property
+    def is_good(self):
+        """Looks like the data table (no need to try other pages)"""
+        return self.token_hits >= GOOD_TOKEN_HITS and self.numeric_density >= GOOD_NUMERIC_DENSITY
+    
+    def __repr__(self):
+        return (f"TableCandidate(index={self.index}, score={self.score:.2f}, tokens={self.token_hits}, "
+                f"numeric={self.numeric_density:.2f}, rows={self.row_count}, source={self.source!r})")
+
+
+def score_table(table, index=0, source=None):
+    """
+    Score one table from its header row and sampled body rows
+    
+    Returns:
+        TableCandidate: None for tables with fewer than MIN_ROWS rows
+    """
+    rows = table.find_all('tr')
+    if len(rows) < MIN_ROWS:
+        return None
+    
+    header_text = ' '.join(cell.get_text(' ', strip=True) for cell in rows[0].find_all(['th', 'td'])).upper()
+    token_hits = sum(token in header_text for token in HEADER_TOKENS) + len(set(YEAR_PATTERN.findall(header_text)))
+    
+    cells = [
+        cell.get_text(strip=True)
+        for row in rows[1:1 + SAMPLE_ROWS]
+        for cell in row.find_all('td')
+    ]
+    cells = [text for text in cells if text]
+    numeric = sum(1 for text in cells if NUMBER_PATTERN.match(text))
+    numeric_density = numeric / len(cells) if cells else 0.0
+    
+    return TableCandidate(table, index, token_hits, numeric_density, len(rows), source)
+
+
+def score_tables(soup, source=None):
+    """All scored tables of a parsed page, best first"""
+    candidates = [
+        score_table(table, index, source)
+        for index, table in enumerate(soup.find_all('table'))
+    ]
+    return sorted((c for c in candidates if c is not None), key=lambda c: c.score, reverse=True)
+
+
+def best_table(html, source=None, parser='html.parser'):
+    """
+    Best scored table of a page (parsed once)
+    
+    Args:
+        html: Page source (or an already parsed BeautifulSoup)
+        source: Label kept on the candidate (e.g. the URL)
+        parser: BeautifulSoup parser
+    
+    Returns:
+        TableCandidate: None if the page has no table with data rows
+    """
+    soup = html if isinstance(html, BeautifulSoup) else BeautifulSoup(html, parser)
+    candidates = score_tables(soup, source)
+    return candidates[0] if candidates else None
+
+
+def typed_frame(rows, columns):
+    """
+    DataFrame with inferred column types from table cell texts
+    
+    All cells are converted to numbers at once ($ and , removed); a
+    column is numeric when all of its filled cells are numbers. Columns
+    are kept by position, so repeated header texts are all kept.
+    
+    Args:
+        rows: List of row lists (cell texts; short rows are padded)
+        columns: Column names (may repeat)
+    
+    Returns:
+        pd.DataFrame: int32 / Int32 / float64 / category / text columns
+    """
+    raw = pd.DataFrame(rows, columns=columns, dtype=object).fillna('')
+    cells = raw.to_numpy(dtype=object).astype(str)
+    
+    cleaned = pd.Series(cells.ravel()).str.replace(NUMBER_NOISE, '', regex=True)
+    numbers = pd.to_numeric(cleaned, errors='coerce').to_numpy(dtype=float).reshape(cells.shape)
+    missing = np.isin(np.char.upper(np.char.strip(cells)), MISSING_VALUES)
+    
+    typed = []
+    for i in range(len(columns)):
+        values = numbers[:, i]
+        filled = ~missing[:, i]
+        parsed = ~np.isnan(values) & filled
+        
+        if np.array_equal(parsed, filled):
+            typed.append(pd.Series(_numeric_column(values, parsed), index=raw.index))
+        else:
+            typed.append(_text_column(raw.iloc[:, i]))
+    
+    if not typed:
+        return pd.DataFrame(index=raw.index)
+    
+    # Positional: a name-keyed assignment would merge repeated headers
+    df = pd.concat(typed, axis=1, ignore_index=True)
+    df.columns = list(columns)
+    return df
+
+
+def _numeric_column(values, parsed):
+    """int32 for whole numbers (Int32 with gaps), else float64"""
+    present = values[parsed]
+    whole = (
+        present.size > 0
+        and np.all(present == np.floor(present))
+        and np.all(np.abs(present) <= np.iinfo(np.int32).max)
+    )
+    if not whole:
+        return np.where(parsed, values, np.nan)
+    if parsed.all():
+        return values.astype(np.int32)
+    return pd.arrays.IntegerArray(np.where(parsed, values, 0).astype(np.int32), ~parsed)
+
+
+def _text_column(series):
+    """Categorical when values repeat (Category), else text"""
+    series = series.astype(str)
+    if series.nunique() <= CATEGORY_SHARE * len(series):
+        return series.astype('category')
+    return series
@@ -0,0 +1,69 @@
+"""
+Ablink SGCarmart Scraper - HTTP Cache Tests
+By Oneiros Indonesia
+"""
+
+import uuid
+
+import pytest
+from flask import Flask
+
+from http_cache import HISTORICAL_CACHE_CONTROL, conditional_json, make_etag
+
+
+@pytest.fixture
+def app():
+    app = Flask('test_http_cache')
+    app.builds = []
+    # Bodies are cached per ETag across apps of the same name: one per test
+    app.etag = make_etag('snapshot', uuid.uuid4().hex)
+    
+    @app.route('/data')
+    def data():
+        def build():
+            app.builds.append(1)
+            return {'vehicles': [{'category': 'VAN', 'vehicle': 'HIACE'}]}
+        return conditional_json(app.etag, build, HISTORICAL_CACHE_CONTROL, last_modified=1760000000)
+    
+    return app
+
+
+def test_full_response(app):
+    response = app.test_client().get('/data')
+    
+    assert response.status_code == 200
+    assert response.get_json() == {'vehicles': [{'category': 'VAN', 'vehicle': 'HIACE'}]}
+    assert response.headers['ETag'] == f'"{app.etag}"'
+    assert response.headers['Cache-Control'] == HISTORICAL_CACHE_CONTROL
+    assert 'Last-Modified' in response.headers
+
+
+def test_if_none_match_returns_304(app):
+    client = app.test_client()
+    etag = client.get('/data').headers['ETag']
+    
+    response = client.get('/data', headers={'If-None-Match': etag})
+    
+    assert response.status_code == 304
+    assert response.data == b''
+    assert response.headers['ETag'] == etag
+    assert app.builds == [1]  # payload built once
+
+
+def test_weak_etag_matches(app):
+    response = app.test_client().get('/data', headers={'If-None-Match': f'W/"{app.etag}"'})
+    assert response.status_code == 304
+
+
+def test_if_modified_since(app):
+    client = app.test_client()
+    last_modified = client.get('/data').headers['Last-Modified']
+    
+    assert client.get('/data', headers={'If-Modified-Since': last_modified}).status_code == 304
+    assert client.get('/data', headers={'If-Modified-Since': 'Sat, 01 Jan 2000 00:00:00 GMT'}).status_code == 200
+
+
+def test_stale_etag_gets_body(app):
+    response = app.test_client().get('/data', headers={'If-None-Match': '"stale"'})
+    assert response.status_code == 200
+    assert response.get_json()['vehicles'][0]['vehicle'] == 'HIACE'
@@ -0,0 +1,101 @@
+"""
+Ablink SGCarmart Scraper - Report Retention Tests
+By Oneiros Indonesia
+"""
+
+import os
+import time
+from datetime import datetime
+
+from report_retention import MIN_AGE_SECONDS, ReportRetention
+
+
+def _write(folder, name, age=MIN_AGE_SECONDS * 10):
+    path = os.path.join(folder, name)
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write(name)
+    mtime = time.time() - age
+    os.utime(path, (mtime, mtime))
+    return path
+
+
+def _retention(folder, **settings):
+    policy = {'keep_latest_only': False, 'max_files_to_keep': 2, 'compress_after_days': 0, 'cache_files_to_keep': 1}
+    policy.update(settings)
+    return ReportRetention(str(folder), policy)
+
+
+def test_latest_per_series(tmp_path):
+    _write(tmp_path, 'depreciation_20261017_090000.xlsx')
+    _write(tmp_path, 'depreciation_20261018_090000.xlsx')
+    _write(tmp_path, 'depreciation_20261019_090000.csv')
+    _write(tmp_path, 'market_analysis_2026-10-19_20261019_090000.xlsx')
+    _write(tmp_path, 'depreciation_latest.xlsx')
+    retention = _retention(tmp_path)
+    
+    assert retention.latest('depreciation', 'xlsx') == os.path.join(str(tmp_path), 'depreciation_20261018_090000.xlsx')
+    assert retention.latest('depreciation', 'csv') == os.path.join(str(tmp_path), 'depreciation_20261019_090000.csv')
+    assert retention.latest('market_analysis', 'xlsx').endswith('market_analysis_2026-10-19_20261019_090000.xlsx')
+    assert retention.latest('colorful_report', 'html') is None
+
+
+def test_latest_sees_new_files(tmp_path):
+    retention = _retention(tmp_path)
+    _write(tmp_path, 'depreciation_20261018_090000.xlsx')
+    assert retention.latest('depreciation', 'xlsx').endswith('20261018_090000.xlsx')
+    
+    # Folder changed: the manifest is rebuilt
+    time.sleep(0.01)
+    _write(tmp_path, 'depreciation_20261019_090000.xlsx')
+    assert retention.latest('depreciation', 'xlsx').endswith('20261019_090000.xlsx')
+
+
+def test_enforce_keeps_newest(tmp_path):
+    for day in range(14, 20):
+        _write(tmp_path, f'depreciation_202610{day}_090000.xlsx')
+    _write(tmp_path, 'depreciation_latest.xlsx')
+    
+    stats = _retention(tmp_path).enforce()
+    
+    assert stats == {'removed': 4, 'compressed': 0}
+    assert sorted(os.listdir(tmp_path)) == [
+        '.retention', 'depreciation_20261018_090000.xlsx', 'depreciation_20261019_090000.xlsx', 'depreciation_latest.xlsx'
+    ]
+
+
+def test_enforce_keep_latest_only_spares_recent_files(tmp_path):
+    _write(tmp_path, 'depreciation_20261017_090000.xlsx')
+    _write(tmp_path, 'depreciation_20261018_090000.xlsx', age=0)  # being sent
+    _write(tmp_path, 'depreciation_20261019_090000.xlsx')
+    
+    stats = _retention(tmp_path, keep_latest_only=True).enforce()
+    
+    assert stats['removed'] == 1
+    assert not os.path.exists(tmp_path / 'depreciation_20261017_090000.xlsx')
+    assert os.path.exists(tmp_path / 'depreciation_20261018_090000.xlsx')
+
+
+def test_enforce_compresses_older_files(tmp_path):
+    _write(tmp_path, 'depreciation_20200101_090000.csv')
+    _write(tmp_path, 'depreciation_20200102_090000.csv')
+    retention = _retention(tmp_path, compress_after_days=1)
+    
+    assert retention.enforce() == {'removed': 0, 'compressed': 1}
+    assert os.path.exists(tmp_path / 'depreciation_20200101_090000.csv.gz')
+    assert retention.latest('depreciation', 'csv').endswith('depreciation_20200102_090000.csv')
+
+
+def test_enforce_render_cache(tmp_path):
+    today = datetime.now().strftime('%Y%m%d')
+    _write(tmp_path, f'report_20200101_{"a" * 16}.html')
+    _write(tmp_path, f'report_{today}_{"b" * 16}.html', age=MIN_AGE_SECONDS * 20)
+    _write(tmp_path, f'report_{today}_{"c" * 16}.html')
+    _write(tmp_path, f'report_{today}_{"d" * 16}.pdf')
+    
+    stats = _retention(tmp_path).enforce()
+    
+    # Stale day removed, newest of today kept per format
+    assert stats['removed'] == 2
+    assert sorted(name for name in os.listdir(tmp_path) if name != '.retention') == [
+        f'report_{today}_{"c" * 16}.html', f'report_{today}_{"d" * 16}.pdf'
+    ]
@@ -0,0 +1,63 @@
+"""
+Ablink SGCarmart Scraper - Scheduler Tests
+By Oneiros Indonesia
+"""
+
+from datetime import datetime
+
+import pytest
+
+from scheduler import CronSchedule, cron_from_settings
+
+
+def test_next_after_daily():
+    schedule = CronSchedule('0 9 * * *')
+    assert schedule.next_after(datetime(2026, 10, 19, 8, 59)) == datetime(2026, 10, 19, 9, 0)
+    assert schedule.next_after(datetime(2026, 10, 19, 9, 0)) == datetime(2026, 10, 20, 9, 0)
+
+
+def test_previous_before_is_inclusive():
+    schedule = CronSchedule('30 8 * * *')
+    assert schedule.previous_before(datetime(2026, 10, 19, 8, 30)) == datetime(2026, 10, 19, 8, 30)
+    assert schedule.previous_before(datetime(2026, 10, 19, 8, 29)) == datetime(2026, 10, 18, 8, 30)
+
+
+def test_weekdays_skip_weekend():
+    schedule = CronSchedule('0 9 * * 1-5')
+    # 2026-10-16 is a Friday
+    assert schedule.next_after(datetime(2026, 10, 16, 10, 0)) == datetime(2026, 10, 19, 9, 0)
+
+
+def test_sunday_as_7():
+    schedule = CronSchedule('0 9 * * 7')
+    assert schedule.next_after(datetime(2026, 10, 19)) == datetime(2026, 10, 25, 9, 0)
+
+
+def test_steps_and_lists():
+    schedule = CronSchedule('*/15 8,20 * * *')
+    assert schedule.minutes == [0, 15, 30, 45]
+    assert schedule.hours == [8, 20]
+
+
+def test_day_or_weekday():
+    # Both restricted: the 1st of the month or any Monday
+    schedule = CronSchedule('0 9 1 * 1')
+    assert schedule.next_after(datetime(2026, 10, 20)) == datetime(2026, 10, 26, 9, 0)
+    assert schedule.next_after(datetime(2026, 10, 27)) == datetime(2026, 11, 1, 9, 0)
+
+
+@pytest.mark.parametrize('expression', ['0 9 * *', '60 9 * * *', '0 24 * * *', '0 8 30 2 *'])
+def test_invalid_expressions(expression):
+    with pytest.raises(ValueError):
+        CronSchedule(expression)
+
+
+def test_cron_from_settings():
+    assert cron_from_settings({'cron': '5 4 * * *'}) == '5 4 * * *'
+    assert cron_from_settings({'schedule_time': '07:30', 'schedule_frequency': 'weekdays'}) == '30 7 * * 1-5'
+
+
+def test_cron_from_settings_falls_back():
+    # Invalid cron: schedule_time; invalid schedule too: the default
+    assert cron_from_settings({'cron': '0 8 30 2 *', 'schedule_time': '06:00'}) == '0 6 * * *'
+    assert cron_from_settings({'cron': 'bad', 'schedule_frequency': 'monthly'}) == '0 9 * * *'
@@ -0,0 +1,83 @@
+"""
+Ablink SGCarmart Scraper - Snapshot Delta Tests
+By Oneiros Indonesia
+"""
+
+import copy
+
+from snapshot_delta import (RECORD_KEY, apply_rows, apply_snapshot, diff_records,
+                            diff_snapshot, row_key)
+
+
+BASE = {
+    'date': '2026-10-18',
+    'total': 2,
+    'vehicles': [
+        {'category': 'VAN', 'vehicle': 'HIACE', 'units': 3, 'years': {'2025': 11800, '2024': 10200}},
+        {'category': 'LORRY', 'vehicle': 'HINO', 'units': 5, 'years': {'2025': 20100}},
+        {'category': 'LORRY', 'vehicle': 'ISUZU', 'units': 1, 'years': {}},
+    ]
+}
+
+
+def _target():
+    target = copy.deepcopy(BASE)
+    target['date'] = '2026-10-19'
+    del target['total']
+    target['vehicles'][0]['units'] = 4
+    target['vehicles'][0]['years']['2025'] = 11500
+    del target['vehicles'][0]['years']['2024']
+    del target['vehicles'][2]
+    target['vehicles'].append({'category': 'BUS', 'vehicle': 'ROSA', 'units': 2, 'years': {'2025': 30000}})
+    return target
+
+
+def test_snapshot_round_trip():
+    target = _target()
+    delta = diff_snapshot(BASE, target)
+    
+    assert delta['meta'] == {'date': '2026-10-19'}
+    assert delta['meta_unset'] == ['total']
+    assert delta['removed'] == ['LORRY|ISUZU']
+    assert 'order' not in delta
+    assert apply_snapshot(BASE, delta) == target
+
+
+def test_reordered_rows():
+    target = copy.deepcopy(BASE)
+    target['vehicles'].reverse()
+    delta = diff_snapshot(BASE, target)
+    
+    assert delta['rows'] == []
+    assert delta['order'] == ['LORRY|ISUZU', 'LORRY|HINO', 'VAN|HIACE']
+    assert apply_snapshot(BASE, delta) == target
+
+
+def test_duplicate_keys_send_full_snapshot():
+    target = copy.deepcopy(BASE)
+    target['vehicles'].append(dict(target['vehicles'][0]))
+    assert diff_snapshot(BASE, target) is None
+
+
+def test_missing_key_parts_match_client():
+    # The client keys null (None / NaN in JSON) as ''
+    assert row_key({'Category': None, 'Vehicle': 'HINO'}, RECORD_KEY) == '|HINO'
+    assert row_key({'Category': float('nan'), 'Vehicle': 'HINO'}, RECORD_KEY) == '|HINO'
+    assert row_key({'Vehicle': 'HINO'}, RECORD_KEY) == '|HINO'
+
+
+def test_records_round_trip_with_missing_key():
+    base = [
+        {'Category': float('nan'), 'Vehicle': 'HINO', '2025_price': 20100.0},
+        {'Category': 'VAN', 'Vehicle': None, '2025_price': float('nan')},
+    ]
+    target = [
+        {'Category': float('nan'), 'Vehicle': 'HINO', '2025_price': 19900.0},
+        {'Category': 'VAN', 'Vehicle': None, '2025_price': float('nan')},
+    ]
+    delta = diff_records(base, target)
+    
+    # NaN == NaN: the unchanged row is not sent
+    assert delta['rows'] == [{'key': '|HINO', 'set': {'2025_price': 19900.0}}]
+    assert delta['removed'] == []
+    assert apply_rows(base, delta, RECORD_KEY)[0]['2025_price'] == 19900.0
@@ -0,0 +1,64 @@
+"""
+Ablink SGCarmart Scraper - Table Extraction Tests
+By Oneiros Indonesia
+"""
+
+import pandas as pd
+
+from table_extraction import best_table, typed_frame
+
+
+def test_typed_columns():
+    df = typed_frame(
+        [['LORRY', 'HINO', '$11,800', '5'], ['LORRY', 'ISUZU', '$9,250.50', '-'], ['LORRY', 'FUSO', '-', '2']],
+        ['Category', 'Vehicle', 'Price', 'Units']
+    )
+    
+    assert list(df.columns) == ['Category', 'Vehicle', 'Price', 'Units']
+    assert df['Category'].dtype == 'category'
+    assert df['Price'].dtype == 'float64'
+    assert df['Price'].iloc[0] == 11800
+    assert pd.isna(df['Price'].iloc[2])
+    assert str(df['Units'].dtype) == 'Int32'
+    assert df['Units'].isna().tolist() == [False, True, False]
+
+
+def test_whole_numbers_are_int32():
+    df = typed_frame([['1'], ['2'], ['3']], ['Units'])
+    assert df['Units'].dtype == 'int32'
+
+
+def test_repeated_headers_are_kept():
+    df = typed_frame([['HINO', '10', '20'], ['FUSO', '11', 'x']], ['Vehicle', '2025', '2025'])
+    
+    assert df.shape == (2, 3)
+    assert list(df.columns) == ['Vehicle', '2025', '2025']
+    assert df.iloc[:, 1].tolist() == [10, 11]
+    assert df.iloc[:, 2].tolist() == ['20', 'x']
+
+
+def test_mixed_cells_stay_text():
+    # One non-numeric filled cell keeps the whole column as text
+    df = typed_frame([['$11,800'], ['POA'], ['$9,000'], ['']], ['Price'])
+    assert df['Price'].tolist() == ['$11,800', 'POA', '$9,000', '']
+
+
+def test_short_rows_and_no_columns():
+    df = typed_frame([['HINO', '5'], ['FUSO']], ['Vehicle', 'Units'])
+    assert df['Units'].isna().tolist() == [False, True]
+    
+    assert typed_frame([[], []], []).shape == (2, 0)
+
+
+def test_best_table_prefers_data_table():
+    html = """
+    <table><tr><td>Home</td><td>About</td></tr><tr><td>Login</td><td>Help</td></tr></table>
+    <table>
+        <tr><th>VEHICLE</th><th>2025</th><th>2024</th><th>TOTAL UNITS</th></tr>
+        <tr><td>HINO</td><td>$11,800</td><td>$10,200</td><td>5</td></tr>
+        <tr><td>FUSO</td><td>$9,800</td><td>-</td><td>2</td></tr>
+    </table>
+    """
+    best = best_table(html)
+    assert best.index == 1
+    assert best.is_good
@@ -6,15 +6,20 @@ Flask-based web application with one-click refresh button
 Real-time progress tracking and automatic file generation
 """
 
-from flask import Flask, render_template, jsonify, send_file
-from depreciation_scraper import DepreciationScraper
-from depreciation_html_generator import DepreciationHTMLGenerator
-import pandas as pd
+from flask import Flask, render_template, jsonify, send_file, request, Response, stream_with_context
+from event_bus import event_bus, parse_last_event_id
+import http_response
+import metrics
+import profiling
+from report_retention import get_retention
 from datetime import datetime
 import os
 import threading
 
 app = Flask(__name__)
+metrics.init_app(app)
+profiling.init_app(app)
+http_response.init_app(app)
 
 # Global variables
 scraping_status = {
@@ -30,19 +35,14 @@ def index():
     
     # Get latest report
     report_folder = 'daily_reports'
-    excel_files = []
-    
-    if os.path.exists(report_folder):
-        excel_files = [f for f in os.listdir(report_folder) 
-                      if f.startswith('depreciation') and f.endswith('.xlsx')]
+    excel_path = get_retention(report_folder).latest('depreciation', 'xlsx')
     
     latest_data = None
-    if excel_files:
-        latest_file = max(excel_files, 
-                         key=lambda x: os.path.getmtime(os.path.join(report_folder, x)))
-        excel_path = os.path.join(report_folder, latest_file)
+    if excel_path:
+        latest_file = os.path.basename(excel_path)
         
         try:
+            import pandas as pd
             latest_data = pd.read_excel(excel_path)
             scraping_status['latest_file'] = latest_file
             scraping_status['last_update'] = datetime.fromtimestamp(
@@ -79,6 +79,18 @@ def get_status():
     """Get current scraping status"""
     return jsonify(scraping_status)
 
+@app.route('/api/events')
+def events():
+    """Server-Sent Events stream: current status, then every status change"""
+    last_event_id = parse_last_event_id(request.headers.get('Last-Event-ID'))
+    stream = event_bus.stream(last_event_id, initial_events=[('status', dict(scraping_status))])
+    
+    return Response(
+        stream_with_context(stream),
+        mimetype='text/event-stream',
+        headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'}
+    )
+
 @app.route('/download/<filename>')
 def download_file(filename):
     """Download Excel or CSV file"""
@@ -95,6 +107,7 @@ def run_scraping():
     
     scraping_status['is_scraping'] = True
     scraping_status['status'] = 'Scraping in progress...'
+    event_bus.publish('scrape.started', dict(scraping_status))
     
     try:
         # Configure scraper
@@ -102,27 +115,21 @@ def run_scraping():
             'headless': True,
             'timeout': 30,
             'delay': 3,
-            'output_folder': 'daily_reports',
-            'save_excel': True,
-            'save_csv': True,
-            'save_html': False  # We'll generate styled HTML separately
+            'output_folder': 'daily_reports'
         }
         
-        # Run scraper
-        scraper = DepreciationScraper(config)
-        result = scraper.run()
+        # Scrape, then write the files while the styled HTML renders
+        # from memory (Selenium is only imported here)
+        from depreciation_pipeline import run_pipeline
+        result = run_pipeline(config, formats=('excel', 'csv', 'html'))
         
-        if result and result.get('excel'):
-            # Generate beautiful HTML
-            excel_file = result['excel']
-            df = pd.read_excel(excel_file)
-            
-            generator = DepreciationHTMLGenerator()
-            html_file = generator.generate_report(df)
+        if result and result.files.get('excel'):
+            excel_file = result.files['excel']
             
             scraping_status['status'] = 'Success!'
             scraping_status['last_update'] = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
             scraping_status['latest_file'] = os.path.basename(excel_file)
+            scraping_status['timings'] = result.timings
         else:
             scraping_status['status'] = 'Failed - No data found'
     
@@ -131,6 +138,8 @@ def run_scraping():
     
     finally:
         scraping_status['is_scraping'] = False
+        succeeded = scraping_status['status'].startswith('Success')
+        event_bus.publish('scrape.completed' if succeeded else 'scrape.failed', dict(scraping_status))
 
 # Create templates folder
 def create_template():
@@ -488,7 +497,8 @@ def create_template():
     </div>
     
     <script>
-        let checkInterval;
+        let checkInterval = null;
+        let events = null;
         
         function startScraping() {
             const btn = document.getElementById('refreshBtn');
@@ -504,8 +514,10 @@ def create_template():
                 .then(data => {
                     showAlert(data.message, 'info');
                     
-                    // Start checking status
-                    checkInterval = setInterval(checkStatus, 2000);
+                    // Progress arrives on /api/events - poll only without EventSource support
+                    if (!events) {
+                        checkInterval = setInterval(checkStatus, 2000);
+                    }
                 })
                 .catch(error => {
                     showAlert('Error starting scraper: ' + error, 'error');
@@ -515,40 +527,87 @@ def create_template():
                 });
         }
         
+        function showStatus(data) {
+            document.getElementById('statusText').textContent = data.status;
+            
+            const btn = document.getElementById('refreshBtn');
+            const statusIndicator = document.getElementById('statusIndicator');
+            
+            if (data.is_scraping) {
+                btn.disabled = true;
+                btn.innerHTML = '<div class="spinner"></div> Scraping...';
+                statusIndicator.classList.add('scraping');
+            } else {
+                btn.disabled = false;
+                btn.innerHTML = '🔄 Refresh Data';
+                statusIndicator.classList.remove('scraping');
+            }
+            
+            if (data.last_update) {
+                document.getElementById('lastUpdate').textContent = data.last_update;
+            }
+        }
+        
+        function showProgress(progress) {
+            let text = 'Scraping in progress...';
+            if (progress.stage === 'fetch') {
+                text = 'Loading ' + progress.url;
+            } else if (progress.stage === 'parsed') {
+                text = 'Found ' + progress.rows + ' rows';
+            } else if (progress.stage === 'saved') {
+                text = 'Saving files...';
+            } else if (progress.category) {
+                text = progress.category + (progress.page ? ' - page ' + progress.page : '');
+            }
+            document.getElementById('statusText').textContent = text;
+        }
+        
+        function finishScraping(data) {
+            showStatus(data);
+            
+            if (data.status.includes('Success')) {
+                showAlert('Data refreshed successfully! Reloading page...', 'success');
+                
+                // Reload page after 2 seconds
+                setTimeout(() => {
+                    window.location.reload();
+                }, 2000);
+            } else if (data.status.includes('Error') || data.status.includes('Failed')) {
+                showAlert('Scraping failed. Please try again.', 'error');
+            }
+        }
+        
         function checkStatus() {
             fetch('/status')
                 .then(response => response.json())
                 .then(data => {
-                    document.getElementById('statusText').textContent = data.status;
-                    
-                    if (!data.is_scraping) {
-                        clearInterval(checkInterval);
-                        
-                        const btn = document.getElementById('refreshBtn');
-                        btn.disabled = false;
-                        btn.innerHTML = '🔄 Refresh Data';
-                        
-                        const statusIndicator = document.getElementById('statusIndicator');
-                        statusIndicator.classList.remove('scraping');
-                        
-                        if (data.status.includes('Success')) {
-                            showAlert('Data refreshed successfully! Reloading page...', 'success');
-                            
-                            // Reload page after 2 seconds
-                            setTimeout(() => {
-                                window.location.reload();
-                            }, 2000);
-                        } else if (data.status.includes('Error') || data.status.includes('Failed')) {
-                            showAlert('Scraping failed. Please try again.', 'error');
-                        }
-                        
-                        if (data.last_update) {
-                            document.getElementById('lastUpdate').textContent = data.last_update;
-                        }
+                    if (data.is_scraping || !checkInterval) {
+                        showStatus(data);
+                        return;
                     }
+                    
+                    clearInterval(checkInterval);
+                    checkInterval = null;
+                    finishScraping(data);
                 });
         }
         
+        function subscribeEvents() {
+            if (!window.EventSource) {
+                return false;
+            }
+            
+            const payload = e => JSON.parse(e.data).data;
+            
+            events = new EventSource('/api/events');
+            events.addEventListener('status', e => showStatus(payload(e)));
+            events.addEventListener('scrape.started', e => showStatus(payload(e)));
+            events.addEventListener('scrape.progress', e => showProgress(payload(e)));
+            events.addEventListener('scrape.completed', e => finishScraping(payload(e)));
+            events.addEventListener('scrape.failed', e => finishScraping(payload(e)));
+            return true;
+        }
+        
         function downloadExcel() {
             const filename = '{{ status.latest_file }}';
             window.location.href = '/download/' + filename;
@@ -564,9 +623,11 @@ def create_template():
             }, 5000);
         }
         
-        // Auto-check status on page load
+        // Live status via Server-Sent Events, one status check without them
         window.addEventListener('load', function() {
-            checkStatus();
+            if (!subscribeEvents()) {
+                checkStatus();
+            }
         });
     </script>
 </body>
@@ -0,0 +1,36 @@
+"""
+Ablink SGCarmart Scraper - WSGI Entry Point
+By Oneiros Indonesia
+
+Production entry point (see gunicorn.conf.py and Procfile):
+    gunicorn -c gunicorn.conf.py wsgi:app
+
+The market analysis dashboard is served by default; set APP_MODULE to
+serve another app with the same setup, e.g. APP_MODULE=dashboard_web.
+
+gunicorn preloads this module in the master process, so the app is
+imported once and shared by all workers. Heavy dependencies (pandas,
+selenium, report generators) are imported lazily on first use; list
+them in PRELOAD_MODULES (e.g. PRELOAD_MODULES=pandas,report_renderer)
+to import them in the master too, trading cold start for first-request
+latency. The scheduler is not started here but in each worker after the
+fork, where the leader lock lets exactly one of them run it.
+"""
+
+import os
+from importlib import import_module
+
+
+APP_MODULE = os.environ.get('APP_MODULE', 'market_analysis_app')
+PRELOAD_MODULES = [name for name in os.environ.get('PRELOAD_MODULES', '').split(',') if name]
+
+for name in PRELOAD_MODULES:
+    import_module(name)
+
+module = import_module(APP_MODULE)
+app = module.create_app()
+
+
+def start_scheduler():
+    """Called per worker by gunicorn (post_fork)"""
+    return module.start_scheduler()